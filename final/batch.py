@@ -0,0 +1,131 @@
+"""Run the simulation without any user interaction.
+
+Used in the Logic Simulator project to run a parsed network for a number of
+cycles from the command line or a job scheduler, and write the monitored
+signals to a file. Nothing in this module imports wx or OpenGL.
+
+Classes
+-------
+BatchSimulator - runs the network and writes the monitored signals.
+"""
+import contextlib
+import json
+
+
+class BatchSimulator:
+    """Run the network and write the monitored signals.
+
+    This class sets switches, runs the network from a cold start for a
+    number of cycles, and writes the monitored signals in one of the output
+    formats: text, json, csv or vcd.
+
+    Parameters
+    ----------
+    names: instance of the names.Names() class.
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+    monitors: instance of the monitors.Monitors() class.
+
+    Public methods
+    --------------
+    set_switches(self, switch_settings): Sets switches given as
+                                         "name=level" strings.
+
+    run(self, cycles, vcd_path=None, seed=None): Runs the network from a
+                        cold start with the seed for the number of cycles.
+
+    write_results(self, output_file, output_format): Writes the monitored
+                                    signals to output_file in output_format.
+    """
+
+    output_formats = ["text", "json", "csv", "vcd"]
+
+    def __init__(self, names, devices, network, monitors):
+        """Initialise the simulation state."""
+        self.names = names
+        self.devices = devices
+        self.network = network
+        self.monitors = monitors
+
+        self.cycles_completed = 0  # number of simulation cycles completed
+        self.steady_state = True  # whether every cycle settled
+
+    def set_switches(self, switch_settings):
+        """Set the switches given as "name=level" strings, level 0 or 1.
+
+        Return the first invalid setting, or None if all were set.
+        """
+        for setting in switch_settings:
+            name, separator, level = setting.partition("=")
+            switch_id = self.names.query(name.strip())
+            if not separator or level.strip() not in ["0", "1"] or \
+                    switch_id is None or \
+                    not self.devices.set_switch(switch_id, int(level)):
+                return setting
+        return None
+
+    def run(self, cycles, vcd_path=None, seed=None):
+        """Run the network from a cold start for the number of cycles.
+
+        The cold start uses the seed, or a new seed if it is None, which is
+        recorded in the results. If vcd_path is given, the monitored signals
+        are only written to that VCD file. Return True if every cycle
+        settled. Raise OSError if the VCD file cannot be opened.
+        """
+        self.monitors.reset_monitors()
+        self.devices.set_seed(seed)
+        self.devices.cold_startup()
+        if vcd_path is not None:
+            if not self.monitors.start_vcd(vcd_path, keep_traces=False):
+                raise OSError("could not open " + vcd_path)
+        self.cycles_completed = 0
+        self.steady_state = True
+        while self.cycles_completed < cycles:
+            if not self.network.execute_network():
+                self.steady_state = False
+                break
+            self.monitors.record_signals()
+            self.cycles_completed += 1
+            # Settled signals only change again at the next clock edge
+            idle_cycles = self.network.skip_idle_cycles(
+                cycles - self.cycles_completed)
+            if idle_cycles:
+                self.monitors.record_signals(idle_cycles)
+                self.cycles_completed += idle_cycles
+        self.monitors.stop_vcd()
+        return self.steady_state
+
+    def _signal_names(self):
+        """Return the names of the monitored signals in order."""
+        return [self.devices.get_signal_name(device_id, output_id)
+                for device_id, output_id in self.monitors.monitors_dictionary]
+
+    def write_results(self, output_file, output_format):
+        """Write the monitored signals to output_file in output_format.
+
+        The vcd format is written by run itself. Return True if successful.
+        """
+        signal_traces = list(self.monitors.monitors_dictionary.values())
+        if output_format == "text":
+            with contextlib.redirect_stdout(output_file):
+                self.monitors.display_signals()
+        elif output_format == "json":
+            json.dump({"cycles": self.cycles_completed,
+                       "steady_state": self.steady_state,
+                       "seed": self.devices.cold_startup_seed,
+                       "signals": {
+                           signal_name: list(signal_trace)
+                           for signal_name, signal_trace in
+                           zip(self._signal_names(), signal_traces)}},
+                      output_file)
+            output_file.write("\n")
+        elif output_format == "csv":
+            output_file.write(",".join(["cycle"] + self._signal_names()))
+            output_file.write("\n")
+            for cycle, signals in enumerate(zip(*signal_traces)):
+                output_file.write(",".join(str(value) for value in
+                                           (cycle,) + signals))
+                output_file.write("\n")
+        elif output_format != "vcd":
+            return False
+        return True
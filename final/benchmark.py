@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Benchmark the scanner, parser, network and monitors.
+
+This script generates random acyclic circuits of increasing size and times
+Scanner.get_symbol, Parser.parse_network, Network.execute_network,
+Monitors.record_signals and Monitors.display_signals on each of them. The
+results can be written to a JSON file, and compared with the results of an
+earlier run to catch regressions.
+
+Usage
+-----
+python benchmark.py [-z <sizes>] [-c <cycles>] [-r <repeats>]
+                    [-m <simulation mode>] [-o <results path>]
+                    [-b <baseline path>] [-t <tolerance>]
+
+<sizes> is a comma-separated list of gate counts. The exit status is 1 if
+any benchmark is slower than its baseline by more than the tolerance, a
+fraction of the baseline time. benchmark_baseline.json holds reference
+results of a run with the default options, made with
+python benchmark.py -o benchmark_baseline.json.
+"""
+import contextlib
+import getopt
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+from global_vars import GlobalVars
+from circuit_generator import CircuitGenerator
+
+BENCHMARKS = ["get_symbol", "parse_network", "execute_network",
+              "record_signals", "display_signals"]
+
+# Cycles recorded by the monitors, which are much faster to record than to
+# simulate
+RECORDED_CYCLES = 1000
+
+# Changes in benchmarks faster than this, in seconds, are timing noise
+NOISE_SECONDS = 0.001
+
+
+def parse_circuit(path):
+    """Return the names, devices, network and monitors of a parsed file."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    parser = Parser(names, devices, network, monitors,
+                    Scanner(path, names), GlobalVars())
+    with contextlib.redirect_stdout(io.StringIO()):
+        if not parser.parse_network():
+            raise ValueError("could not parse " + path)
+    return names, devices, network, monitors
+
+
+def best_time(function, repeats):
+    """Return the shortest time in seconds of repeats calls of function.
+
+    function is given a start function to call once its set-up is done.
+    """
+    times = []
+    for _ in range(repeats):
+        start_times = []
+        function(lambda: start_times.append(time.perf_counter()))
+        times.append(time.perf_counter() - start_times[0])
+    return min(times)
+
+
+def benchmark_circuit(path, cycles, repeats, simulation_mode):
+    """Return {benchmark: (seconds, operations)} for the circuit at path."""
+    results = {}
+
+    symbol_counts = []
+
+    def scan(start):
+        scanner = Scanner(path, Names())
+        start()
+        symbol_count = 1
+        while scanner.get_symbol().type != scanner.EOF:
+            symbol_count += 1
+        symbol_counts.append(symbol_count)
+    results["get_symbol"] = (best_time(scan, repeats), symbol_counts[0])
+
+    def parse(start):
+        start()
+        parse_circuit(path)
+    results["parse_network"] = (best_time(parse, repeats), 1)
+
+    def execute(start):
+        names, devices, network, monitors = parse_circuit(path)
+        if not network.set_simulation_mode(simulation_mode):
+            raise ValueError("simulation mode not available")
+        devices.set_seed(0)
+        devices.cold_startup()
+        start()
+        for _ in range(cycles):
+            if not network.execute_network():
+                raise ValueError("network oscillating in " + path)
+    results["execute_network"] = (best_time(execute, repeats), cycles)
+
+    names, devices, network, monitors = parse_circuit(path)
+    devices.set_seed(0)
+    devices.cold_startup()
+    network.execute_network()
+
+    def record(start):
+        monitors.reset_monitors()
+        start()
+        for _ in range(RECORDED_CYCLES):
+            monitors.record_signals()
+    results["record_signals"] = (best_time(record, repeats),
+                                 RECORDED_CYCLES)
+
+    def display(start):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start()
+            monitors.display_signals()
+    results["display_signals"] = (best_time(display, repeats), 1)
+    return results
+
+
+def run_benchmarks(sizes, cycles, repeats, simulation_mode):
+    """Return the results of every benchmark for circuits of each size."""
+    results = []
+    generator = CircuitGenerator(0, monitor_count=64)
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            path = os.path.join(directory, "dag%d.txt" % size)
+            with open(path, "w") as definition_file:
+                definition_file.write(generator.random_dag(size))
+            circuit_results = benchmark_circuit(path, cycles, repeats,
+                                                simulation_mode)
+            for benchmark in BENCHMARKS:
+                seconds, operations = circuit_results[benchmark]
+                results.append({"benchmark": benchmark, "size": size,
+                                "seconds": seconds,
+                                "operations": operations})
+    return results
+
+
+def compare_results(results, baseline_results, tolerance):
+    """Return the results slower than the baseline by more than tolerance.
+
+    Each result is given its baseline time in seconds, and the change as a
+    fraction of it, if there is a baseline result of the same benchmark and
+    circuit size. Changes of less than NOISE_SECONDS are not regressions.
+    """
+    baseline_times = {(result["benchmark"], result["size"]):
+                      result["seconds"] for result in baseline_results}
+    regressions = []
+    for result in results:
+        baseline_time = baseline_times.get((result["benchmark"],
+                                            result["size"]))
+        if not baseline_time:
+            continue
+        result["baseline_seconds"] = baseline_time
+        result["change"] = result["seconds"] / baseline_time - 1
+        if result["change"] > tolerance and \
+                result["seconds"] - baseline_time > NOISE_SECONDS:
+            regressions.append(result)
+    return regressions
+
+
+def print_results(results):
+    """Print a table of the results."""
+    print("%-16s %8s %12s %14s %10s" % ("benchmark", "size", "seconds",
+                                        "us/operation", "change"))
+    for result in results:
+        change = ""
+        if "change" in result:
+            change = "%+.1f%%" % (100 * result["change"])
+        print("%-16s %8d %12.4f %14.3f %10s" % (
+            result["benchmark"], result["size"], result["seconds"],
+            1e6 * result["seconds"] / result["operations"], change))
+
+
+def main(arg_list):
+    """Parse the options, run the benchmarks and compare with a baseline."""
+    usage_message = ("Usage:\n"
+                     "python benchmark.py [-z <sizes>] [-c <cycles>] "
+                     "[-r <repeats>] [-m <simulation mode>] "
+                     "[-o <results path>] [-b <baseline path>] "
+                     "[-t <tolerance>]")
+    try:
+        options, arguments = getopt.getopt(arg_list, "hz:c:r:m:o:b:t:")
+    except getopt.GetoptError:
+        print("Error: invalid command line arguments\n")
+        print(usage_message)
+        sys.exit(2)
+    options = dict(options)
+    if "-h" in options:
+        print(usage_message)
+        sys.exit()
+    mode_names = ["SWEEP", "EVENT_DRIVEN", "LEVELIZED", "VECTORISED",
+                  "GENERATED"]
+    try:
+        sizes = [int(size) for size in
+                 options.get("-z", "1000,10000").split(",")]
+        cycles = int(options.get("-c", 20))
+        repeats = int(options.get("-r", 3))
+        tolerance = float(options.get("-t", 0.2))
+        simulation_mode = mode_names.index(options.get("-m", "SWEEP"))
+    except ValueError:
+        print("Error: invalid command line arguments\n")
+        print(usage_message)
+        sys.exit(2)
+    if arguments or min(sizes + [cycles, repeats]) < 1:
+        print("Error: invalid command line arguments\n")
+        print(usage_message)
+        sys.exit(2)
+
+    results = run_benchmarks(sizes, cycles, repeats, simulation_mode)
+    regressions = []
+    if "-b" in options:
+        with open(options["-b"]) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_results(results, baseline["results"],
+                                      tolerance)
+    print_results(results)
+
+    if "-o" in options:
+        with open(options["-o"], "w") as results_file:
+            json.dump({"python": sys.version.split()[0],
+                       "cycles": cycles, "repeats": repeats,
+                       "simulation_mode": mode_names[simulation_mode],
+                       "results": results}, results_file, indent=2)
+            results_file.write("\n")
+    if regressions:
+        print("\n%d benchmarks slower than the baseline by more than "
+              "%d%%" % (len(regressions), round(100 * tolerance)))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
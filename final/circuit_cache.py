@@ -0,0 +1,188 @@
+"""Cache compiled circuits on disk.
+
+Used in the Logic Simulator project to skip scanning and parsing a circuit
+definition file that has been compiled before.
+
+Classes
+-------
+CircuitCache - saves and loads compiled circuits keyed by file content.
+
+Functions
+---------
+dump_circuit - pickles a compiled circuit to a file.
+load_circuit - loads a pickled compiled circuit into existing instances.
+"""
+import hashlib
+import os
+import pickle
+import stat
+
+# Increase when the layout of the cached objects changes
+CACHE_FORMAT = 1
+
+# Modules whose code determines the compiled circuit
+SIMULATOR_MODULES = ["names.py", "scanner.py", "parse.py", "devices.py",
+                     "network.py", "monitors.py"]
+
+
+def dump_circuit(f, names, devices, network, monitors):
+    """Pickle the compiled circuit to the binary file f.
+
+    The state of each instance is pickled, leaving out the caches that are
+    built while simulating. References between the instances are kept.
+    """
+    instances = {"names": names, "devices": devices, "network": network,
+                 "monitors": monitors}
+    instance_names = {id(instance): instance_name for instance_name,
+                      instance in instances.items()}
+    states = {instance_name: dict(instance.__dict__)
+              for instance_name, instance in instances.items()}
+    states["network"].update(_event_schedule=None, compiled_network=None,
+                             generated_network=None, profile=None)
+    states["monitors"].update(monitored_outputs=None, vcd_writer=None,
+                              keep_traces=True)
+
+    pickler = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL)
+    pickler.persistent_id = lambda instance: instance_names.get(id(instance))
+    pickler.dump(states)
+
+
+def load_circuit(f, names, devices, network, monitors):
+    """Load a compiled circuit pickled by dump_circuit from the file f.
+
+    The states are loaded into the existing instances, which are only
+    changed once the whole file has been read.
+    """
+    instances = {"names": names, "devices": devices, "network": network,
+                 "monitors": monitors}
+    unpickler = pickle.Unpickler(f)
+    unpickler.persistent_load = instances.__getitem__
+    states = unpickler.load()
+    for instance_name, instance in instances.items():
+        instance.__dict__.clear()
+        instance.__dict__.update(states[instance_name])
+
+
+class CircuitCache:
+    """Save and load compiled circuits keyed by file content.
+
+    A compiled circuit is the state of the names, devices, network and
+    monitors instances after a definition file has been parsed
+    successfully. It is pickled to a file named after a hash of the
+    definition file content and of the simulator version, which is the code
+    of the simulator modules, so editing either gives a new cache file.
+    Compiled circuits are loaded into the existing instances, so references
+    to them held elsewhere stay valid.
+
+    Unpickling a file can run any code, so cache files are only loaded if
+    they and the cache directory belong to the current user and cannot be
+    written by anyone else. Cache files are saved that way. On platforms
+    without user IDs, such as Windows, the cache directory is assumed to be
+    private to the user.
+
+    Parameters
+    ----------
+    cache_directory: directory for the cache files. Defaults to the
+                     LOGSIM_CACHE_DIR environment variable, or
+                     ~/.cache/logsim.
+
+    Public methods
+    --------------
+    get_key(self, path): Returns the cache key of a definition file.
+
+    load(self, path, names, devices, network, monitors): Loads the compiled
+                                    circuit of a definition file if cached.
+
+    save(self, path, names, devices, network, monitors): Saves the compiled
+                                                circuit of a definition file.
+    """
+
+    def __init__(self, cache_directory=None):
+        """Initialise the cache directory and simulator version."""
+        if cache_directory is None:
+            cache_directory = os.environ.get(
+                "LOGSIM_CACHE_DIR",
+                os.path.join(os.path.expanduser("~"), ".cache", "logsim"))
+        self.cache_directory = cache_directory
+
+        simulator_hash = hashlib.sha256(str(CACHE_FORMAT).encode())
+        module_directory = os.path.dirname(os.path.abspath(__file__))
+        for module in SIMULATOR_MODULES:
+            try:
+                with open(os.path.join(module_directory, module), "rb") as f:
+                    simulator_hash.update(f.read())
+            except OSError:
+                pass
+        self.simulator_version = simulator_hash.hexdigest()
+
+    def get_key(self, path):
+        """Return the cache key of the definition file at path.
+
+        Return None if the file cannot be read.
+        """
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+        return hashlib.sha256(self.simulator_version.encode() +
+                              content).hexdigest()
+
+    def _is_private(self, path):
+        """Return True if only the current user can write to path."""
+        if not hasattr(os, "getuid"):
+            return True
+        status = os.stat(path)
+        return status.st_uid == os.getuid() and \
+            not status.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    def _cache_path(self, path):
+        """Return the path of the cache file, or None if there is no key."""
+        key = self.get_key(path)
+        if key is None:
+            return None
+        return os.path.join(self.cache_directory, key + ".pickle")
+
+    def load(self, path, names, devices, network, monitors):
+        """Load the compiled circuit of the definition file at path.
+
+        The instances are only changed if a valid cache file is found.
+        Return True if successful.
+        """
+        cache_path = self._cache_path(path)
+        if cache_path is None:
+            return False
+        try:
+            if not (self._is_private(self.cache_directory) and
+                    self._is_private(cache_path)):
+                return False
+            with open(cache_path, "rb") as f:
+                load_circuit(f, names, devices, network, monitors)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+                ValueError):  # missing, corrupt or outdated cache file
+            return False
+        return True
+
+    def save(self, path, names, devices, network, monitors):
+        """Save the compiled circuit of the definition file at path.
+
+        Caches that are built while simulating are left out. Return True if
+        successful.
+        """
+        cache_path = self._cache_path(path)
+        if cache_path is None:
+            return False
+        temporary_path = "%s.%d.tmp" % (cache_path, os.getpid())
+        try:
+            os.makedirs(self.cache_directory, mode=0o700, exist_ok=True)
+            if not self._is_private(self.cache_directory):
+                return False  # the file would never be loaded
+            with open(temporary_path, "wb") as f:
+                os.chmod(temporary_path, 0o600)
+                dump_circuit(f, names, devices, network, monitors)
+            os.replace(temporary_path, cache_path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            return False
+        return True
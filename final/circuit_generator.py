@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""Generate large circuit definition files for benchmarking.
+
+Used in the Logic Simulator project to write circuits of any size in the
+definition file grammar, for measuring and protecting the speed of the
+scanner, parser and simulator.
+
+Usage
+-----
+python circuit_generator.py [-s <seed>] [-d <depth>] [-o <output path>]
+                            <circuit kind> <size>
+
+The circuit kinds are adder (bits), counter (bits), dag (gates) and
+shift (stages).
+
+Classes
+-------
+CircuitGenerator - generates the definition file text of circuits.
+"""
+import getopt
+import random
+import sys
+
+
+class CircuitGenerator:
+    """Generate the definition file text of circuits.
+
+    This class writes ripple-carry adders, ripple counters built from
+    D-types, random acyclic networks of logic gates, and shift registers,
+    with any number of devices. Random choices come from a random number
+    generator of the instance, so the same seed always gives the same text.
+
+    Parameters
+    ----------
+    seed: seed of the random number generator.
+    monitor_count: largest number of signals monitored.
+
+    Public methods
+    --------------
+    ripple_carry_adder(self, bits): Returns an adder of two bits-bit numbers
+                                    set by switches.
+
+    counter(self, bits, clock_length=1): Returns a bits-bit ripple counter
+                                         of D-types.
+
+    random_dag(self, size, depth=10, inputs=8, max_gate_inputs=4): Returns a
+                        random acyclic network of size gates in depth levels.
+
+    shift_register(self, length, clock_length=1): Returns a shift register of
+                                                  length D-types.
+    """
+
+    gate_kinds = ["AND", "OR", "NAND", "NOR", "XOR", "NOT"]
+
+    def __init__(self, seed=None, monitor_count=8):
+        """Initialise the random number generator and definition lists."""
+        self.random = random.Random(seed)
+        self.monitor_count = monitor_count
+        self._clear()
+
+    def _clear(self):
+        """Empty the statements of the four definition file blocks."""
+        self.device_lines = []
+        self.initialise_lines = []
+        self.connection_lines = []
+        self.monitored_signals = []
+        self.switch_count = 0
+
+    def _add_switch(self, level=None):
+        """Add a switch, at a random level unless level is given.
+
+        Switches are named sw1, sw2 and so on. Return the name.
+        """
+        if level is None:
+            level = self.random.choice(["LOW", "HIGH"])
+        self.switch_count += 1
+        name = "sw%d" % self.switch_count
+        self.device_lines.append("%s is SWITCH;" % name)
+        self.initialise_lines.append("%s is %s;" % (name, level))
+        return name
+
+    def _add_clock(self, name, clock_length):
+        """Add a clock with the given cycle length."""
+        self.device_lines.append("%s is CLOCK;" % name)
+        self.initialise_lines.append(
+            "%s cycle length %d;" % (name, clock_length))
+
+    def _add_gate(self, name, kind, sources):
+        """Add a gate of the given kind reading the source signals."""
+        self.device_lines.append("%s is %s;" % (name, kind))
+        if kind == "NOT":
+            self.connection_lines.append("%s to %s;" % (sources[0], name))
+            return
+        if kind != "XOR":
+            self.initialise_lines.append(
+                "%s has %d inputs;" % (name, len(sources)))
+        for number, source in enumerate(sources, 1):
+            self.connection_lines.append(
+                "%s to %s.I%d;" % (source, name, number))
+
+    def _add_d_type(self, name, data, clock, set_source, clear_source):
+        """Add a D-type reading the DATA, CLK, SET and CLEAR signals."""
+        self.device_lines.append("%s is DTYPE;" % name)
+        for source, port in [(data, "DATA"), (clock, "CLK"),
+                             (set_source, "SET"), (clear_source, "CLEAR")]:
+            self.connection_lines.append(
+                "%s to %s.%s;" % (source, name, port))
+
+    def _monitor(self, signals):
+        """Monitor the signals, up to monitor_count of them."""
+        self.monitored_signals = list(signals)[:self.monitor_count]
+
+    def _text(self):
+        """Return the definition file text and empty the block statements."""
+        blocks = [("devices", self.device_lines),
+                  ("initialise", self.initialise_lines),
+                  ("connections", self.connection_lines)]
+        if self.monitored_signals:
+            blocks.append(("monitors",
+                           [", ".join(self.monitored_signals) + ";"]))
+        text = "\n".join(
+            "%s(\n    %s\n)\n" % (header, "\n    ".join(statements))
+            for header, statements in blocks)
+        self._clear()
+        return text
+
+    def ripple_carry_adder(self, bits):
+        """Return an adder of two bits-bit numbers set by switches.
+
+        The bits of the two numbers and the carry in are set randomly by
+        switches sw1 to sw<2 * bits + 1>, least significant first, in the
+        order a0, b0, a1, b1 and so on, then the carry in. The sum bits s0
+        to s<bits-1> and the carry out c<bits> are monitored.
+        """
+        number_bits = [(self._add_switch(), self._add_switch())
+                       for _ in range(bits)]
+        carry = self._add_switch()
+        for bit, (a, b) in enumerate(number_bits):
+            # A full adder: s = a ^ b ^ carry, c = a.b + (a ^ b).carry
+            self._add_gate("x%d" % bit, "XOR", [a, b])
+            self._add_gate("s%d" % bit, "XOR", ["x%d" % bit, carry])
+            self._add_gate("g%d" % bit, "AND", [a, b])
+            self._add_gate("p%d" % bit, "AND", ["x%d" % bit, carry])
+            carry = "c%d" % (bit + 1)
+            self._add_gate(carry, "OR", ["g%d" % bit, "p%d" % bit])
+        self._monitor([carry] + ["s%d" % bit
+                                 for bit in reversed(range(bits))])
+        return self._text()
+
+    def counter(self, bits, clock_length=1):
+        """Return a bits-bit ripple counter of D-types.
+
+        Each D-type d<n> toggles on a rising edge of the clock, for d0, or of
+        the QBAR output of d<n-1>. The Q outputs are monitored, most
+        significant first. Switches sw1 and sw2, driving SET and CLEAR, are
+        LOW.
+        """
+        preset = self._add_switch("LOW")
+        reset = self._add_switch("LOW")
+        self._add_clock("clk", clock_length)
+        clock = "clk"
+        for bit in range(bits):
+            name = "d%d" % bit
+            self._add_d_type(name, name + ".QBAR", clock, preset, reset)
+            clock = name + ".QBAR"
+        self._monitor(["d%d.Q" % bit for bit in reversed(range(bits))])
+        return self._text()
+
+    def random_dag(self, size, depth=10, inputs=8, max_gate_inputs=4):
+        """Return a random acyclic network of size gates in depth levels.
+
+        Switches sw1 to sw<inputs> drive the first level. Every gate reads
+        at least one gate of the level before it, so the longest path is
+        depth gates, and its other inputs come from any earlier level. Gates
+        of the last level are monitored.
+        """
+        depth = max(1, min(depth, size))
+        levels = [[self._add_switch() for _ in range(inputs)]]
+        earlier_signals = []  # signals of the levels before the last one
+        for number in range(size):
+            level = number * depth // size + 1
+            if level == len(levels):
+                if level > 1:
+                    earlier_signals += levels[level - 2]
+                levels.append([])
+            previous_signals = levels[level - 1]
+            kind = self.random.choice(self.gate_kinds)
+            if kind == "NOT":
+                input_count = 1
+            elif kind == "XOR":
+                input_count = 2
+            else:
+                input_count = self.random.randint(2, max_gate_inputs)
+            sources = [self.random.choice(previous_signals)]
+            for _ in range(input_count - 1):
+                source = self.random.randrange(len(earlier_signals) +
+                                               len(previous_signals))
+                if source < len(earlier_signals):
+                    sources.append(earlier_signals[source])
+                else:
+                    sources.append(
+                        previous_signals[source - len(earlier_signals)])
+            name = "g%d" % number
+            self._add_gate(name, kind, sources)
+            levels[level].append(name)
+        self._monitor(levels[-1])
+        return self._text()
+
+    def shift_register(self, length, clock_length=1):
+        """Return a shift register of length D-types.
+
+        The switch sw1 feeds the first D-type, and every D-type feeds the
+        next one on each rising edge of the clock. Switches sw2 and sw3,
+        driving SET and CLEAR, are LOW. The last Q outputs are monitored.
+        """
+        data = self._add_switch()
+        preset = self._add_switch("LOW")
+        reset = self._add_switch("LOW")
+        self._add_clock("clk", clock_length)
+        for stage in range(length):
+            name = "d%d" % stage
+            self._add_d_type(name, data, "clk", preset, reset)
+            data = name + ".Q"
+        self._monitor(["d%d.Q" % stage for stage in
+                       reversed(range(length))])
+        return self._text()
+
+
+def main(arg_list):
+    """Parse the options and write the generated definition file."""
+    usage_message = ("Usage:\n"
+                     "python circuit_generator.py [-s <seed>] [-d <depth>] "
+                     "[-o <output path>] <circuit kind> <size>\n"
+                     "Circuit kinds: adder, counter, dag, shift")
+    try:
+        options, arguments = getopt.getopt(arg_list, "hs:d:o:")
+    except getopt.GetoptError:
+        print("Error: invalid command line arguments\n")
+        print(usage_message)
+        sys.exit(2)
+    options = dict(options)
+    if "-h" in options:
+        print(usage_message)
+        sys.exit()
+    try:
+        seed = int(options.get("-s", 0))
+        depth = int(options.get("-d", 10))
+        [kind, size] = arguments
+        size = int(size)
+    except ValueError:
+        print("Error: invalid command line arguments\n")
+        print(usage_message)
+        sys.exit(2)
+
+    generator = CircuitGenerator(seed)
+    circuits = {"adder": generator.ripple_carry_adder,
+                "counter": generator.counter,
+                "dag": lambda size: generator.random_dag(size, depth),
+                "shift": generator.shift_register}
+    if kind not in circuits or size < 1:
+        print("Error: invalid circuit kind or size\n")
+        print(usage_message)
+        sys.exit(2)
+    text = circuits[kind](size)
+    if "-o" in options:
+        with open(options["-o"], "w") as output_file:
+            output_file.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -23,6 +23,11 @@ class Device:
     No public methods.
     """
 
+    # Netlists can have millions of devices, so they have no __dict__
+    __slots__ = ("device_id", "inputs", "outputs", "device_kind",
+                 "clock_half_period", "clock_counter", "switch_state",
+                 "dtype_memory")
+
     def __init__(self, device_id):
         """Initialise device properties."""
         self.device_id = device_id
@@ -45,7 +50,8 @@ class Devices:
     """Make and store devices.
 
     This class contains many functions for making devices and ports.
-    It stores all the devices in a list.
+    It stores all the devices in a list, indexed by device ID and by device
+    kind for constant-time lookups.
 
     Parameters
     ----------
@@ -88,6 +94,9 @@ class Devices:
 
     make_d_type(self, device_id): Makes a D-type device.
 
+    set_seed(self, seed=None): Sets the seed of the random number generator
+                               used by cold_startup.
+
     cold_startup(self): Simulates cold start-up of D-types and clocks.
 
     make_device(self, device_id, device_kind, device_property=None): Creates
@@ -103,6 +112,19 @@ class Devices:
         # List of Device type objects - can assign attributes
         self.devices_list = []
 
+        # Indexes kept in step with devices_list by add_device
+        # {device_id: Device}
+        self.devices_dictionary = {}
+        # {device_kind: {device_id: None}}, dicts used as ordered sets
+        self.device_kind_sets = {}
+
+        # Random number generator of the cold start-up states, the seed of
+        # every cold start, or None for a new seed each time, and the seed
+        # used by the last cold start
+        self.random = random.Random()
+        self.seed = None
+        self.cold_startup_seed = None
+
         gate_strings = ["AND", "OR", "NAND", "NOR", "XOR", "NOT"]
         device_strings = ["CLOCK", "SWITCH", "DTYPE"]
         dtype_inputs = ["CLK", "SET", "CLEAR", "DATA"]
@@ -128,10 +150,7 @@ class Devices:
 
     def get_device(self, device_id):
         """Return the Device object corresponding to device_id."""
-        for device in self.devices_list:
-            if device.device_id == device_id:
-                return device
-        return None
+        return self.devices_dictionary.get(device_id)
 
     def find_devices(self, device_kind=None):
         """Return a list of device IDs of the specified device_kind.
@@ -139,19 +158,17 @@ class Devices:
         Return a list of all device IDs in the network if no device_kind is
         specified.
         """
-        device_id_list = []
-        for device in self.devices_list:
-            if device_kind is None:
-                device_id_list.append(device.device_id)
-            elif device.device_kind == device_kind:
-                device_id_list.append(device.device_id)
-        return device_id_list
+        if device_kind is None:
+            return list(self.devices_dictionary)
+        return list(self.device_kind_sets.get(device_kind, ()))
 
     def add_device(self, device_id, device_kind):
         """Add the specified device to the network."""
         new_device = Device(device_id)
         new_device.device_kind = device_kind
         self.devices_list.append(new_device)
+        self.devices_dictionary.setdefault(device_id, new_device)
+        self.device_kind_sets.setdefault(device_kind, {})[device_id] = None
 
     def add_input(self, device_id, input_id):
         """Add the specified input to the specified device.
@@ -239,7 +256,8 @@ class Devices:
         self.add_device(device_id, self.CLOCK)
         device = self.get_device(device_id)
         device.clock_half_period = clock_half_period
-        self.cold_startup()  # clock initialised to a random point in its cycle
+        # clock initialised to a random point in its cycle
+        self._cold_start_device(device)
 
     def make_gate(self, device_id, device_kind, no_of_inputs):
         """Make logic gates with the specified number of inputs."""
@@ -265,25 +283,49 @@ class Devices:
             self.add_input(device_id, input_id)
         for output_id in self.dtype_output_ids:
             self.add_output(device_id, output_id)
-        self.cold_startup()  # D-type initialised to a random state
+        # D-type initialised to a random state
+        self._cold_start_device(self.get_device(device_id))
+
+    def set_seed(self, seed=None):
+        """Set the seed of the random number generator used by cold_startup.
+
+        With a seed, every cold start gives the same states. With None, each
+        cold start draws a new seed, which is stored in cold_startup_seed so
+        that the run can be replayed.
+        """
+        self.seed = seed
 
     def cold_startup(self):
         """Simulate cold start-up of D-types and clocks.
 
         Set the memory of the D-types to a random state and make the clocks
-        begin from a random point in their cycles.
+        begin from a random point in their cycles. The states only depend on
+        the seed, which is stored in cold_startup_seed.
+        """
+        seed = self.seed
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(32)
+        self.random.seed(seed)
+        self.cold_startup_seed = seed
+        for device_kind in [self.D_TYPE, self.CLOCK]:
+            for device_id in self.find_devices(device_kind):
+                self._cold_start_device(self.get_device(device_id))
+
+    def _cold_start_device(self, device):
+        """Simulate cold start-up of a single D-type or clock.
+
+        Devices of any other kind are left unchanged.
         """
-        for device in self.devices_list:
-            if device.device_kind == self.D_TYPE:
-                device.dtype_memory = random.choice([self.LOW, self.HIGH])
-
-            elif device.device_kind == self.CLOCK:
-                clock_signal = random.choice([self.LOW, self.HIGH])
-                self.add_output(device.device_id, output_id=None,
-                                signal=clock_signal)
-                # Initialise it to a random point in its cycle.
-                device.clock_counter = \
-                    random.randrange(device.clock_half_period)
+        if device.device_kind == self.D_TYPE:
+            device.dtype_memory = self.random.choice([self.LOW, self.HIGH])
+
+        elif device.device_kind == self.CLOCK:
+            clock_signal = self.random.choice([self.LOW, self.HIGH])
+            self.add_output(device.device_id, output_id=None,
+                            signal=clock_signal)
+            # Initialise it to a random point in its cycle.
+            device.clock_counter = \
+                self.random.randrange(device.clock_half_period)
 
     def make_device(self, device_id, device_kind, device_property=None):
         """Create the specified device.
@@ -17,3 +17,7 @@ class GlobalVars:
         self.def_edited = False
         # whether parse_network() returns True
         self.compilation_success = False
+        # VCD file that the monitored signals are streamed to, and whether
+        # the traces are also kept for display
+        self.vcd_path = None
+        self.vcd_keep_traces = True
@@ -25,6 +25,7 @@ from gui_modules.gui_inputs_tab import InputsTab
 from gui_modules.gui_monitors_tab import MonitorsTab
 from gui_modules.gui_canvas import MyGLCanvas
 from global_vars import GlobalVars
+from circuit_cache import CircuitCache
 
 
 class Gui(wx.Frame):
@@ -58,6 +59,9 @@ class Gui(wx.Frame):
 
     save_plot(self): Launches a dialog to save the signal trace as an image.
 
+    save_vcd(self): Launches a dialog to stream the monitored signals to a
+                    VCD file.
+
     save_file(self, pathname): Launches a dialog to save the current file.
 
     save_file_as(self): Launches a dialog for to save the current file as a new
@@ -80,6 +84,7 @@ class Gui(wx.Frame):
         self.monitors = monitors
 
         self.global_vars = GlobalVars()
+        self.circuit_cache = CircuitCache()
 
         if self.path is None:  # open up the file dialog
             if not self.open_file():
@@ -88,9 +93,9 @@ class Gui(wx.Frame):
                 self.Close(True)  # exit the application
                 sys.exit()
 
-        self.scanner = Scanner(self.path, names)
-        self.parser = Parser(names, devices, network,
-                             monitors, self.scanner, self.global_vars)
+        # Built by compile when the circuit is not in the cache
+        self.scanner = None
+        self.parser = None
 
         # Create the menu, toolbar and statusbar
         self._create_menu()
@@ -205,6 +210,7 @@ class Gui(wx.Frame):
         fileMenu = wx.Menu()
         fileMenu.Append(wx.ID_ABOUT, _(u"&About"))
         fileMenu.Append(wx.ID_SAVEAS, _(u"&Save As"))
+        fileMenu.Append(wx.ID_CONVERT, _(u"Write &VCD File"))
         fileMenu.Append(wx.ID_EXIT, _(u"&Exit"))
 
         menuBar = wx.MenuBar()
@@ -255,6 +261,12 @@ class Gui(wx.Frame):
         self.spin.SetMax(1000)
         tb.AddControl(self.spin, _(u"Cycles"))
 
+        # Cold start seed, left blank for a new seed on every run
+        self.seed_text = wx.TextCtrl(tb, wx.ID_ANY, "", size=(90, -1))
+        self.seed_text.SetHint(_(u"Seed"))
+        self.seed_text.SetToolTip(_(u"Cold start seed, blank for random"))
+        tb.AddControl(self.seed_text, _(u"Seed"))
+
         tb.AddStretchableSpace()
         tb.AddTool(8, _(u"Save Plot"),
                    wx.Image("./final/imgs/save image.png",
@@ -298,6 +310,8 @@ class Gui(wx.Frame):
                           _(u"About Logsim"), wx.ICON_INFORMATION | wx.OK)
         if Id == wx.ID_SAVEAS:
             self.save_file_as()
+        if Id == wx.ID_CONVERT:
+            self.save_vcd()
 
     def _on_spin(self, event):
         """Handle the event when the user changes the spin control value."""
@@ -360,17 +374,31 @@ class Gui(wx.Frame):
         self.consoleOutPanel.clear_console()
 
         # reinitialise instances
+        self.monitors.stop_vcd()
         self.names.__init__()
         self.devices.__init__(self.names)
         self.network.__init__(self.names, self.devices)
         self.monitors.__init__(self.names, self.devices, self.network)
-        self.scanner.__init__(self.path, self.names)
-        self.parser.__init__(self.names, self.devices,
-                             self.network, self.monitors,
-                             self.scanner, self.global_vars)
 
         try:
-            if self.parser.parse_network():
+            # load the circuit from the cache if it has been compiled before
+            if self.circuit_cache.load(self.path, self.names, self.devices,
+                                       self.network, self.monitors):
+                self.global_vars.compilation_success = True
+                print(_(u"Loaded compiled circuit from cache."))
+                compiled = True
+            else:
+                self.scanner = Scanner(self.path, self.names)
+                self.parser = Parser(self.names, self.devices,
+                                     self.network, self.monitors,
+                                     self.scanner, self.global_vars)
+                self.consoleOutPanel.parser = self.parser
+                compiled = self.parser.parse_network()
+                if compiled:
+                    self.circuit_cache.save(self.path, self.names,
+                                            self.devices, self.network,
+                                            self.monitors)
+            if compiled:
                 # update the inputs panel
                 self.inputsPanel.refresh_list()
                 # update the monitors panel
@@ -398,7 +426,14 @@ class Gui(wx.Frame):
             print('No monitors.')
             return
 
-        self.consoleOutPanel.run_command(True, self.spin.GetValue())
+        seed_string = self.seed_text.GetValue().strip()
+        if seed_string and not seed_string.isdigit():
+            self.statusbar.SetStatusText(
+                _(u"The seed must be a non-negative integer."))
+            return
+        seed = int(seed_string) if seed_string else None
+
+        self.consoleOutPanel.run_command(True, self.spin.GetValue(), seed)
         self.canvas.render_signals(flush_pan=True)
 
     def _on_cont_button(self):
@@ -536,6 +571,20 @@ class Gui(wx.Frame):
             pathname = file_dialog.GetPath()
             self.canvas.save(pathname)
 
+    def save_vcd(self):
+        """Launch a dialog to stream the monitored signals to a VCD file."""
+        with wx.FileDialog(self, _(u"Write VCD File"),
+                           defaultFile=_(u"signals") + ".vcd",
+                           wildcard=_(u"VCD files") + " (*.vcd)|*.vcd",
+                           style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT) as \
+                file_dialog:
+            if file_dialog.ShowModal() == wx.ID_CANCEL:
+                return  # the user changed their mind
+
+            # Signals are written from the next simulation cycle on
+            pathname = file_dialog.GetPath()
+            self.consoleOutPanel.vcd_command(True, pathname)
+
     def save_file(self, pathname):
         """Launch a dialog to save the current file."""
         try:
@@ -353,36 +353,45 @@ class MyGLCanvas(wxcanvas.GLCanvas):
             blank_cycles = cycles_completed-cycles_monitored
             x += self.curr_wavelength*blank_cycles
 
-            for signal in signal_list:
-                if x < self.origin_x - self.pan_x - self.curr_wavelength:
-                    # Don't render signals to the left of visible area
-                    x += self.curr_wavelength
+            # Draw whole runs of constant signal level at once
+            for start, length, signal in signal_list.runs():
+                if signal in [self.devices.HIGH, self.devices.LOW]:
+                    run_end = x + self.curr_wavelength*length
+                    if run_end >= self.origin_x - self.pan_x:
+                        # Clip the run to the visible area
+                        if signal == self.devices.HIGH:
+                            level = y + self.amplitude
+                        else:
+                            level = y
+                        GL.glVertex2f(max(x, self.origin_x - self.pan_x),
+                                      level)
+                        GL.glVertex2f(run_end, level)
+                    x = run_end
                     continue
-                elif x < self.origin_x - self.pan_x:
-                    # Partially visible, add offset to avoid waveform
-                    # obscuring labels
-                    offset = self.origin_x - self.pan_x - x
-                else:
-                    offset = 0
 
-                # Signals for a particular device
-                if signal == self.devices.HIGH:
-                    GL.glVertex2f(x + offset, y + self.amplitude)
-                    GL.glVertex2f(x + self.curr_wavelength,
-                                  y + self.amplitude)
-                if signal == self.devices.LOW:
-                    GL.glVertex2f(x + offset, y)
-                    GL.glVertex2f(x + self.curr_wavelength, y)
-                if signal == self.devices.RISING:
-                    GL.glVertex2f(x + offset, y)
-                    GL.glVertex2f(x + self.curr_wavelength,
-                                  y + self.amplitude)
-                if signal == self.devices.FALLING:
-                    GL.glVertex2f(x + offset, y + self.amplitude)
-                    GL.glVertex2f(x + self.curr_wavelength, y)
-                if signal == self.devices.BLANK:
-                    pass
-                x += self.curr_wavelength
+                for _ in range(length):
+                    if x < self.origin_x - self.pan_x - self.curr_wavelength:
+                        # Don't render signals to the left of visible area
+                        x += self.curr_wavelength
+                        continue
+                    elif x < self.origin_x - self.pan_x:
+                        # Partially visible, add offset to avoid waveform
+                        # obscuring labels
+                        offset = self.origin_x - self.pan_x - x
+                    else:
+                        offset = 0
+
+                    # Signals for a particular device
+                    if signal == self.devices.RISING:
+                        GL.glVertex2f(x + offset, y)
+                        GL.glVertex2f(x + self.curr_wavelength,
+                                      y + self.amplitude)
+                    if signal == self.devices.FALLING:
+                        GL.glVertex2f(x + offset, y + self.amplitude)
+                        GL.glVertex2f(x + self.curr_wavelength, y)
+                    if signal == self.devices.BLANK:
+                        pass
+                    x += self.curr_wavelength
 
             GL.glEnd()
             y += self.component_vspace
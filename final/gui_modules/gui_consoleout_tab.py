@@ -67,10 +67,17 @@ class ConsoleOutTab(wx.Panel):
     switch_command(self): Set the specified switch to the specified
                         signal level.
 
+    vcd_command(self, keep_traces, path=None): Stream the monitored
+                        signals to the specified VCD file.
+
+    profile_command(self): Start or stop profiling the network, or print
+                        the profile.
+
     run_network(self, cycles): Run the network for the specified
                         number of simulation cycles.
 
-    run_command(self, gui, gui_cycles): Run the simulation from scratch.
+    run_command(self, gui, gui_cycles, gui_seed): Run the simulation from
+                        scratch.
 
     continue_command(self, gui, gui_cycles): Continue a previously run
                                             simulation.
@@ -152,6 +159,12 @@ class ConsoleOutTab(wx.Panel):
             self.run_command()
         elif command == "c":
             self.continue_command()
+        elif command == "v":
+            self.vcd_command(True)
+        elif command == "w":
+            self.vcd_command(False)
+        elif command == "p":
+            self.profile_command()
         elif command == "q":
             self.clear_console()
         else:
@@ -167,9 +180,19 @@ class ConsoleOutTab(wx.Panel):
         print(_(u"User commands:"))
         print("r N       - " + _(u"run the simulation for N cycles"))
         print("            " + _(u"(from scratch)"))
+        print("r N S     - " + _(u"run the simulation for N cycles"))
+        print("            " + _(u"with cold start seed S"))
         print("c N       - " + _(u"continue the simulation for N"))
         print("            " + _(u"cycles"))
         print("s X N     - " + _(u"set switch X to N (0 or 1)"))
+        print("v F       - " + _(u"also write the monitored signals"))
+        print("            " + _(u"to VCD file F"))
+        print("w F       - " + _(u"only write the monitored signals"))
+        print("            " + _(u"to VCD file F"))
+        print("v         - " + _(u"stop writing to the VCD file"))
+        print("p 1       - " + _(u"start profiling the simulation"))
+        print("p 0       - " + _(u"stop profiling the simulation"))
+        print("p         - " + _(u"print the simulation profile"))
         print("q         - " + _(u"clear this console"))
         print("h         - " + _(u"help (this command)"))
 
@@ -185,38 +208,112 @@ class ConsoleOutTab(wx.Panel):
                 else:
                     print(_(u"Error! Invalid switch."))
 
+    def vcd_command(self, keep_traces, path=None):
+        """Stream the monitored signals to the specified VCD file.
+
+        If keep_traces is False, the signals are only written to the file.
+        Without a file name, streaming is stopped.
+        """
+        if path is None:
+            path = self.line[self.cursor:].strip()
+        if not path:
+            if self.monitors.stop_vcd():
+                print(_(u"Stopped writing to ") + self.global_vars.vcd_path)
+            self.global_vars.vcd_path = None
+            return
+        if self.monitors.start_vcd(path, keep_traces,
+                                   self.global_vars.cycles_completed):
+            self.global_vars.vcd_path = path
+            self.global_vars.vcd_keep_traces = keep_traces
+            print(_(u"Writing monitored signals to ") + path)
+        else:
+            self.global_vars.vcd_path = None
+            print(_(u"Error! Could not open ") + path)
+
+    def profile_command(self):
+        """Start or stop profiling the network, or print the profile.
+
+        Stopping profiling also prints the profile.
+        """
+        if self.line[self.cursor:].strip():
+            profiling = self._read_number(0, 1)
+            if profiling is None:
+                return
+            if profiling:
+                self.network.start_profiling()
+                print(_(u"Started profiling."))
+                return
+            profile = self.network.stop_profiling()
+        else:
+            profile = self.network.profile
+        if profile is None:
+            print(_(u"Error! Not profiling. Enter 'p 1' to start."))
+        else:
+            print(profile.get_report())
+
     def run_network(self, cycles):
         """Run the network for the specified number of simulation cycles.
 
         Return True if successful.
         """
-        for _ in range(cycles):
+        cycles_run = 0
+        while cycles_run < cycles:
             if self.network.execute_network():
                 self.monitors.record_signals()
+                cycles_run += 1
+                # Settled signals only change again at the next clock edge
+                idle_cycles = self.network.skip_idle_cycles(cycles -
+                                                            cycles_run)
+                if idle_cycles:
+                    self.monitors.record_signals(idle_cycles)
+                    cycles_run += idle_cycles
             else:
                 self.parent.GetParent().statusbar\
                     .SetStatusText("Error! Network oscillating.")
                 print("Error! Network oscillating.")
+                if self.network.oscillating_devices:
+                    print(_(u"Oscillating devices: ") + ", ".join(
+                        self.names.get_name_string(device_id) for device_id in
+                        self.network.oscillating_devices))
                 return False
+        if self.monitors.vcd_writer is not None:
+            self.monitors.vcd_writer.flush()
         # self.monitors.display_signals()
         return True
 
-    def run_command(self, gui=False, gui_cycles=None):
-        """Run the simulation from scratch."""
+    def run_command(self, gui=False, gui_cycles=None, gui_seed=None):
+        """Run the simulation from scratch.
+
+        The cold start uses the seed given, or a new seed, which is printed
+        so that the run can be replayed.
+        """
         if not self.global_vars.compilation_success:
             print('Cannot run simulation with errors.')
             return
 
         self.global_vars.cycles_completed = 0
+        seed = None
         if gui:
             cycles = gui_cycles
+            seed = gui_seed
         else:
             cycles = self._read_number(0, None)
+            if cycles is not None and self.line[self.cursor:].strip():
+                seed = self._read_number(0, None)
+                if seed is None:
+                    return
 
         if cycles is not None:  # if the number of cycles provided is valid
             self.monitors.reset_monitors()
-            print("".join([_(u"Running for "), str(cycles), _(u" cycle(s)")]))
+            self.devices.set_seed(seed)
             self.devices.cold_startup()
+            if self.global_vars.vcd_path is not None:
+                # start the VCD file again
+                self.monitors.start_vcd(self.global_vars.vcd_path,
+                                        self.global_vars.vcd_keep_traces)
+            print("".join([_(u"Running for "), str(cycles), _(u" cycle(s)"),
+                           _(u" with seed "),
+                           str(self.devices.cold_startup_seed)]))
             if self.run_network(cycles):
                 self.global_vars.cycles_completed += cycles
                 self.set_gui_state(True)
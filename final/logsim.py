@@ -2,14 +2,19 @@
 """Parse command line options and arguments for the Logic Simulator.
 
 This script parses options and arguments specified on the command line, and
-runs either the command line user interface or the graphical user interface.
+runs either the command line user interface, a batch simulation or the
+graphical user interface. Each interface is only imported when it is used, so
+the command line and batch modes never import wxPython or OpenGL.
 
 Usage
 -----
 Show help: logsim.py -h
 Command line user interface: logsim.py -c <file path>
+Batch simulation: logsim.py -b <file path> [-n <cycles>] [-s <switch>=<0|1>]
+                  [-r <seed>] [-o <output path>] [-f text|json|csv|vcd]
 Graphical user interface: logsim.py <file path>
 """
+import contextlib
 import getopt
 import sys
 
@@ -19,9 +24,106 @@ from network import Network
 from monitors import Monitors
 from scanner import Scanner
 from parse import Parser
-from userint import UserInterface
-from gui import Gui
 from global_vars import GlobalVars
+from circuit_cache import CircuitCache
+
+
+def compile_circuit(path, names, devices, network, monitors, global_vars):
+    """Compile the definition file at path, or load it from the cache.
+
+    Return True if successful.
+    """
+    circuit_cache = CircuitCache()
+    if circuit_cache.load(path, names, devices, network, monitors):
+        global_vars.compilation_success = True
+        print("Loaded compiled circuit from cache.")
+        return True
+    scanner = Scanner(path, names)
+    parser = Parser(names, devices, network, monitors, scanner, global_vars)
+    if parser.parse_network():
+        circuit_cache.save(path, names, devices, network, monitors)
+        return True
+    return False
+
+
+def run_batch(path, batch_options, names, devices, network, monitors):
+    """Run a batch simulation of the definition file at path.
+
+    batch_options is a list of (option, value) pairs for the -n, -s, -r, -o
+    and -f options. Return the exit status: 0 if successful, 1 if the file has
+    errors, the output file cannot be opened or the network oscillates, and 2
+    if the options are invalid.
+    """
+    from batch import BatchSimulator
+
+    cycles = 10
+    switch_settings = []
+    seed = None
+    output_path = None
+    output_format = "text"
+    for option, value in batch_options:
+        if option == "-n":
+            if not value.isdigit() or int(value) == 0:
+                print("Error: the number of cycles must be a positive "
+                      "integer", file=sys.stderr)
+                return 2
+            cycles = int(value)
+        elif option == "-s":
+            switch_settings.append(value)
+        elif option == "-r":
+            if not value.isdigit():
+                print("Error: the seed must be a non-negative integer",
+                      file=sys.stderr)
+                return 2
+            seed = int(value)
+        elif option == "-o":
+            output_path = value
+        elif option == "-f":
+            output_format = value
+    if output_format not in BatchSimulator.output_formats:
+        print("Error: unknown output format " + output_format,
+              file=sys.stderr)
+        return 2
+    if output_format == "vcd" and output_path is None:
+        print("Error: the vcd format needs an output path", file=sys.stderr)
+        return 2
+
+    # The parser reports to stdout, which may be the output
+    with contextlib.redirect_stdout(sys.stderr):
+        if not compile_circuit(path, names, devices, network, monitors,
+                               GlobalVars()):
+            return 1
+
+    simulator = BatchSimulator(names, devices, network, monitors)
+    invalid_setting = simulator.set_switches(switch_settings)
+    if invalid_setting is not None:
+        print("Error: invalid switch setting " + invalid_setting,
+              file=sys.stderr)
+        return 2
+    try:
+        if output_format == "vcd":
+            steady_state = simulator.run(cycles, output_path, seed)
+        else:
+            steady_state = simulator.run(cycles, seed=seed)
+            if output_path is None:
+                simulator.write_results(sys.stdout, output_format)
+            else:
+                with open(output_path, "w") as output_file:
+                    simulator.write_results(output_file, output_format)
+    except OSError:
+        print("Error: could not open " + output_path, file=sys.stderr)
+        return 1
+    if not steady_state:
+        print("Error: network oscillating after " +
+              str(simulator.cycles_completed) + " cycles", file=sys.stderr)
+        if network.oscillating_devices:
+            print("Oscillating devices: " + ", ".join(
+                names.get_name_string(device_id) for device_id in
+                network.oscillating_devices), file=sys.stderr)
+        print("Replay with -r " + str(devices.cold_startup_seed),
+              file=sys.stderr)
+        return 1
+    return 0
 
 
 def main(arg_list):
@@ -33,9 +135,13 @@ def main(arg_list):
     usage_message = ("Usage:\n"
                      "Show help: logsim.py -h\n"
                      "Command line user interface: logsim.py -c <file path>\n"
+                     "Batch simulation: logsim.py -b <file path> "
+                     "[-n <cycles>] [-s <switch>=<0|1>]\n"
+                     "                  [-r <seed>] [-o <output path>] "
+                     "[-f text|json|csv|vcd]\n"
                      "Graphical user interface: logsim.py <file path>")
     try:
-        options, arguments = getopt.getopt(arg_list, "hc:")
+        options, arguments = getopt.getopt(arg_list, "hc:b:n:s:r:o:f:")
     except getopt.GetoptError:
         print("Error: invalid command line arguments\n")
         print(usage_message)
@@ -51,18 +157,21 @@ def main(arg_list):
     # network = None
     # monitors = None
 
+    batch_options = [(option, value) for option, value in options
+                     if option in ["-n", "-s", "-r", "-o", "-f"]]
     for option, path in options:
         if option == "-h":  # print the usage message
             print(usage_message)
             sys.exit()
+        elif option == "-b":  # run a batch simulation without interaction
+            sys.exit(run_batch(path, batch_options, names, devices, network,
+                               monitors))
         elif option == "-c":  # use the command line user interface
             global_vars = GlobalVars()
-            scanner = Scanner(path, names)
-            parser = Parser(names, devices, network,
-                            monitors, scanner, global_vars)
-
-            if parser.parse_network():
+            if compile_circuit(path, names, devices, network, monitors,
+                               global_vars):
                 # Initialise an instance of the userint.UserInterface() class
+                from userint import UserInterface
                 userint = UserInterface(names, devices, network, monitors)
                 userint.command_interface()
 
@@ -75,6 +184,7 @@ def main(arg_list):
 
         # Initialise an instance of the gui.Gui() class and
         # wxPython translation capability
+        from gui import Gui
         import app_base as ab
         app = ab.BaseApp(redirect=False)
         app.OnInit()
@@ -6,11 +6,243 @@ signals.
 Classes
 -------
 Monitors - records and displays specified output signals.
+SignalTrace - stores the signal levels of a monitor as runs.
+VcdWriter - streams the monitored signals to a Value Change Dump file.
 
 """
+import array
+import bisect
 import collections
 
 
+class SignalTrace:
+    """Store the signal levels recorded by a monitor as runs.
+
+    A run is a stretch of cycles with the same signal level. Only the first
+    cycle and the signal level of each run are stored, in compact arrays, so
+    the memory used scales with the number of signal changes rather than
+    the number of cycles. Looking up the signal level at a cycle is a binary
+    search over the runs.
+
+    The trace behaves like a read-only list of signal levels: it has a
+    length, can be indexed, sliced and iterated over, and compares equal to
+    a list holding the same signal levels.
+
+    Parameters
+    ----------
+    signal_list: initial signal levels of the trace.
+
+    Public methods
+    --------------
+    append(self, signal, cycles=1): Adds a signal level to the end of the
+                                    trace for the given number of cycles.
+
+    extend(self, signal_list): Adds signal levels to the end of the trace.
+
+    clear(self): Removes all the signal levels from the trace.
+
+    value_at(self, cycle): Returns the signal level at the given cycle.
+
+    edges_between(self, first_cycle, last_cycle): Returns the signal
+                                   changes between the two given cycles.
+
+    runs(self): Returns an iterator over the runs of the trace.
+    """
+
+    def __init__(self, signal_list=()):
+        """Initialise the run arrays."""
+        self.run_starts = array.array("q")  # first cycle of each run
+        self.run_signals = array.array("b")  # signal level of each run
+        self.length = 0
+        self.extend(signal_list)
+
+    def __len__(self):
+        """Return the number of recorded signal levels."""
+        return self.length
+
+    def __getitem__(self, index):
+        """Return the signal level at index, or a list for a slice."""
+        if isinstance(index, slice):
+            return [self.value_at(cycle)
+                    for cycle in range(*index.indices(self.length))]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("signal trace index out of range")
+        return self.value_at(index)
+
+    def __iter__(self):
+        """Return an iterator over the signal levels."""
+        for start, length, signal in self.runs():
+            for _ in range(length):
+                yield signal
+
+    def __eq__(self, other):
+        """Return True if other holds the same signal levels in order."""
+        if isinstance(other, SignalTrace):
+            return self.length == other.length and \
+                self.run_starts == other.run_starts and \
+                self.run_signals == other.run_signals
+        if isinstance(other, (list, tuple, array.array)):
+            return self.length == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        """Return the signal levels in the form of a list."""
+        return "SignalTrace(%r)" % list(self)
+
+    def append(self, signal, cycles=1):
+        """Add a signal level to the end of the trace for some cycles."""
+        if cycles <= 0:
+            return
+        if not self.run_signals or self.run_signals[-1] != signal:
+            self.run_signals.append(signal)
+            self.run_starts.append(self.length)
+        self.length += cycles
+
+    def extend(self, signal_list):
+        """Add signal levels to the end of the trace."""
+        for signal in signal_list:
+            self.append(signal)
+
+    def clear(self):
+        """Remove all the signal levels from the trace."""
+        del self.run_starts[:]
+        del self.run_signals[:]
+        self.length = 0
+
+    def value_at(self, cycle):
+        """Return the signal level at the given cycle.
+
+        Return None if the cycle has not been recorded.
+        """
+        if not 0 <= cycle < self.length:
+            return None
+        return self.run_signals[bisect.bisect_right(self.run_starts,
+                                                    cycle) - 1]
+
+    def edges_between(self, first_cycle, last_cycle):
+        """Return the signal changes from first_cycle up to last_cycle.
+
+        The changes are returned as a list of (cycle, signal) tuples, where
+        the signal changes to signal at cycle, for first_cycle <= cycle <
+        last_cycle. The first recorded cycle is not a change.
+        """
+        first_run = bisect.bisect_left(self.run_starts, max(first_cycle, 1))
+        last_run = bisect.bisect_left(self.run_starts, last_cycle)
+        return [(self.run_starts[run], self.run_signals[run])
+                for run in range(first_run, last_run)]
+
+    def runs(self):
+        """Return an iterator over the runs of the trace.
+
+        Each run is a (first cycle, number of cycles, signal) tuple.
+        """
+        run_ends = self.run_starts[1:]
+        run_ends.append(self.length)
+        return zip(self.run_starts,
+                   [end - start for start, end in
+                    zip(self.run_starts, run_ends)],
+                   self.run_signals)
+
+
+class VcdWriter:
+    """Stream the monitored signals to a Value Change Dump (VCD) file.
+
+    The header is written when this class is initialised, and each call to
+    record writes only the signals that have changed since the previous
+    call, so the file grows with the signal activity. Each simulation cycle
+    is one time unit. Output is buffered by the file object. The seed of
+    the last cold start, if any, is written in a header comment so the run
+    can be replayed.
+
+    Parameters
+    ----------
+    vcd_file: text file object opened for writing.
+    devices: instance of the devices.Devices() class.
+    monitored_outputs: list of (signal name, outputs dictionary of the
+                       device, output_id) for the signals to write.
+    start_cycle: simulation time of the first recorded cycle.
+
+    Public methods
+    --------------
+    record(self, cycles=1): Writes the signals that have changed, and
+                            advances the time by the number of cycles.
+
+    flush(self): Flushes the buffered output to the file.
+
+    close(self): Writes the end time and closes the file.
+    """
+
+    def __init__(self, vcd_file, devices, monitored_outputs, start_cycle=0):
+        """Write the VCD header."""
+        self.vcd_file = vcd_file
+        self.cycle = start_cycle
+        # VCD value of each signal level
+        self.values = {devices.LOW: "0", devices.HIGH: "1",
+                       devices.RISING: "1", devices.FALLING: "0",
+                       devices.BLANK: "x"}
+
+        # [(identifier code, outputs dictionary, output_id)]
+        self.signals = []
+        lines = ["$version Logic Simulator $end",
+                 "$timescale 1ns $end"]
+        if devices.cold_startup_seed is not None:
+            lines.append("$comment cold start seed %d $end" %
+                         devices.cold_startup_seed)
+        lines.append("$scope module logsim $end")
+        for number, (signal_name, outputs, output_id) in \
+                enumerate(monitored_outputs):
+            code = self._identifier_code(number)
+            self.signals.append((code, outputs, output_id))
+            lines.append("$var wire 1 %s %s $end" % (code, signal_name))
+        lines += ["$upscope $end", "$enddefinitions $end", ""]
+        self.vcd_file.write("\n".join(lines))
+        self.last_values = [None] * len(self.signals)
+
+    def _identifier_code(self, number):
+        """Return the VCD identifier code of the numbered signal.
+
+        Codes are strings of the printable characters from "!" to "~".
+        """
+        code = ""
+        while True:
+            number, digit = divmod(number, 94)
+            code += chr(33 + digit)
+            if number == 0:
+                return code
+            number -= 1
+
+    def record(self, cycles=1):
+        """Write the signals that have changed since the last record.
+
+        The time is then advanced by the number of cycles.
+        """
+        changes = []
+        last_values = self.last_values
+        for number, (code, outputs, output_id) in enumerate(self.signals):
+            value = self.values.get(outputs[output_id], "x")
+            if value != last_values[number]:
+                last_values[number] = value
+                changes.append(value + code)
+        if changes:
+            changes.insert(0, "#%d" % self.cycle)
+            changes.append("")
+            self.vcd_file.write("\n".join(changes))
+        self.cycle += cycles
+
+    def flush(self):
+        """Flush the buffered output to the file."""
+        self.vcd_file.flush()
+
+    def close(self):
+        """Write the end time and close the file."""
+        self.vcd_file.write("#%d\n" % self.cycle)
+        self.vcd_file.close()
+
+
 class Monitors:
     """Record and display output signals.
 
@@ -34,11 +266,18 @@ class Monitors:
     get_monitor_signal(self, device_id, output_id): Returns the signal level of
                                                     the specified monitor.
 
-    record_signals(self): Records the current signal level of all monitors.
+    record_signals(self, cycles=1): Records the current signal level of all
+                                    monitors for the given number of
+                                    cycles.
 
     get_signal_names(self): Returns two lists of signal names: monitored and
                             not monitored.
 
+    start_vcd(self, path, keep_traces=True, cycles_completed=0): Starts
+                            streaming the monitored signals to a VCD file.
+
+    stop_vcd(self): Stops streaming to the VCD file and closes it.
+
     reset_monitors(self): Clears the memory of all monitors.
 
     get_margin(self): Returns the length of the longest monitor's name.
@@ -53,9 +292,19 @@ class Monitors:
         self.devices = devices
 
         # monitors_dictionary stores
-        # {(device_id, output_id): [signal_list]}
+        # {(device_id, output_id): SignalTrace}
         self.monitors_dictionary = collections.OrderedDict()
 
+        # [(SignalTrace, outputs dictionary of the device, output_id)] for
+        # record_signals, built lazily and discarded whenever a monitor is
+        # made or removed
+        self.monitored_outputs = None
+
+        # VcdWriter fed by record_signals, if streaming to a VCD file, and
+        # whether the traces are also kept in monitors_dictionary
+        self.vcd_writer = None
+        self.keep_traces = True
+
         [self.NO_ERROR, self.NOT_OUTPUT,
          self.MONITOR_PRESENT] = self.names.unique_error_codes(3)
 
@@ -73,11 +322,11 @@ class Monitors:
             return self.MONITOR_PRESENT
         else:
             # If n simulation cycles have been completed before making this
-            # monitor, then initialise the signal trace with an n-length list
-            # of BLANK signals. Otherwise, initialise the trace with an empty
-            # list.
-            self.monitors_dictionary[(device_id, output_id)] = [
-                self.devices.BLANK] * cycles_completed
+            # monitor, then initialise the signal trace with n BLANK signals.
+            # Otherwise, initialise the trace empty.
+            self.monitors_dictionary[(device_id, output_id)] = SignalTrace(
+                [self.devices.BLANK] * cycles_completed)
+            self.monitored_outputs = None
             return self.NO_ERROR
 
     def remove_monitor(self, device_id, output_id):
@@ -89,6 +338,7 @@ class Monitors:
             return False
         else:
             del self.monitors_dictionary[(device_id, output_id)]
+            self.monitored_outputs = None
             return True
 
     def get_monitor_signal(self, device_id, output_id):
@@ -101,15 +351,23 @@ class Monitors:
         else:
             return None
 
-    def record_signals(self):
+    def record_signals(self, cycles=1):
         """Record the current signal level for every monitor.
 
-        This function is called at every simulation cycle.
+        This function is called at every simulation cycle. The current signal
+        levels are read for all the monitors at once, and recorded for the
+        given number of cycles.
         """
-        for device_id, output_id in self.monitors_dictionary:
-            signal_level = self.get_monitor_signal(device_id, output_id)
-            self.monitors_dictionary[(device_id,
-                                      output_id)].append(signal_level)
+        if self.monitored_outputs is None:
+            self.monitored_outputs = [
+                (signal_trace, self.devices.get_device(device_id).outputs,
+                 output_id) for (device_id, output_id), signal_trace in
+                self.monitors_dictionary.items()]
+        if self.keep_traces:
+            for signal_trace, outputs, output_id in self.monitored_outputs:
+                signal_trace.append(outputs[output_id], cycles)
+        if self.vcd_writer is not None:
+            self.vcd_writer.record(cycles)
 
     def get_signal_names(self):
         """Return two signal name lists: monitored and not monitored."""
@@ -129,13 +387,47 @@ class Monitors:
 
         return [monitored_signal_list, non_monitored_signal_list]
 
+    def start_vcd(self, path, keep_traces=True, cycles_completed=0):
+        """Start streaming the monitored signals to the VCD file at path.
+
+        Any previous VCD file is closed first. If keep_traces is False, the
+        signals are only written to the file and the traces in
+        monitors_dictionary are not recorded. Monitors made later are not
+        added to the file. Return True if successful.
+        """
+        self.stop_vcd()
+        try:
+            vcd_file = open(path, "w", buffering=1 << 16)
+        except OSError:
+            return False
+        monitored_outputs = [
+            (self.devices.get_signal_name(device_id, output_id),
+             self.devices.get_device(device_id).outputs, output_id)
+            for device_id, output_id in self.monitors_dictionary]
+        self.vcd_writer = VcdWriter(vcd_file, self.devices, monitored_outputs,
+                                    cycles_completed)
+        self.keep_traces = keep_traces
+        return True
+
+    def stop_vcd(self):
+        """Stop streaming to the VCD file and close it.
+
+        Return True if a VCD file was open.
+        """
+        self.keep_traces = True
+        if self.vcd_writer is None:
+            return False
+        self.vcd_writer.close()
+        self.vcd_writer = None
+        return True
+
     def reset_monitors(self):
         """Clear the memory of all the monitors.
 
         The list of stored signal levels for each monitor is deleted.
         """
-        for device_id, output_id in self.monitors_dictionary:
-            self.monitors_dictionary[(device_id, output_id)] = []
+        for signal_trace in self.monitors_dictionary.values():
+            signal_trace.clear()
 
     def get_margin(self):
         """Return the length of the longest monitor's name.
@@ -162,15 +454,15 @@ class Monitors:
             name_length = len(monitor_name)
             signal_list = self.monitors_dictionary[(device_id, output_id)]
             print(monitor_name + (margin - name_length) * " ", end=": ")
-            for signal in signal_list:
+            for start, length, signal in signal_list.runs():
                 if signal == self.devices.HIGH:
-                    print("-", end="")
+                    print("-" * length, end="")
                 if signal == self.devices.LOW:
-                    print("_", end="")
+                    print("_" * length, end="")
                 if signal == self.devices.RISING:
-                    print("/", end="")
+                    print("/" * length, end="")
                 if signal == self.devices.FALLING:
-                    print("\\", end="")
+                    print("\\" * length, end="")
                 if signal == self.devices.BLANK:
-                    print(" ", end="")
+                    print(" " * length, end="")
             print("\n", end="")
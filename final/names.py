@@ -13,7 +13,9 @@ class Names:
     """Map variable names and string names to unique integers.
 
     This class deals with storing grammatical keywords and user-defined words,
-    and their corresponding name IDs, which are internal indexing integers. It
+    and their corresponding name IDs, which are internal indexing integers.
+    Name IDs are indexes into the names list, and a dictionary from name
+    string to name ID keeps queries and lookups constant-time. It
     provides functions for looking up either the name ID or the name string.
     It also keeps track of the number of error codes defined by other classes,
     and allocates new, unique error codes on demand.
@@ -40,6 +42,7 @@ class Names:
     def __init__(self):
         """Initialise names list."""
         self.names = []
+        self.name_ids = {}  # {name_string: name_id}
         self.error_code_count = 0  # How many error codes have been declared
 
     def unique_error_codes(self, num_error_codes):
@@ -62,36 +65,31 @@ class Names:
         if not isinstance(name_string, str):
             raise TypeError("Expected name_string to be a string.")
 
-        for i in range(len(self.names)):
-            if name_string == self.names[i]:
-                return i
-
-        return None
+        return self.name_ids.get(name_string)
 
     def lookup(self, name_string_list):
         """Return a list of name IDs for each name string in name_string_list.
 
-        If the name string is not present in the names list, add it.
+        If the name string is not present in the names list, add it. The
+        whole list is interned in one pass, so it is much faster to look up
+        many names in a single call than one at a time.
         """
         if not isinstance(name_string_list, list):
             raise TypeError("Expected name_string_list to be a list.")
 
+        names = self.names
+        name_ids = self.name_ids
         name_id_list = []
 
         for name in name_string_list:
             if not isinstance(name, str):
                 raise TypeError("Expected contents of list to be a string.")
-
-            in_list = False
-            for i in range(len(self.names)):
-                if name == self.names[i]:
-                    name_id_list.append(i)
-                    in_list = True
-                    break
-
-            if in_list is False:
-                name_id_list.append(len(self.names))
-                self.names.append(name)
+            name_id = name_ids.get(name)
+            if name_id is None:
+                name_id = len(names)
+                names.append(name)
+                name_ids[name] = name_id
+            name_id_list.append(name_id)
 
         return name_id_list
 
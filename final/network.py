@@ -5,7 +5,15 @@ Used in the Logic Simulator project to add and connect devices together.
 Classes
 --------
 Network - builds and executes the network.
+NetworkProfile - counts device evaluations, output changes and time.
+CompiledNetwork - levelizes the network and executes it in ordered passes.
+BitParallelNetwork - executes many switch patterns at once, one per bit.
+VectorisedNetwork - executes the compiled network with NumPy arrays.
+GeneratedNetwork - generates and compiles Python code for the network.
 """
+import heapq
+import importlib.util
+import time
 
 
 class Network:
@@ -38,6 +46,12 @@ class Network:
                     second_port_id): Disconnects the first device from the
                                      second device
 
+    get_fanout(self, device_id, output_id): Returns the inputs connected to
+                                            the given output.
+
+    get_fanout_devices(self, device_id): Returns the devices with an input
+                                         connected to the given device.
+
     check_network(self): Checks if all inputs in the network are connected.
 
     update_signal(self, signal, target): Updates the signal in the direction of
@@ -60,6 +74,32 @@ class Network:
     update_clocks(self): If it is time to do so, sets clock signals to RISING
                          or FALLING.
 
+    skip_idle_cycles(self, cycles): Advances the clocks over cycles with no
+                                    clock edge and returns how many.
+
+    set_simulation_mode(self, mode): Selects the engine used by
+                                     execute_network.
+
+    set_iteration_limit(self, iteration_limit=None): Sets the number of sweeps
+                                     allowed for the signals to settle.
+
+    get_logic_depth(self): Returns the length of the longest chain of gates
+                           and D-types.
+
+    get_iteration_limit(self): Returns the number of sweeps allowed for the
+                               signals to settle.
+
+    compile_network(self): Returns the compiled network, building it if
+                           needed.
+
+    generate_network(self): Returns the generated code of the network,
+                            building it if needed.
+
+    start_profiling(self): Starts a new profile of execute_network and
+                           returns it.
+
+    stop_profiling(self): Stops profiling and returns the profile.
+
     execute_network(self): Executes all the devices in the network for one
                            simulation cycle.
     """
@@ -85,6 +125,52 @@ class Network:
         # {connection_id: (output_id, output_port_id, input_id, input_port_id)}
         self.connections = {}
 
+        # Fanout index kept in step with the device inputs by make_connection
+        # and remove_connection, with dicts used as ordered sets
+        # {(output_device_id, output_port_id):
+        #  {(input_device_id, input_port_id): None}}
+        self.fanout_index = {}
+
+        # SWEEP re-evaluates every device on every iteration, EVENT_DRIVEN
+        # only re-evaluates devices whose inputs have changed, LEVELIZED
+        # settles the logic in one topologically ordered pass, VECTORISED
+        # does the same with NumPy arrays, one operation per group of gates,
+        # and GENERATED runs the sweep as generated Python code
+        self.simulation_modes = [self.SWEEP, self.EVENT_DRIVEN,
+                                 self.LEVELIZED, self.VECTORISED,
+                                 self.GENERATED] = range(5)
+        self.simulation_mode = self.SWEEP
+
+        # Evaluation order, fanout and output snapshots for EVENT_DRIVEN mode,
+        # built lazily and discarded whenever the connections change
+        self._event_schedule = None
+        self._event_full_sweep = True
+
+        # CompiledNetwork for LEVELIZED and VECTORISED modes, built lazily and
+        # discarded whenever the connections change
+        self.compiled_network = None
+
+        # GeneratedNetwork for GENERATED mode, built lazily and discarded
+        # whenever the connections change
+        self.generated_network = None
+
+        # Sweeps allowed for the signals to settle in each cycle, or None to
+        # derive the limit from the logic depth of the network
+        self.iteration_limit = None
+        # (logic depth, device count), built lazily and discarded whenever
+        # the connections change
+        self._logic_depth = None
+
+        # IDs of the devices whose outputs kept changing when execute_network
+        # last failed to settle
+        self.oscillating_devices = []
+
+        # NetworkProfile filled in by execute_network while profiling, or
+        # None, and the sweeps taken to settle by the last SWEEP or
+        # EVENT_DRIVEN cycle
+        self.profile = None
+        self.settle_iterations = None
+
     def get_connected_output(self, device_id, input_id):
         """Return the output connected to the given input.
 
@@ -148,6 +234,8 @@ class Network:
                 # Make connection
                 first_device.inputs[first_port_id] = (second_device_id,
                                                       second_port_id)
+                self._add_fanout(second_device_id, second_port_id,
+                                 first_device_id, first_port_id)
                 error_type = self.NO_ERROR
                 # print("No error")
             else:  # second_port_id is not a valid input or output port
@@ -167,6 +255,8 @@ class Network:
                 else:
                     second_device.inputs[second_port_id] = (first_device_id,
                                                             first_port_id)
+                    self._add_fanout(first_device_id, first_port_id,
+                                     second_device_id, second_port_id)
                     error_type = self.NO_ERROR
                     # print("No error")
             else:
@@ -187,6 +277,10 @@ class Network:
             connection = (first_device_id, first_port_id,
                           second_device_id, second_port_id)
             self.connections[connection_id] = connection
+            self._event_schedule = None
+            self.compiled_network = None
+            self.generated_network = None
+            self._logic_depth = None
 
         return error_type
 
@@ -208,6 +302,8 @@ class Network:
             if first_device.inputs[first_port_id] is not None:
                 # Input is already in a connection
                 # REMOVE THE CONNECTION!
+                self._remove_fanout(first_device.inputs[first_port_id],
+                                    first_device_id, first_port_id)
                 first_device.inputs[first_port_id] = None
                 del first_device.inputs[first_port_id]
                 error_type = self.NO_ERROR
@@ -233,6 +329,8 @@ class Network:
                 if second_device.inputs[second_port_id] is not None:
                     # Input is already in a connection
                     # REMOVE THE CONNECTION!
+                    self._remove_fanout(second_device.inputs[second_port_id],
+                                        second_device_id, second_port_id)
                     second_device.inputs[second_port_id] = None
                     error_type = self.NO_ERROR
                 else:
@@ -242,8 +340,55 @@ class Network:
                 # print("Port absent")
                 error_type = self.PORT_ABSENT
 
+        if error_type == self.NO_ERROR:
+            self._event_schedule = None
+            self.compiled_network = None
+            self.generated_network = None
+            self._logic_depth = None
+
         return error_type
 
+    def _add_fanout(self, output_device_id, output_port_id, input_device_id,
+                    input_port_id):
+        """Add a connected input to the fanout index of its output."""
+        readers = self.fanout_index.setdefault(
+            (output_device_id, output_port_id), {})
+        readers[(input_device_id, input_port_id)] = None
+
+    def _remove_fanout(self, connected_output, input_device_id,
+                       input_port_id):
+        """Remove a connected input from the fanout index of its output."""
+        readers = self.fanout_index.get(connected_output)
+        if readers is not None:
+            readers.pop((input_device_id, input_port_id), None)
+            if not readers:
+                del self.fanout_index[connected_output]
+
+    def get_fanout(self, device_id, output_id):
+        """Return the inputs connected to the given output.
+
+        The inputs are a list of the form [(device ID, port ID), ...], in the
+        order they were connected. The list is empty if the IDs are invalid or
+        the output is unconnected.
+        """
+        return list(self.fanout_index.get((device_id, output_id), ()))
+
+    def get_fanout_devices(self, device_id):
+        """Return the IDs of devices with an input connected to the device.
+
+        Each device is listed once, even if several of its inputs are
+        connected to outputs of the given device.
+        """
+        device = self.devices.get_device(device_id)
+        if device is None:
+            return []
+        reader_ids = {}
+        for output_id in device.outputs:
+            for reader_id, input_id in self.fanout_index.get(
+                    (device_id, output_id), ()):
+                reader_ids[reader_id] = None
+        return list(reader_ids)
+
     def check_network(self):
         """Return True if all inputs in the network are connected."""
         for device_id in self.devices.find_devices():
@@ -438,66 +583,1588 @@ class Network:
                     device.outputs[None] = self.devices.RISING
             device.clock_counter += 1
 
+    def skip_idle_cycles(self, cycles):
+        """Advance the clocks over at most cycles cycles with no clock edge.
+
+        Only call this straight after execute_network has returned True, with
+        no switch, device or connection changed since. The settled signals
+        then cannot change until the next clock edge, so executing those
+        cycles is replaced by advancing the clock counters. Return the number
+        of cycles skipped.
+        """
+        clocks = [self.devices.get_device(device_id) for device_id in
+                  self.devices.find_devices(self.devices.CLOCK)]
+        idle_cycles = cycles
+        for device in clocks:
+            # update_clocks makes an edge once the counter reaches the half
+            # period
+            idle_cycles = min(idle_cycles, device.clock_half_period -
+                              device.clock_counter)
+        idle_cycles = max(idle_cycles, 0)
+        for device in clocks:
+            device.clock_counter += idle_cycles
+        return idle_cycles
+
+    def set_simulation_mode(self, mode):
+        """Select the engine used by execute_network.
+
+        Return True if successful. VECTORISED mode needs NumPy to be
+        installed.
+        """
+        if mode not in self.simulation_modes:
+            return False
+        if mode == self.VECTORISED and \
+                importlib.util.find_spec("numpy") is None:
+            return False
+        self.simulation_mode = mode
+        self._event_schedule = None
+        self.compiled_network = None
+        self.generated_network = None
+        return True
+
+    def set_iteration_limit(self, iteration_limit=None):
+        """Set the number of sweeps allowed for the signals to settle.
+
+        If iteration_limit is None, the limit is derived from the logic depth
+        of the network. Return True if successful.
+        """
+        if iteration_limit is not None and (
+                not isinstance(iteration_limit, int) or iteration_limit < 1):
+            return False
+        self.iteration_limit = iteration_limit
+        self.compiled_network = None
+        self.generated_network = None
+        return True
+
+    def get_logic_depth(self):
+        """Return the length of the longest chain of gates and D-types.
+
+        Every device on a feedback loop, or downstream of one, is added to
+        the depth, so it is an upper bound for networks with loops.
+        """
+        devices_list = self.devices.devices_list
+        if self._logic_depth is not None and \
+                self._logic_depth[1] == len(devices_list):
+            return self._logic_depth[0]
+
+        sources = [self.devices.SWITCH, self.devices.CLOCK]
+        # {device_id: number of its drivers not yet given a depth}
+        driver_counts = {device.device_id: 0 for device in devices_list
+                         if device.device_kind not in sources}
+        for device_id in driver_counts:
+            for reader_id in self.get_fanout_devices(device_id):
+                if reader_id in driver_counts:
+                    driver_counts[reader_id] += 1
+
+        depths = {}  # {device_id: length of the longest chain ending there}
+        ready = [device_id for device_id, driver_count in
+                 driver_counts.items() if driver_count == 0]
+        for device_id in ready:
+            depths[device_id] = 1
+        while ready:
+            device_id = ready.pop()
+            for reader_id in self.get_fanout_devices(device_id):
+                if reader_id in driver_counts:
+                    depths[reader_id] = max(depths.get(reader_id, 0),
+                                            depths[device_id] + 1)
+                    driver_counts[reader_id] -= 1
+                    if driver_counts[reader_id] == 0:
+                        ready.append(reader_id)
+
+        looped_count = sum(1 for driver_count in driver_counts.values()
+                           if driver_count > 0)
+        logic_depth = max([0] + [depths[device_id] for device_id in depths
+                                 if driver_counts[device_id] == 0])
+        logic_depth += looped_count
+        self._logic_depth = (logic_depth, len(devices_list))
+        return logic_depth
+
+    def get_iteration_limit(self):
+        """Return the number of sweeps allowed for the signals to settle.
+
+        Unless set by set_iteration_limit, this is two sweeps for each level
+        of logic, as every change passes through RISING or FALLING, with a
+        minimum of 20.
+        """
+        if self.iteration_limit is not None:
+            return self.iteration_limit
+        return max(20, 2 * self.get_logic_depth() + 2)
+
+    def compile_network(self):
+        """Return the CompiledNetwork of the network, building it if needed.
+
+        A VectorisedNetwork is built in VECTORISED mode, with the limit of
+        get_iteration_limit() on the passes of its feedback loops. The
+        compiled network is rebuilt if devices have been added since it was
+        last built.
+        """
+        if self.simulation_mode == self.VECTORISED:
+            network_class = VectorisedNetwork
+        else:
+            network_class = CompiledNetwork
+        if type(self.compiled_network) is not network_class or \
+                self.compiled_network.device_count != \
+                len(self.devices.devices_list):
+            self.compiled_network = network_class(
+                self, self.get_iteration_limit())
+        return self.compiled_network
+
+    def generate_network(self):
+        """Return the GeneratedNetwork of the network, building it if needed.
+
+        The generated code is rebuilt if devices have been added since it was
+        last built.
+        """
+        if self.generated_network is None or \
+                self.generated_network.device_count != \
+                len(self.devices.devices_list):
+            self.generated_network = GeneratedNetwork(
+                self, self.get_iteration_limit())
+        return self.generated_network
+
+    def _sweep_executors(self):
+        """Return the devices in sweep order with their execute functions.
+
+        The result is a list of the form [(device IDs, execute function,
+        extra arguments), ...], with one entry for each device kind.
+        """
+        devices = self.devices
+        # Execute D-type devices before clocks to catch the rising edge of
+        # the clock
+        kind_executors = [
+            (devices.SWITCH, self.execute_switch, ()),
+            (devices.D_TYPE, self.execute_d_type, ()),
+            (devices.CLOCK, self.execute_clock, ()),
+            (devices.AND, self.execute_gate, (devices.HIGH, devices.HIGH)),
+            (devices.OR, self.execute_gate, (devices.LOW, devices.LOW)),
+            (devices.NAND, self.execute_gate, (devices.HIGH, devices.LOW)),
+            (devices.NOR, self.execute_gate, (devices.LOW, devices.HIGH)),
+            (devices.XOR, self.execute_gate, (None, None)),
+            (devices.NOT, self.execute_gate, (None, None))]
+        if self.profile is not None:
+            kind_executors = [
+                (device_kind, self.profile.wrap(function), arguments)
+                for device_kind, function, arguments in kind_executors]
+        return [(devices.find_devices(device_kind), function, arguments)
+                for device_kind, function, arguments in kind_executors]
+
+    def _sweep(self, sweep_executors):
+        """Execute every device once in sweep order.
+
+        Return True if successful.
+        """
+        for device_ids, function, arguments in sweep_executors:
+            for device_id in device_ids:
+                if not function(device_id, *arguments):
+                    return False
+        return True
+
+    def _hash_state(self, d_types):
+        """Return a hash of every output signal and D-type memory."""
+        state = [d_type.dtype_memory for d_type in d_types]
+        for device in self.devices.devices_list:
+            state.extend(device.outputs.values())
+        return hash(tuple(state))
+
+    def _find_oscillating_devices(self, iteration_limit):
+        """Return the IDs of the devices whose outputs keep changing.
+
+        The network is swept from its current state until the state repeats,
+        and then for one more period of the oscillation, recording every
+        device whose outputs change. If the state does not repeat within
+        iteration_limit sweeps, the devices that change in one more sweep
+        are returned. The outputs and D-type memories are then put back as
+        they were, and the sweeps are not counted in the profile.
+        """
+        devices_list = self.devices.devices_list
+        saved_states = [(device.outputs.copy(), device.dtype_memory)
+                        for device in devices_list]
+        profile = self.profile
+        self.profile = None
+        try:
+            return self._trace_oscillation(self._sweep_executors(),
+                                           iteration_limit)
+        finally:
+            self.profile = profile
+            # The outputs dictionaries are shared with the compiled networks
+            for device, (outputs, dtype_memory) in zip(devices_list,
+                                                       saved_states):
+                device.outputs.update(outputs)
+                device.dtype_memory = dtype_memory
+
+    def _trace_oscillation(self, sweep_executors, iteration_limit):
+        """Sweep the network as described in _find_oscillating_devices."""
+        devices_list = self.devices.devices_list
+        d_types = [self.devices.get_device(device_id) for device_id in
+                   self.devices.find_devices(self.devices.D_TYPE)]
+        state_iterations = {self._hash_state(d_types): 0}
+        period = 1
+        for iteration in range(1, iteration_limit + 1):
+            if not self._sweep(sweep_executors):
+                return []
+            state = self._hash_state(d_types)
+            if state in state_iterations:
+                period = iteration - state_iterations[state]
+                break
+            state_iterations[state] = iteration
+
+        outputs = [tuple(device.outputs.values()) for device in devices_list]
+        changed = set()
+        for _ in range(period):
+            if not self._sweep(sweep_executors):
+                return []
+            for number, device in enumerate(devices_list):
+                device_outputs = tuple(device.outputs.values())
+                if device_outputs != outputs[number]:
+                    outputs[number] = device_outputs
+                    changed.add(device.device_id)
+        self.steady_state = False
+        return [device.device_id for device in devices_list
+                if device.device_id in changed]
+
+    def _build_event_schedule(self):
+        """Build the evaluation order and fanout lists for EVENT_DRIVEN mode.
+
+        Devices are ranked in the order execute_network sweeps them, so that
+        processing events in rank order reproduces the sweep exactly.
+        """
+        executors = []  # [(device, execute function, extra arguments)]
+        rank = {}  # {device_id: position in the sweep order}
+        for device_ids, function, arguments in self._sweep_executors():
+            for device_id in device_ids:
+                rank[device_id] = len(executors)
+                device = self.devices.get_device(device_id)
+                executors.append((device, function, arguments))
+
+        # fanout[r] lists the ranks of the devices reading any output of r
+        fanout = [[rank[reader_id] for reader_id in
+                   self.get_fanout_devices(device.device_id)
+                   if reader_id in rank]
+                  for device, function, arguments in executors]
+
+        # Switches, D-types and clocks can change without any input changing
+        # (set_switch, cold_startup, update_clocks), so they are evaluated on
+        # every cycle
+        sources = [rank[device_id] for device_id in
+                   self.devices.find_devices(self.devices.SWITCH) +
+                   self.devices.find_devices(self.devices.D_TYPE) +
+                   self.devices.find_devices(self.devices.CLOCK)]
+
+        snapshots = [tuple(device.outputs.values())
+                     for device, function, arguments in executors]
+
+        self._event_schedule = (executors, fanout, sources, snapshots,
+                                len(self.devices.devices_list))
+        self._event_full_sweep = True
+
+    def _execute_network_event(self):
+        """Execute one simulation cycle, only evaluating active devices.
+
+        Produces the same signals as the sweep in execute_network, but each
+        iteration only evaluates devices with a changed input, so the cost of
+        a cycle scales with the circuit activity rather than its size.
+        """
+        if self._event_schedule is None or self._event_schedule[4] != \
+                len(self.devices.devices_list):
+            self._build_event_schedule()
+        executors, fanout, sources, snapshots, _ = self._event_schedule
+
+        self.update_clocks()
+
+        if self._event_full_sweep:
+            pending = list(range(len(executors)))
+        else:
+            pending = list(sources)
+        heapq.heapify(pending)
+        scheduled = set(pending)
+
+        # A network state that repeats without settling repeats for ever, so
+        # the network oscillates
+        iteration_limit = self.get_iteration_limit()
+        state_hashes = set()
+        d_types = [executors[rank][0] for rank in sources
+                   if executors[rank][0].device_kind == self.devices.D_TYPE]
+
+        # Until this cycle settles, restart from a full sweep
+        self._event_full_sweep = True
+
+        iterations = 0
+        while pending and iterations < iteration_limit:
+            iterations += 1
+            self.steady_state = True
+            next_pending = set()
+
+            while pending:
+                current_rank = heapq.heappop(pending)
+                device, function, arguments = executors[current_rank]
+                if not function(device.device_id, *arguments):
+                    return False
+
+                outputs = tuple(device.outputs.values())
+                if outputs != snapshots[current_rank]:
+                    snapshots[current_rank] = outputs
+                    # a changing output may not have reached its target yet
+                    next_pending.add(current_rank)
+                    for reader_rank in fanout[current_rank]:
+                        # readers later in the sweep see the change in this
+                        # iteration, earlier readers in the next one
+                        if reader_rank > current_rank:
+                            if reader_rank not in scheduled:
+                                scheduled.add(reader_rank)
+                                heapq.heappush(pending, reader_rank)
+                        else:
+                            next_pending.add(reader_rank)
+
+            if self.steady_state:
+                break
+            state = hash((tuple(snapshots), tuple(
+                [d_type.dtype_memory for d_type in d_types])))
+            if state in state_hashes:
+                break
+            state_hashes.add(state)
+            pending = list(next_pending)
+            heapq.heapify(pending)
+            scheduled = set(pending)
+
+        self.settle_iterations = iterations
+        if self.steady_state:
+            self._event_full_sweep = False
+        else:
+            self.oscillating_devices = self._find_oscillating_devices(
+                iteration_limit)
+        return self.steady_state
+
+    def start_profiling(self):
+        """Start a new profile of execute_network and return it.
+
+        Until stop_profiling is called, execute_network counts and times
+        every device evaluation and records each cycle in the profile. When
+        not profiling, execute_network is not slowed down at all.
+        """
+        self.profile = NetworkProfile(self.names, self.devices)
+        self._event_schedule = None  # rebuilt with profiled functions
+        return self.profile
+
+    def stop_profiling(self):
+        """Stop profiling and return the profile, or None if not profiling."""
+        profile = self.profile
+        self.profile = None
+        self._event_schedule = None
+        return profile
+
     def execute_network(self):
         """Execute all the devices in the network for one simulation cycle.
 
-        Return True if successful and the network does not oscillate.
+        Return True if successful and the network does not oscillate. The
+        network oscillates if the signals have not settled after
+        get_iteration_limit() sweeps, or as soon as the network returns to
+        an earlier state without settling. The oscillating devices are then
+        stored in oscillating_devices, except in LEVELIZED and VECTORISED
+        modes.
         """
-        clock_devices = self.devices.find_devices(self.devices.CLOCK)
-        switch_devices = self.devices.find_devices(self.devices.SWITCH)
-        d_type_devices = self.devices.find_devices(self.devices.D_TYPE)
-        and_devices = self.devices.find_devices(self.devices.AND)
-        or_devices = self.devices.find_devices(self.devices.OR)
-        nand_devices = self.devices.find_devices(self.devices.NAND)
-        nor_devices = self.devices.find_devices(self.devices.NOR)
-        xor_devices = self.devices.find_devices(self.devices.XOR)
-        not_devices = self.devices.find_devices(self.devices.NOT)
+        if self.profile is None:
+            return self._execute_network()
+        start = time.perf_counter()
+        steady_state = self._execute_network()
+        self.profile.record_cycle(self.settle_iterations,
+                                  time.perf_counter() - start)
+        return steady_state
+
+    def _execute_network(self):
+        """Execute one simulation cycle in the selected simulation mode."""
+        self.oscillating_devices = []
+        self.settle_iterations = None
+        if self.simulation_mode == self.EVENT_DRIVEN:
+            return self._execute_network_event()
+        if self.simulation_mode in [self.LEVELIZED, self.VECTORISED]:
+            return self.compile_network().execute()
+        if self.simulation_mode == self.GENERATED:
+            steady_state = self.generate_network().execute()
+            if steady_state is not None:
+                if not steady_state:
+                    self.oscillating_devices = self._find_oscillating_devices(
+                        self.generated_network.iteration_limit)
+                return steady_state
+
+        sweep_executors = self._sweep_executors()
 
         # This sets clock signals to RISING or FALLING, where necessary
         self.update_clocks()
 
         # Number of iterations to wait for the signals to settle before
-        # declaring the network unstable
-        iteration_limit = 20
+        # declaring the network unstable. A network state that repeats
+        # without settling repeats for ever, so the network oscillates.
+        iteration_limit = self.get_iteration_limit()
+        state_hashes = set()
+        d_types = None
 
         iterations = 0
         while iterations < iteration_limit:
             iterations += 1
             self.steady_state = True
-
-            for device_id in switch_devices:  # execute switch devices
-                if not self.execute_switch(device_id):
-                    return False
-            # Execute D-type devices before clocks to catch the rising edge of
-            # the clock
-            for device_id in d_type_devices:  # execute DTYPE devices
-                if not self.execute_d_type(device_id):
-                    return False
-            for device_id in clock_devices:  # complete clock executions
-                if not self.execute_clock(device_id):
-                    return False
-            for device_id in and_devices:  # execute AND gate devices
-                if not self.execute_gate(device_id, self.devices.HIGH,
-                                         self.devices.HIGH):
-                    return False
-            for device_id in or_devices:  # execute OR gate devices
-                if not self.execute_gate(device_id, self.devices.LOW,
-                                         self.devices.LOW):
-                    return False
-            for device_id in nand_devices:  # execute NAND gate devices
-                if not self.execute_gate(device_id, self.devices.HIGH,
-                                         self.devices.LOW):
-                    return False
-            for device_id in nor_devices:  # execute NOR gate devices
-                if not self.execute_gate(device_id, self.devices.LOW,
-                                         self.devices.HIGH):
-                    return False
-            for device_id in xor_devices:  # execute XOR devices
-                if not self.execute_gate(device_id, None, None):
-                    return False
-            for device_id in not_devices:  # execute NOT devices
-                if not self.execute_gate(device_id, None, None):
-                    return False
+            if not self._sweep(sweep_executors):
+                return False
             if self.steady_state:
                 break
+            if d_types is None:
+                d_types = [self.devices.get_device(device_id) for device_id
+                           in sweep_executors[1][0]]
+            state = self._hash_state(d_types)
+            if state in state_hashes:
+                break
+            state_hashes.add(state)
+
+        self.settle_iterations = iterations
+        if not self.steady_state:
+            self.oscillating_devices = self._find_oscillating_devices(
+                iteration_limit)
         return self.steady_state
+
+
+class NetworkProfile:
+    """Count device evaluations, output changes and time while simulating.
+
+    A profile is filled in by Network.execute_network between calls to
+    Network.start_profiling and Network.stop_profiling. In SWEEP and
+    EVENT_DRIVEN modes every device evaluation is counted and timed, and so
+    are the iterations taken for the signals to settle in each cycle. The
+    other modes do not execute the devices one at a time, so only their
+    cycles and cycle times are recorded. Cycles skipped by
+    Network.skip_idle_cycles are not executed, so they are not counted.
+
+    Parameters
+    ----------
+    names: instance of the names.Names() class.
+    devices: instance of the devices.Devices() class.
+
+    Public methods
+    --------------
+    wrap(self, function): Returns the device execute function, counting and
+                          timing each call.
+
+    record_cycle(self, iterations, seconds): Records one simulation cycle.
+
+    get_kind_stats(self): Returns the evaluations, output changes and time of
+                          each device kind.
+
+    get_report(self, device_count=10): Returns the profile as text.
+    """
+
+    def __init__(self, names, devices):
+        """Initialise the empty cycle and device statistics."""
+        self.names = names
+        self.devices = devices
+
+        self.cycles = 0
+        self.seconds = 0.0  # total time of the recorded cycles
+        self.iterations = 0  # total settle iterations
+        # {settle iterations: number of cycles taking that many}
+        self.iteration_counts = {}
+
+        # {device_id: [evaluations, output changes, seconds]}
+        self.device_stats = {}
+
+    def wrap(self, function):
+        """Return the device execute function, counting and timing each call.
+
+        function is called as function(device_id, *arguments), like
+        Network.execute_gate.
+        """
+        get_device = self.devices.get_device
+        device_stats = self.device_stats
+        perf_counter = time.perf_counter
+
+        def profiled_function(device_id, *arguments):
+            outputs = get_device(device_id).outputs
+            previous_outputs = tuple(outputs.values())
+            start = perf_counter()
+            result = function(device_id, *arguments)
+            seconds = perf_counter() - start
+            stats = device_stats.get(device_id)
+            if stats is None:
+                stats = device_stats[device_id] = [0, 0, 0.0]
+            stats[0] += 1
+            if tuple(outputs.values()) != previous_outputs:
+                stats[1] += 1
+            stats[2] += seconds
+            return result
+        return profiled_function
+
+    def record_cycle(self, iterations, seconds):
+        """Record one simulation cycle.
+
+        iterations is the number of sweeps taken for the signals to settle,
+        or None if the simulation mode does not count them.
+        """
+        self.cycles += 1
+        self.seconds += seconds
+        if iterations is not None:
+            self.iterations += iterations
+            self.iteration_counts[iterations] = \
+                self.iteration_counts.get(iterations, 0) + 1
+
+    def get_kind_stats(self):
+        """Return the evaluations, output changes and time of each kind.
+
+        The result is a dictionary of the form {device_kind: [devices,
+        evaluations, output changes, seconds]}, for the kinds of the devices
+        evaluated.
+        """
+        kind_stats = {}
+        for device_id, [evaluations, changes, seconds] in \
+                self.device_stats.items():
+            device_kind = self.devices.get_device(device_id).device_kind
+            stats = kind_stats.setdefault(device_kind, [0, 0, 0, 0.0])
+            stats[0] += 1
+            stats[1] += evaluations
+            stats[2] += changes
+            stats[3] += seconds
+        return kind_stats
+
+    def get_report(self, device_count=10):
+        """Return the profile as text.
+
+        The report lists the settle iterations, the statistics of each
+        device kind, slowest first, and the device_count slowest devices.
+        """
+        get_name = self.names.get_name_string
+        lines = ["Cycles executed: %d in %.6f s" % (self.cycles, self.seconds)]
+        counted_cycles = sum(self.iteration_counts.values())
+        if counted_cycles:
+            lines.append("Settle iterations: %d, %.2f per cycle" % (
+                self.iterations, self.iterations / counted_cycles))
+            for iterations in sorted(self.iteration_counts):
+                lines.append("  %4d iterations: %d cycles" % (
+                    iterations, self.iteration_counts[iterations]))
+        if not self.device_stats:
+            return "\n".join(lines)
+
+        lines.append("%-10s %8s %12s %10s %12s" % (
+            "kind", "devices", "evaluations", "changes", "seconds"))
+        kind_stats = self.get_kind_stats()
+        for device_kind in sorted(kind_stats, key=lambda device_kind:
+                                  -kind_stats[device_kind][3]):
+            lines.append("%-10s %8d %12d %10d %12.6f" % (
+                (get_name(device_kind),) + tuple(kind_stats[device_kind])))
+
+        lines.append("%-10s %8s %12s %10s %12s" % (
+            "device", "kind", "evaluations", "changes", "seconds"))
+        slowest = sorted(self.device_stats, key=lambda device_id:
+                         -self.device_stats[device_id][2])[:device_count]
+        for device_id in slowest:
+            device_kind = self.devices.get_device(device_id).device_kind
+            lines.append("%-10s %8s %12d %10d %12.6f" % (
+                (get_name(device_id), get_name(device_kind)) +
+                tuple(self.device_stats[device_id])))
+        return "\n".join(lines)
+
+
+class CompiledNetwork:
+    """Levelize the network and execute it in topologically ordered passes.
+
+    The logic gates between the switches, clocks and D-types are sorted into
+    levels, so that settling them takes a single ordered pass instead of
+    iterating until no signal changes. Only gates in true feedback loops
+    (strongly connected components, such as a bistable) are iterated. Signals
+    are held as HIGH or LOW in a flat list, and written back to the device
+    outputs at the end of each cycle.
+
+    D-types latch on a LOW to HIGH change of their CLK signal, sampling the
+    DATA signal as it was at the start of the cycle, and then apply SET and
+    CLEAR. They are updated before the gates settle and again after, until
+    no D-type output changes.
+
+    The signals match execute_network for circuits whose feedback loops have
+    only one stable state. They can differ where a gated clock and its DATA
+    signal change in the same cycle, as the sweep samples whichever
+    intermediate value it reaches first. They can also differ where several
+    signals of a feedback loop with more than one stable state, such as a
+    bistable, change at once, most often after cold_startup. The sweep
+    passes signals through RISING and FALLING and updates every device in
+    each sweep, so it can settle such a loop in a different stable state,
+    or find an oscillation where this class finds none, or the other way
+    round.
+
+    Parameters
+    ----------
+    network: instance of the network.Network() class.
+    iteration_limit: number of passes allowed for a feedback loop to settle.
+
+    Public methods
+    --------------
+    get_signal_index(self, device_id, output_id): Returns the index of the
+                                          given output in the signal list.
+
+    execute(self): Executes all the devices in the network for one
+                   simulation cycle.
+
+    bit_parallel(self, lanes=64): Returns a BitParallelNetwork simulating
+                                  lanes independent switch patterns.
+    """
+
+    def __init__(self, network, iteration_limit=20):
+        """Flatten the network into signal lists and levelize the gates."""
+        self.network = network
+        self.devices = network.devices
+        self.iteration_limit = iteration_limit
+        self.device_count = len(self.devices.devices_list)
+        devices = self.devices
+
+        # Every device output is a signal
+        # {(device_id, output_id): signal index}
+        self.signal_indexes = {}
+        # [(outputs dictionary of the device, output_id)]
+        self.signal_outputs = []
+        for device in devices.devices_list:
+            for output_id in device.outputs:
+                self.signal_indexes[(device.device_id, output_id)] = \
+                    len(self.signal_outputs)
+                self.signal_outputs.append((device.outputs, output_id))
+        self.values = [self._signal_level(outputs[output_id])
+                       for outputs, output_id in self.signal_outputs]
+
+        # A network with unconnected inputs cannot be executed
+        self.complete = network.check_network()
+        self.levels = []
+        self.segments = []
+        self.switches = []
+        self.clocks = []
+        self.d_types = []
+        if not self.complete:
+            return
+
+        for device_id in devices.find_devices(devices.SWITCH):
+            self.switches.append((devices.get_device(device_id),
+                                  self.signal_indexes[(device_id, None)]))
+        for device_id in devices.find_devices(devices.CLOCK):
+            self.clocks.append((devices.get_device(device_id),
+                                self.signal_indexes[(device_id, None)]))
+        # [(device, CLK, DATA, SET, CLEAR, Q, QBAR)] as signal indexes
+        for device_id in devices.find_devices(devices.D_TYPE):
+            device = devices.get_device(device_id)
+            self.d_types.append((
+                device,
+                self.signal_indexes[device.inputs[devices.CLK_ID]],
+                self.signal_indexes[device.inputs[devices.DATA_ID]],
+                self.signal_indexes[device.inputs[devices.SET_ID]],
+                self.signal_indexes[device.inputs[devices.CLEAR_ID]],
+                self.signal_indexes[(device_id, devices.Q_ID)],
+                self.signal_indexes[(device_id, devices.QBAR_ID)]))
+
+        self._levelize()
+
+    def _signal_level(self, signal):
+        """Return the HIGH or LOW level that the signal is settling to."""
+        if signal in [self.devices.HIGH, self.devices.RISING]:
+            return self.devices.HIGH
+        return self.devices.LOW
+
+    def get_signal_index(self, device_id, output_id):
+        """Return the index of the given output in the signal list.
+
+        Return None if the output does not exist.
+        """
+        return self.signal_indexes.get((device_id, output_id))
+
+    def _levelize(self):
+        """Sort the gates into levels and find the feedback loops.
+
+        Each gate is stored as (x, y, input signal indexes, output signal
+        index), following the rule of execute_gate: if all its inputs are x,
+        then its output is y, else its output is the inverse of y. A NOT gate
+        is a one-input NOR, and x is None for XOR gates.
+        """
+        devices = self.devices
+        gate_rules = [(devices.AND, devices.HIGH, devices.HIGH),
+                      (devices.OR, devices.LOW, devices.LOW),
+                      (devices.NAND, devices.HIGH, devices.LOW),
+                      (devices.NOR, devices.LOW, devices.HIGH),
+                      (devices.XOR, None, None),
+                      (devices.NOT, devices.LOW, devices.HIGH)]
+        gates = []
+        for device_kind, x, y in gate_rules:
+            for device_id in devices.find_devices(device_kind):
+                device = devices.get_device(device_id)
+                inputs = tuple(self.signal_indexes[connected_output]
+                               for connected_output in device.inputs.values())
+                gates.append((x, y, inputs,
+                              self.signal_indexes[(device_id, None)]))
+
+        # drivers[g] lists the gates driving an input of gate g
+        gate_driving = {gate[3]: position for position, gate in
+                        enumerate(gates)}
+        drivers = [[gate_driving[signal] for signal in gate[2]
+                    if signal in gate_driving] for gate in gates]
+
+        components = self._strongly_connected(drivers)
+
+        # Components come out with all their drivers before them, so each
+        # level is one more than the highest level driving it
+        component_of = [None] * len(gates)
+        component_levels = []
+        for number, component in enumerate(components):
+            for position in component:
+                component_of[position] = number
+            level = 0
+            for position in component:
+                for driver in drivers[position]:
+                    if component_of[driver] != number:
+                        level = max(level,
+                                    component_levels[component_of[driver]] + 1)
+            component_levels.append(level)
+
+        level_count = max(component_levels, default=-1) + 1
+        self.levels = [[] for _ in range(level_count)]
+        for number, component in enumerate(components):
+            feedback = len(component) > 1 or \
+                component[0] in drivers[component[0]]
+            component_gates = [gates[position]
+                               for position in sorted(component)]
+            self.levels[component_levels[number]].append(
+                (feedback, component_gates))
+
+        # Runs of gates outside feedback loops are merged into one segment
+        self.segments = []
+        for level in self.levels:
+            for feedback, component_gates in level:
+                if feedback or not self.segments or self.segments[-1][0]:
+                    self.segments.append((feedback, list(component_gates)))
+                else:
+                    self.segments[-1][1].extend(component_gates)
+
+    def _strongly_connected(self, drivers):
+        """Return the strongly connected components of the gate graph.
+
+        Uses an iterative version of Tarjan's algorithm, so deep circuits do
+        not hit the recursion limit. Each component is returned after all the
+        components driving it.
+        """
+        index_count = 0
+        indexes = [None] * len(drivers)
+        low_links = [0] * len(drivers)
+        on_stack = [False] * len(drivers)
+        stack = []
+        components = []
+
+        for root in range(len(drivers)):
+            if indexes[root] is not None:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, next_driver = work.pop()
+                if next_driver == 0:
+                    indexes[node] = low_links[node] = index_count
+                    index_count += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                descended = False
+                for position in range(next_driver, len(drivers[node])):
+                    driver = drivers[node][position]
+                    if indexes[driver] is None:
+                        work.append((node, position + 1))
+                        work.append((driver, 0))
+                        descended = True
+                        break
+                    elif on_stack[driver]:
+                        low_links[node] = min(low_links[node],
+                                              indexes[driver])
+                if descended:
+                    continue
+                if low_links[node] == indexes[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+                if work:
+                    parent = work[-1][0]
+                    low_links[parent] = min(low_links[parent],
+                                            low_links[node])
+        return components
+
+    def _evaluate(self, gates, changed):
+        """Evaluate the gates once in order.
+
+        Append the indexes of changed signals to changed and return True if
+        any signal changed.
+        """
+        values = self.values
+        any_change = False
+        for x, y, inputs, output in gates:
+            if x is None:  # XOR
+                new_value = values[inputs[0]] ^ values[inputs[1]]
+            else:
+                new_value = y
+                for signal in inputs:
+                    if values[signal] != x:
+                        new_value = 1 - y
+                        break
+            if values[output] != new_value:
+                values[output] = new_value
+                changed.append(output)
+                any_change = True
+        return any_change
+
+    def _settle(self, changed):
+        """Settle the logic gates in one ordered pass.
+
+        Feedback loops are iterated until they settle. Return False if a
+        loop is still changing after iteration_limit passes.
+        """
+        for feedback, gates in self.segments:
+            if not feedback:
+                self._evaluate(gates, changed)
+                continue
+            for _ in range(self.iteration_limit):
+                if not self._evaluate(gates, changed):
+                    break
+            else:
+                return False
+        return True
+
+    def _write_back(self, changed):
+        """Copy the changed signals back to the device outputs."""
+        values = self.values
+        signal_outputs = self.signal_outputs
+        for signal in changed:
+            outputs, output_id = signal_outputs[signal]
+            outputs[output_id] = values[signal]
+
+    def _update_d_types(self, changed, data_start, clock_seen):
+        """Latch, set and clear the D-types and update their outputs.
+
+        A D-type latches its DATA signal at the start of the cycle on a LOW
+        to HIGH change of its CLK signal. Append the indexes of changed
+        signals to changed, and return True if any D-type output changed.
+        """
+        devices = self.devices
+        values = self.values
+        d_type_changed = False
+        for number, (device, clock, data, set_signal, clear_signal,
+                     q_signal, qbar_signal) in enumerate(self.d_types):
+            memory = device.dtype_memory
+            if values[clock] == devices.HIGH and \
+                    clock_seen[number] == devices.LOW:
+                memory = data_start[number]
+            clock_seen[number] = values[clock]
+            if values[set_signal] == devices.HIGH:
+                memory = devices.HIGH
+            if values[clear_signal] == devices.HIGH:
+                memory = devices.LOW
+            device.dtype_memory = memory
+            if values[q_signal] != memory or values[qbar_signal] == memory:
+                values[q_signal] = memory
+                values[qbar_signal] = 1 - memory
+                changed.append(q_signal)
+                changed.append(qbar_signal)
+                d_type_changed = True
+        return d_type_changed
+
+    def execute(self):
+        """Execute all the devices in the network for one simulation cycle.
+
+        Return True if successful and the network does not oscillate.
+        """
+        if not self.complete:
+            return False
+        values = self.values
+        changed = []
+
+        # Clock outputs may have been changed by cold_startup
+        for device, signal in self.clocks:
+            values[signal] = self._signal_level(device.outputs[None])
+
+        d_types = self.d_types
+        data_start = [values[d_type[2]] for d_type in d_types]
+        clock_seen = [values[d_type[1]] for d_type in d_types]
+
+        self.network.update_clocks()
+        for device, signal in self.clocks:
+            level = self._signal_level(device.outputs[None])
+            device.outputs[None] = level
+            values[signal] = level
+        for device, signal in self.switches:
+            if values[signal] != device.switch_state:
+                values[signal] = device.switch_state
+                changed.append(signal)
+
+        # As in the sweep, the D-types are updated before the gates, so the
+        # gates settle with the D-type outputs of this cycle. Latching
+        # D-types can clock other D-types, so settle the gates again until no
+        # D-type output changes, and only then report a feedback loop that
+        # did not settle.
+        self._update_d_types(changed, data_start, clock_seen)
+        for _ in range(self.iteration_limit):
+            settled = self._settle(changed)
+            if not self._update_d_types(changed, data_start, clock_seen):
+                break
+        else:
+            settled = False
+
+        self._write_back(changed)
+        return settled
+
+    def bit_parallel(self, lanes=64):
+        """Return a BitParallelNetwork simulating lanes switch patterns.
+
+        Every lane starts from the current state of the network.
+        """
+        return BitParallelNetwork(self, lanes)
+
+
+class BitParallelNetwork:
+    """Execute many independent switch patterns at once, one per bit.
+
+    Each signal is a Python integer word holding its level in every lane, so
+    a gate is evaluated for all the lanes with one bitwise AND, OR or XOR.
+    Any number of lanes can be used. Lanes share the clocks, but have their
+    own switch states and D-type memories, and follow the same rules as
+    CompiledNetwork.execute in each lane.
+
+    The network is copied from the compiled network when this class is
+    initialised, and the devices are not changed by executing it.
+
+    Parameters
+    ----------
+    compiled_network: instance of the network.CompiledNetwork() class.
+    lanes: number of switch patterns simulated at once.
+
+    Public methods
+    --------------
+    set_switch(self, device_id, signal_list): Sets the switch state in each
+                                              lane to the listed signals.
+
+    get_signal_word(self, device_id, output_id): Returns the signal levels
+                                        of all lanes packed into an integer.
+
+    get_signals(self, device_id, output_id): Returns a list of the signal
+                                             levels in each lane.
+
+    execute(self): Executes all the lanes for one simulation cycle.
+    """
+
+    def __init__(self, compiled_network, lanes=64):
+        """Copy the compiled network and replicate its state in every lane."""
+        if not isinstance(lanes, int):
+            raise TypeError("Expected lanes to be an integer.")
+        if lanes < 1:
+            raise ValueError("Expected lanes to be positive and non-zero.")
+
+        self.compiled_network = compiled_network
+        self.devices = compiled_network.devices
+        self.lanes = lanes
+        self.mask = (1 << lanes) - 1
+        mask = self.mask
+        devices = self.devices
+
+        self.words = [mask if value == devices.HIGH else 0
+                      for value in compiled_network.values]
+
+        # Gates become (operation, input signals, output signal), where the
+        # operation is the AND, OR, NAND, NOR or XOR device kind
+        operations = {(devices.HIGH, devices.HIGH): devices.AND,
+                      (devices.LOW, devices.LOW): devices.OR,
+                      (devices.HIGH, devices.LOW): devices.NAND,
+                      (devices.LOW, devices.HIGH): devices.NOR,
+                      (None, None): devices.XOR}
+        self.segments = [
+            (feedback, [(operations[(x, y)], inputs, output)
+                        for x, y, inputs, output in gates])
+            for feedback, gates in compiled_network.segments]
+
+        self.switches = {device.device_id: signal for device, signal
+                         in compiled_network.switches}
+        self.switch_words = {
+            device.device_id: mask if device.switch_state == devices.HIGH
+            else 0 for device, signal in compiled_network.switches}
+
+        # [clock_counter, clock_half_period, level, signal] for each clock
+        self.clocks = [
+            [device.clock_counter, device.clock_half_period,
+             compiled_network._signal_level(device.outputs[None]), signal]
+            for device, signal in compiled_network.clocks]
+
+        self.d_types = [d_type[1:] for d_type in compiled_network.d_types]
+        self.memory_words = [
+            mask if d_type[0].dtype_memory == devices.HIGH else 0
+            for d_type in compiled_network.d_types]
+
+    def set_switch(self, device_id, signal_list):
+        """Set the switch state in each lane to the listed signals.
+
+        signal_list holds one HIGH or LOW signal per lane. Return True if
+        successful.
+        """
+        if device_id not in self.switches or \
+                len(signal_list) != self.lanes:
+            return False
+        word = 0
+        for lane, signal in enumerate(signal_list):
+            if signal == self.devices.HIGH:
+                word |= 1 << lane
+            elif signal != self.devices.LOW:
+                return False
+        self.switch_words[device_id] = word
+        return True
+
+    def get_signal_word(self, device_id, output_id):
+        """Return the signal levels of all lanes packed into an integer.
+
+        Bit n holds the level in lane n. Return None if the output does not
+        exist.
+        """
+        signal = self.compiled_network.get_signal_index(device_id, output_id)
+        if signal is None:
+            return None
+        return self.words[signal]
+
+    def get_signals(self, device_id, output_id):
+        """Return a list of the signal levels in each lane.
+
+        Return None if the output does not exist.
+        """
+        word = self.get_signal_word(device_id, output_id)
+        if word is None:
+            return None
+        return [(word >> lane) & 1 for lane in range(self.lanes)]
+
+    def _evaluate(self, gates):
+        """Evaluate the gates once in order for every lane.
+
+        Return True if any signal changed.
+        """
+        words = self.words
+        mask = self.mask
+        devices = self.devices
+        any_change = False
+        for operation, inputs, output in gates:
+            if operation == devices.XOR:
+                new_word = words[inputs[0]] ^ words[inputs[1]]
+            elif operation == devices.AND or operation == devices.NAND:
+                new_word = mask
+                for signal in inputs:
+                    new_word &= words[signal]
+                if operation == devices.NAND:
+                    new_word ^= mask
+            else:
+                new_word = 0
+                for signal in inputs:
+                    new_word |= words[signal]
+                if operation == devices.NOR:
+                    new_word ^= mask
+            if words[output] != new_word:
+                words[output] = new_word
+                any_change = True
+        return any_change
+
+    def _settle(self):
+        """Settle the logic gates in one ordered pass.
+
+        Return False if a feedback loop is still changing in any lane after
+        iteration_limit passes.
+        """
+        iteration_limit = self.compiled_network.iteration_limit
+        for feedback, gates in self.segments:
+            if not feedback:
+                self._evaluate(gates)
+                continue
+            for _ in range(iteration_limit):
+                if not self._evaluate(gates):
+                    break
+            else:
+                return False
+        return True
+
+    def _update_d_types(self, data_start, clock_seen):
+        """Latch, set and clear the D-types in every lane.
+
+        Return True if any D-type output changed.
+        """
+        words = self.words
+        mask = self.mask
+        memory_words = self.memory_words
+        d_type_changed = False
+        for number, (clock, data, set_signal, clear_signal, q_signal,
+                     qbar_signal) in enumerate(self.d_types):
+            # Latch in the lanes where the clock has risen
+            edges = words[clock] & ~clock_seen[number]
+            memory = (memory_words[number] & ~edges) | \
+                (data_start[number] & edges)
+            clock_seen[number] = words[clock]
+            memory = (memory | words[set_signal]) & \
+                ~words[clear_signal] & mask
+            memory_words[number] = memory
+            if words[q_signal] != memory or \
+                    words[qbar_signal] != memory ^ mask:
+                words[q_signal] = memory
+                words[qbar_signal] = memory ^ mask
+                d_type_changed = True
+        return d_type_changed
+
+    def execute(self):
+        """Execute all the lanes for one simulation cycle.
+
+        Return True if successful and no lane oscillates.
+        """
+        if not self.compiled_network.complete:
+            return False
+        words = self.words
+        mask = self.mask
+
+        d_types = self.d_types
+        data_start = [words[d_type[1]] for d_type in d_types]
+        clock_seen = [words[d_type[0]] for d_type in d_types]
+
+        for clock in self.clocks:
+            if clock[0] == clock[1]:
+                clock[0] = 0
+                clock[2] = 1 - clock[2]
+            clock[0] += 1
+            words[clock[3]] = mask if clock[2] == self.devices.HIGH else 0
+        for device_id, signal in self.switches.items():
+            words[signal] = self.switch_words[device_id]
+
+        # As in CompiledNetwork.execute, update the D-types before the gates
+        # settle and after, until no D-type output changes
+        self._update_d_types(data_start, clock_seen)
+        for _ in range(self.compiled_network.iteration_limit):
+            settled = self._settle()
+            if not self._update_d_types(data_start, clock_seen):
+                return settled
+        return False
+
+
+class VectorisedNetwork(CompiledNetwork):
+    """Execute the compiled network with NumPy arrays.
+
+    The signals are held in one int8 state vector. Within each level, gates
+    are grouped by kind and number of inputs, with an array of input signal
+    indexes for each group, so a whole group is evaluated by a single
+    reduction over its rows. Gates in feedback loops are still iterated one
+    at a time, and the results are the same as for CompiledNetwork.
+
+    NumPy is only imported when this class is used.
+
+    Parameters
+    ----------
+    network: instance of the network.Network() class.
+    iteration_limit: number of passes allowed for a feedback loop to settle.
+
+    Public methods
+    --------------
+    execute(self): Executes all the devices in the network for one
+                   simulation cycle.
+    """
+
+    def __init__(self, network, iteration_limit=20):
+        """Levelize the network and build its arrays."""
+        import numpy
+        self.numpy = numpy
+        super().__init__(network, iteration_limit)
+
+        self.state = numpy.array(self.values, dtype=numpy.int8)
+
+        # Each level is a list of (feedback, gates) segments, where gates
+        # are (x, y, input index array, output index array) groups outside
+        # feedback loops, or the gates of a feedback loop
+        self.vector_segments = []
+        for level in self.levels:
+            groups = {}  # {(x, y, number of inputs): [gates]}
+            for feedback, gates in level:
+                if feedback:
+                    self.vector_segments.append((True, gates))
+                    continue
+                for gate in gates:
+                    x, y, inputs, output = gate
+                    groups.setdefault((x, y, len(inputs)), []).append(gate)
+            self.vector_segments.append((False, [
+                (x, y,
+                 numpy.array([gate[2] for gate in gates], dtype=numpy.intp),
+                 numpy.array([gate[3] for gate in gates], dtype=numpy.intp))
+                for (x, y, number_of_inputs), gates in groups.items()]))
+
+        def indexes(position):
+            return numpy.array([d_type[position] for d_type in self.d_types],
+                               dtype=numpy.intp)
+        [self.d_type_clocks, self.d_type_data, self.d_type_sets,
+         self.d_type_clears, self.d_type_qs,
+         self.d_type_qbars] = [indexes(position) for position in range(1, 7)]
+
+        # A D-type clocked, set or cleared directly by another D-type sees
+        # that D-type's new output within the same round, so such D-types are
+        # updated one at a time
+        d_type_outputs = set(self.d_type_qs) | set(self.d_type_qbars)
+        self.d_types_chained = any(
+            signal in d_type_outputs for signal in
+            numpy.concatenate([self.d_type_clocks, self.d_type_sets,
+                               self.d_type_clears]))
+
+    def _evaluate_groups(self, groups):
+        """Evaluate groups of gates, one vectorised operation per group."""
+        state = self.state
+        high = self.devices.HIGH
+        for x, y, inputs, outputs in groups:
+            rows = state[inputs]
+            if x is None:  # XOR
+                new_state = rows[:, 0] ^ rows[:, 1]
+            elif x == high:  # output is y if all inputs are HIGH
+                new_state = rows.min(axis=1)
+                if y != high:
+                    new_state = 1 - new_state
+            else:  # output is y if all inputs are LOW
+                new_state = rows.max(axis=1)
+                if y == high:
+                    new_state = 1 - new_state
+            state[outputs] = new_state
+
+    def _evaluate_loop(self, gates):
+        """Evaluate the gates of a feedback loop once in order.
+
+        Return True if any signal changed.
+        """
+        state = self.state
+        any_change = False
+        for x, y, inputs, output in gates:
+            if x is None:  # XOR
+                new_value = state[inputs[0]] ^ state[inputs[1]]
+            else:
+                new_value = y
+                for signal in inputs:
+                    if state[signal] != x:
+                        new_value = 1 - y
+                        break
+            if state[output] != new_value:
+                state[output] = new_value
+                any_change = True
+        return any_change
+
+    def _settle(self):
+        """Settle the logic gates in one ordered pass.
+
+        Return False if a feedback loop is still changing after
+        iteration_limit passes.
+        """
+        for feedback, gates in self.vector_segments:
+            if not feedback:
+                self._evaluate_groups(gates)
+                continue
+            for _ in range(self.iteration_limit):
+                if not self._evaluate_loop(gates):
+                    break
+            else:
+                return False
+        return True
+
+    def _update_d_types(self, memory, data_start, clock_seen):
+        """Latch, set and clear all the D-types at once.
+
+        Return the new memory and clock_seen arrays, and True if any D-type
+        output changed.
+        """
+        numpy = self.numpy
+        devices = self.devices
+        state = self.state
+        clock = state[self.d_type_clocks]
+        edges = (clock == devices.HIGH) & (clock_seen == devices.LOW)
+        memory = numpy.where(edges, data_start, memory)
+        memory[state[self.d_type_sets] == devices.HIGH] = devices.HIGH
+        memory[state[self.d_type_clears] == devices.HIGH] = devices.LOW
+        if not ((state[self.d_type_qs] != memory) |
+                (state[self.d_type_qbars] == memory)).any():
+            return memory, clock, False
+        state[self.d_type_qs] = memory
+        state[self.d_type_qbars] = 1 - memory
+        return memory, clock, True
+
+    def _update_chained_d_types(self, memory, data_start, clock_seen):
+        """Latch, set and clear the D-types one at a time.
+
+        Return the new memory and clock_seen arrays, and True if any D-type
+        output changed.
+        """
+        devices = self.devices
+        state = self.state
+        memory = memory.copy()
+        clock_seen = clock_seen.copy()
+        d_type_changed = False
+        for number, (device, clock, data, set_signal, clear_signal,
+                     q_signal, qbar_signal) in enumerate(self.d_types):
+            if state[clock] == devices.HIGH and \
+                    clock_seen[number] == devices.LOW:
+                memory[number] = data_start[number]
+            clock_seen[number] = state[clock]
+            if state[set_signal] == devices.HIGH:
+                memory[number] = devices.HIGH
+            if state[clear_signal] == devices.HIGH:
+                memory[number] = devices.LOW
+            if state[q_signal] != memory[number] or \
+                    state[qbar_signal] == memory[number]:
+                state[q_signal] = memory[number]
+                state[qbar_signal] = 1 - memory[number]
+                d_type_changed = True
+        return memory, clock_seen, d_type_changed
+
+    def execute(self):
+        """Execute all the devices in the network for one simulation cycle.
+
+        Return True if successful and the network does not oscillate.
+        """
+        if not self.complete:
+            return False
+        numpy = self.numpy
+        devices = self.devices
+        state = self.state
+        previous_state = state.copy()
+
+        # Clock outputs may have been changed by cold_startup
+        for device, signal in self.clocks:
+            state[signal] = self._signal_level(device.outputs[None])
+
+        data_start = state[self.d_type_data]
+        clock_seen = state[self.d_type_clocks]
+        memory_start = numpy.array(
+            [d_type[0].dtype_memory for d_type in self.d_types],
+            dtype=numpy.int8)
+        memory = memory_start.copy()
+
+        self.network.update_clocks()
+        for device, signal in self.clocks:
+            level = self._signal_level(device.outputs[None])
+            device.outputs[None] = level
+            state[signal] = level
+        for device, signal in self.switches:
+            state[signal] = device.switch_state
+
+        if self.d_types_chained:
+            update_d_types = self._update_chained_d_types
+        else:
+            update_d_types = self._update_d_types
+
+        # As in CompiledNetwork.execute, update the D-types before the gates
+        # settle and after, until no D-type output changes
+        memory, clock_seen, d_type_changed = update_d_types(
+            memory, data_start, clock_seen)
+        for _ in range(self.iteration_limit):
+            settled = self._settle()
+            memory, clock_seen, d_type_changed = update_d_types(
+                memory, data_start, clock_seen)
+            if not d_type_changed:
+                break
+        else:
+            settled = False
+
+        for number in numpy.flatnonzero(memory != memory_start):
+            self.d_types[number][0].dtype_memory = int(memory[number])
+        for signal in numpy.flatnonzero(state != previous_state):
+            outputs, output_id = self.signal_outputs[signal]
+            outputs[output_id] = int(state[signal])
+        return settled
+
+
+class GeneratedNetwork:
+    """Generate and compile a Python function that executes the network.
+
+    The function is straight-line code for one sweep of execute_network,
+    repeated until the signals settle. Signals are held in local variables
+    and every device is an inline expression, so there are no dictionary
+    lookups or method calls while the network settles. Signals follow the
+    same RISING and FALLING transitions as the sweep, and the results are
+    identical to it.
+
+    The function is compiled once, when this class is initialised. It
+    returns None, leaving the network untouched, if a signal is not a valid
+    level, so that the sweep can report the error.
+
+    Parameters
+    ----------
+    network: instance of the network.Network() class.
+    iteration_limit: number of sweeps allowed for the signals to settle.
+
+    Public methods
+    --------------
+    execute(self): Executes all the devices in the network for one
+                   simulation cycle.
+    """
+
+    def __init__(self, network, iteration_limit=20):
+        """Generate the source code of the network and compile it."""
+        self.network = network
+        self.devices = network.devices
+        self.iteration_limit = iteration_limit
+        self.device_count = len(self.devices.devices_list)
+        self.source = None
+        self.function = None
+
+        # A network with unconnected inputs is left to the sweep, which
+        # reports the error
+        self.complete = network.check_network()
+        if not self.complete:
+            return
+
+        self.source = self._generate()
+        namespace = {"devices_list": self.devices.devices_list,
+                     "update_clocks": network.update_clocks}
+        exec(compile(self.source, "<network>", "exec"), namespace)
+        self.function = namespace["execute"]
+
+    def _generate(self):
+        """Return the source code of the execute function."""
+        devices = self.devices
+        [LOW, HIGH, RISING, FALLING] = [devices.LOW, devices.HIGH,
+                                        devices.RISING, devices.FALLING]
+
+        # {(device_id, output_id): local variable name}
+        signals = {}
+        load = []
+        store = []
+        for number, device in enumerate(devices.devices_list):
+            load.append("    d%d = devices_list[%d]" % (number, number))
+            load.append("    o%d = d%d.outputs" % (number, number))
+            for output_id in device.outputs:
+                name = "s%d" % len(signals)
+                signals[(device.device_id, output_id)] = name
+                load.append("    %s = o%d[%r]" % (name, number, output_id))
+                store.append("    o%d[%r] = %s" % (number, output_id, name))
+        numbers = {device.device_id: number
+                   for number, device in enumerate(devices.devices_list)}
+
+        def update(signal, target_low):
+            # The same transitions as update_signal, where the target is LOW
+            # if target_low is true
+            return [
+                "        if %s == %d or %s == %d:" % (signal, LOW, signal,
+                                                      FALLING),
+                "            new = %d if %s else %d" % (LOW, target_low,
+                                                        RISING),
+                "        else:",
+                "            new = %d if %s else %d" % (FALLING, target_low,
+                                                        HIGH),
+                "        if new != %s:" % signal,
+                "            %s = new" % signal,
+                "            steady = False"]
+
+        def input_signals(device):
+            return [signals[connected_output]
+                    for connected_output in device.inputs.values()]
+
+        body = []
+        for device_id in devices.find_devices(devices.SWITCH):
+            body += update(signals[(device_id, None)],
+                           "d%d.switch_state == %d" % (numbers[device_id],
+                                                       LOW))
+        for device_id in devices.find_devices(devices.D_TYPE):
+            device = devices.get_device(device_id)
+            number = numbers[device_id]
+            [clock, data, set_signal, clear_signal] = [
+                signals[device.inputs[input_id]] for input_id in
+                [devices.CLK_ID, devices.DATA_ID, devices.SET_ID,
+                 devices.CLEAR_ID]]
+            body += [
+                "        if %s == %d:" % (clock, RISING),
+                "            if %s == %d or %s == %d:" % (data, HIGH, data,
+                                                          FALLING),
+                "                m%d = %d" % (number, HIGH),
+                "            elif %s == %d or %s == %d:" % (data, LOW, data,
+                                                            RISING),
+                "                m%d = %d" % (number, LOW),
+                "        if %s == %d:" % (set_signal, HIGH),
+                "            m%d = %d" % (number, HIGH),
+                "        if %s == %d:" % (clear_signal, HIGH),
+                "            m%d = %d" % (number, LOW)]
+            # QBAR is driven towards the inverse of the memory, which is only
+            # LOW if the memory is HIGH
+            body += update(signals[(device_id, devices.Q_ID)],
+                           "m%d == %d" % (number, LOW))
+            body += update(signals[(device_id, devices.QBAR_ID)],
+                           "m%d == %d" % (number, HIGH))
+        for device_id in devices.find_devices(devices.CLOCK):
+            signal = signals[(device_id, None)]
+            body += [
+                "        if %s == %d:" % (signal, RISING),
+                "            %s = %d" % (signal, HIGH),
+                "            steady = False",
+                "        elif %s == %d:" % (signal, FALLING),
+                "            %s = %d" % (signal, LOW),
+                "            steady = False"]
+
+        # The output of a gate is y if all its inputs are exactly x, else the
+        # inverse of y, so the target is LOW if y is LOW and all the inputs
+        # are x, or if y is HIGH and any input is not x
+        for device_kind, x, y in [(devices.AND, HIGH, HIGH),
+                                  (devices.OR, LOW, LOW),
+                                  (devices.NAND, HIGH, LOW),
+                                  (devices.NOR, LOW, HIGH)]:
+            for device_id in devices.find_devices(device_kind):
+                inputs = input_signals(devices.get_device(device_id))
+                if y == LOW:
+                    target_low = " and ".join("%s == %d" % (signal, x)
+                                              for signal in inputs)
+                else:
+                    target_low = " or ".join("%s != %d" % (signal, x)
+                                             for signal in inputs)
+                body += update(signals[(device_id, None)], target_low)
+        for device_id in devices.find_devices(devices.XOR):
+            [first, second] = input_signals(devices.get_device(device_id))
+            body += update(signals[(device_id, None)],
+                           "%s == %s" % (first, second))
+        # The target of a NOT gate is only LOW if its input is HIGH
+        for device_id in devices.find_devices(devices.NOT):
+            [signal] = input_signals(devices.get_device(device_id))
+            body += update(signals[(device_id, None)],
+                           "%s == %d" % (signal, HIGH))
+
+        d_type_numbers = [numbers[device_id] for device_id in
+                          devices.find_devices(devices.D_TYPE)]
+        clock_signals = [signals[(device_id, None)] for device_id in
+                         devices.find_devices(devices.CLOCK)]
+        valid = [LOW, HIGH, RISING, FALLING]
+
+        lines = ["def execute():"]
+        lines += load
+        if signals:
+            lines += ["    if not {%s} <= {%s}:" % (
+                          ", ".join(signals.values()),
+                          ", ".join(str(signal) for signal in valid)),
+                      "        return None"]
+        lines += ["    update_clocks()"]
+        lines += ["    %s = o%d[None]" % (signal, numbers[device_id])
+                  for device_id, signal in zip(
+                      devices.find_devices(devices.CLOCK), clock_signals)]
+        lines += ["    m%d = d%d.dtype_memory" % (number, number)
+                  for number in d_type_numbers]
+        # A state that repeats without settling repeats for ever
+        state = "".join("%s, " % variable for variable in
+                        list(signals.values()) +
+                        ["m%d" % number for number in d_type_numbers])
+        lines += ["    steady = True",
+                  "    states = set()",
+                  "    for _ in range(%d):" % self.iteration_limit,
+                  "        steady = True"]
+        lines += body
+        lines += ["        if steady:",
+                  "            break",
+                  "        state = hash((%s))" % state,
+                  "        if state in states:",
+                  "            break",
+                  "        states.add(state)"]
+        lines += store
+        lines += ["    d%d.dtype_memory = m%d" % (number, number)
+                  for number in d_type_numbers]
+        lines += ["    return steady", ""]
+        return "\n".join(lines)
+
+    def execute(self):
+        """Execute all the devices in the network for one simulation cycle.
+
+        Return True if successful and the network does not oscillate, or
+        None if the network cannot be executed by the generated function.
+        """
+        if not self.complete:
+            return None
+        steady = self.function()
+        if steady is not None:
+            self.network.steady_state = steady
+        return steady
@@ -119,7 +119,7 @@ class Parser:
         self.input_not_connected_errors = []
         self.not_initialised_errors = []
 
-        self.names_parsed = []
+        self.names_parsed = set()
 
         self.device_dict = {}  # {device_id: device_kind, device_property=None}
 
@@ -177,7 +177,7 @@ class Parser:
                     raise RedefinedError(
                         symbol, self.names.get_name_string(symbol.id))
                 else:
-                    self.names_parsed.append(
+                    self.names_parsed.add(
                         self.names.get_name_string(symbol.id))
                     name_symbols.append(symbol)
 
@@ -9,8 +9,15 @@ Classes
 Scanner - reads definition file and translates characters into symbols.
 Symbol - encapsulates a symbol and stores its properties.
 """
+import re
 import sys
 
+# Runs of whitespace (str.isspace()) and comments, of characters for which
+# str.isalnum() is True, and of decimal digits
+SPACES_AND_COMMENTS = re.compile(r"(?:\s+|#[^;\n]*[;\n]?)*")
+ALPHANUMERICS = re.compile(r"[^\W_]*")
+DECIMALS = re.compile(r"\d*")
+
 
 class Symbol:
     """Encapsulate a symbol and store its properties.
@@ -24,6 +31,9 @@ class Symbol:
     No public methods.
     """
 
+    # Symbols are created for every token, so they have no __dict__
+    __slots__ = ("type", "id", "line_number", "line_position")
+
     def __init__(self):
         """Initialise symbol properties."""
         self.type = None
@@ -40,6 +50,10 @@ class Scanner:
     that the parser can use. It also skips over comments and irrelevant
     formatting characters, such as spaces and line breaks.
 
+    The file is read in one go, and runs of spaces, comments, names and
+    numbers are matched with compiled regular expressions, rather than
+    reading and joining one character at a time.
+
     Parameters
     ----------
     path: path to the circuit definition file.
@@ -89,6 +103,12 @@ class Scanner:
          self.DTYPE_id, self.SWITCH_id, self.CLOCK_id, self.HIGH_id,
          self.LOW_id, self.DATA_id, self.CLK_id, self.SET_id, self.CLEAR_id,
          self.Q_id, self.QBAR_id] = self.names.lookup(self.keywords_list)
+        self.keywords_set = set(self.keywords_list)
+
+        self.punctuation_types = {",": self.COMMA, ".": self.DOT,
+                                  ";": self.SEMICOLON, "=": self.EQUALS,
+                                  "(": self.OPEN_BRACKET,
+                                  ")": self.CLOSE_BRACKET}
 
         self.current_character = " "
         self.current_line = 0
@@ -100,31 +120,43 @@ class Scanner:
             print("This file could not be opened, perhaps it doesn't exist")
             sys.exit()
         self.file = file
-        self.lines = self.file.read().splitlines()
-        self.file.seek(0)
-
-    def _advance(self):
-        """Read next character from file."""
-        self.current_character = self.file.read(1)
-        if self.current_character == "\n":
-            self.current_line += 1
-            self.current_character_position = -1
+        # The whole file is read at once and scanned by index
+        self.text = self.file.read()
+        self.file.close()
+        self.lines = self.text.splitlines()
+        self.text_length = len(self.text)
+
+        # Index of the current character in the text, and of the last line
+        # break at or before it. Indexes past the end of the text are EOF.
+        self.index = -1
+        self.line_start = -1
+
+    def _move_to(self, index):
+        """Move forward to the character at index and update its location."""
+        text = self.text
+        newlines = text.count("\n", self.index + 1, index + 1)
+        if newlines:
+            self.current_line += newlines
+            self.line_start = text.rfind("\n", self.index + 1, index + 1)
+        self.index = index
+        self.current_character_position = index - self.line_start - 1
+        if index < self.text_length:
+            self.current_character = text[index]
         else:
-            self.current_character_position += 1
-        return
-
-    def _skip_spaces(self):
-        """Skips until non-space character is reached."""
-        while self.current_character.isspace():
-            self._advance()
-        return
-
-    def _skip_comment(self):
-        """Skips the current comment (Until next semicolon or newline)."""
-        while self.current_character not in [";", "\n", ""]:
-            self._advance()
-        self._advance()
-        return
+            self.current_character = ""
+
+    def _skip_spaces_and_comments(self):
+        """Skip whitespace and comments until a symbol or EOF is reached.
+
+        A comment runs up to and including the next semicolon or line break.
+        """
+        text = self.text
+        start = max(self.index, 0)
+        end = SPACES_AND_COMMENTS.match(text, start).end()
+        if end == self.text_length and text.rfind("#", start, end) > \
+                max(text.rfind(";", start, end), text.rfind("\n", start, end)):
+            end += 1  # a comment at the end of the file skips past EOF
+        self._move_to(end)
 
     def print_error_line(self, line_number, line_position, error_message=""):
         """Print current line with marker pointing where the error is."""
@@ -133,76 +165,59 @@ class Scanner:
         print(self.lines[line_number])
         print(" " * (line_position) + "^ Error here")
 
-    def _get_name(self):
-        """Read and returns the next name (word made up of only letters)."""
-        name = ""
-        while self.current_character.isalnum():
-            name += self.current_character
-            self._advance()
-        return name
-
-    def _get_number(self):
-        """Read and returns the next number."""
-        number = ""
-        while self.current_character.isdigit():
-            number += self.current_character
-            self._advance()
-        return int(number)
-
     def get_symbol(self):
         """Translate the next sequence of characters into a symbol."""
         symbol = Symbol()
-        self._skip_spaces()  # Current character is now not whitespace
+        character = self.current_character
+        if character.isspace() or character == "#":
+            self._skip_spaces_and_comments()
+            character = self.current_character
 
         symbol.line_number = self.current_line
         symbol.line_position = self.current_character_position
 
-        if self.current_character.isalpha():  # Name
-            name_string = self._get_name()
-            # print(name_string) # For tests
-            if name_string in self.keywords_list:
+        text = self.text
+        index = self.index
+        if character.isalpha():  # Name
+            end = ALPHANUMERICS.match(text, index).end()
+            name_string = text[index:end]
+            if name_string in self.keywords_set:
                 symbol.type = self.KEYWORD
             else:
                 symbol.type = self.NAME
             [symbol.id] = self.names.lookup([name_string])
 
-        elif self.current_character.isdigit():  # Number
-            symbol.id = self._get_number()
-            # print(symbol.id) # For tests
+        elif character.isdigit():  # Number
+            end = DECIMALS.match(text, index).end()
+            # Digits such as superscripts are not decimals
+            while end < self.text_length and text[end].isdigit():
+                end += 1
+            symbol.id = int(text[index:end])
             symbol.type = self.NUMBER
 
-        elif self.current_character == ",":  # Punctuation
-            symbol.type = self.COMMA
-            self._advance()
-
-        elif self.current_character == ".":
-            symbol.type = self.DOT
-            self._advance()
+        elif character in self.punctuation_types:  # Punctuation
+            symbol.type = self.punctuation_types[character]
+            end = index + 1
 
-        elif self.current_character == ";":
-            symbol.type = self.SEMICOLON
-            self._advance()
-
-        elif self.current_character == "=":
-            symbol.type = self.EQUALS
-            self._advance()
-
-        elif self.current_character == "(":
-            symbol.type = self.OPEN_BRACKET
-            self._advance()
-
-        elif self.current_character == ")":
-            symbol.type = self.CLOSE_BRACKET
-            self._advance()
-
-        elif self.current_character == "":  # End of File
+        elif character == "":  # End of File
             symbol.type = self.EOF
-
-        elif self.current_character == "#":  # Comment Check
-            self._skip_comment()
-            symbol = self.get_symbol()
+            end = index
 
         else:  # Not a valid character (symbol.type == None)
-            self._advance()
+            end = index + 1
+
+        # Symbols never contain line breaks, but may be followed by one
+        self.index = end
+        if end < self.text_length:
+            character = self.current_character = text[end]
+            if character == "\n":
+                self.current_line += 1
+                self.line_start = end
+                self.current_character_position = -1
+            else:
+                self.current_character_position += end - index
+        else:
+            self.current_character = ""
+            self.current_character_position += end - index
 
         return symbol
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Measure the startup time of the Logic Simulator command line modes.
+
+This script runs logsim.py in fresh Python processes and reports the time
+taken to import logsim.py and its modules, and the total time of a
+command line (-c) run that quits straight away and of a one-cycle batch
+(-b) run. It also reports whether any GUI module was imported.
+
+Usage
+-----
+python startup_benchmark.py [-r <repeats>] [<file path>]
+"""
+import getopt
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Top-level modules that should only be imported by the GUI
+GUI_MODULES = ["wx", "OpenGL", "gui", "gui_modules", "app_base"]
+
+
+def import_time(arguments, directory, stdin=""):
+    """Return the import time in seconds and the GUI modules imported.
+
+    logsim.py is run with arguments under python -X importtime, and the
+    cumulative times of the top-level imports are added up.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "logsim.py"] + arguments,
+        cwd=directory, input=stdin, capture_output=True, text=True)
+    total = 0
+    gui_modules = set()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        [_, cumulative, module] = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # the column headings
+        module_name = module.strip()
+        if not module.startswith("  "):
+            total += int(cumulative)  # a top-level import
+        if module_name.split(".")[0] in GUI_MODULES:
+            gui_modules.add(module_name.split(".")[0])
+    return total / 1e6, sorted(gui_modules)
+
+
+def run_time(arguments, directory, repeats, stdin=""):
+    """Return the median wall time in seconds of running logsim.py."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "logsim.py"] + arguments,
+                       cwd=directory, input=stdin, capture_output=True,
+                       text=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main(arg_list):
+    """Parse the options and print the startup times of each mode."""
+    usage_message = ("Usage:\n"
+                     "python startup_benchmark.py [-r <repeats>] "
+                     "[<file path>]")
+    try:
+        options, arguments = getopt.getopt(arg_list, "hr:")
+    except getopt.GetoptError:
+        print("Error: invalid command line arguments\n")
+        print(usage_message)
+        sys.exit(2)
+
+    repeats = 10
+    for option, value in options:
+        if option == "-h":
+            print(usage_message)
+            sys.exit()
+        elif option == "-r":
+            repeats = int(value)
+
+    directory = os.path.dirname(os.path.abspath(__file__))
+    if arguments:
+        path = os.path.abspath(arguments[0])
+    else:
+        path = os.path.join(directory, "examples", "simple_circuit.txt")
+
+    modes = [("-c", ["-c", path], "q\n"),
+             ("-b", ["-b", path, "-n", "1"], "")]
+    baseline = run_time(["-h"], directory, repeats)
+    print("Median of %d runs, Python %s" % (repeats, sys.version.split()[0]))
+    print("%-4s %12s %12s  %s" % ("mode", "imports (s)", "total (s)",
+                                  "GUI modules imported"))
+    print("%-4s %12s %12.4f  %s" % ("-h", "", baseline, ""))
+    for mode, arguments, stdin in modes:
+        imports, gui_modules = import_time(arguments, directory, stdin)
+        total = run_time(arguments, directory, repeats, stdin)
+        print("%-4s %12.4f %12.4f  %s" % (mode, imports, total,
+                                          ", ".join(gui_modules) or "none"))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""Run a circuit under many switch settings and seeds in parallel.
+
+Used in the Logic Simulator project to simulate the same compiled circuit
+from a cold start for every combination of switch assignments and random
+seeds, spreading the runs over worker processes, and to collect the
+monitored signals or a summary of them.
+
+Usage
+-----
+python sweep.py [-n <cycles>] [-s <switch>=<0|1>,...] [-w <switches>]
+                [-r <seeds>] [-j <processes>] [-m <simulation mode>]
+                [-f traces|summary] [-o <output path>] <file path>
+
+Each -s option adds a switch assignment, and -w sweeps every combination of
+levels of the comma-separated switches. <seeds> is a comma-separated list
+of seeds and ranges such as 0-99. The results are written as JSON, and the
+exit status is 1 if the file has errors or any run oscillates.
+
+Classes
+-------
+SweepRunner - runs a compiled circuit under many switch settings and seeds.
+"""
+import concurrent.futures
+import contextlib
+import getopt
+import io
+import itertools
+import json
+import os
+import sys
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from global_vars import GlobalVars
+from batch import BatchSimulator
+from circuit_cache import dump_circuit, load_circuit
+from logsim import compile_circuit
+
+# Circuit simulated by each run in a worker process, loaded once by the
+# process initialiser
+_worker_circuit = None
+
+
+class _SweepCircuit:
+    """Simulate runs of a compiled circuit from its pickled state.
+
+    The circuit is loaded again from the pickled state before every run, so
+    no signal, memory or cache is carried over from the run before it.
+    """
+
+    def __init__(self, circuit_data):
+        """Initialise the instances that the circuit is loaded into."""
+        self.circuit_data = circuit_data
+        self.names = Names()
+        self.devices = Devices(self.names)
+        self.network = Network(self.names, self.devices)
+        self.monitors = Monitors(self.names, self.devices, self.network)
+        self.simulator = BatchSimulator(self.names, self.devices,
+                                        self.network, self.monitors)
+
+    def run(self, task):
+        """Run one task and return its result dictionary.
+
+        task is a list of the form [switch assignment, seed, cycles, traces]
+        used by SweepRunner.run.
+        """
+        [switch_assignment, seed, cycles, traces] = task
+        load_circuit(io.BytesIO(self.circuit_data), self.names, self.devices,
+                     self.network, self.monitors)
+        for name, level in switch_assignment.items():
+            self.devices.set_switch(self.names.query(name), level)
+        steady_state = self.simulator.run(cycles, seed=seed)
+
+        signals = {}
+        for (device_id, output_id), signal_trace in \
+                self.monitors.monitors_dictionary.items():
+            signal_name = self.devices.get_signal_name(device_id, output_id)
+            if traces:
+                signals[signal_name] = list(signal_trace)
+            else:
+                signals[signal_name] = summarise_trace(signal_trace,
+                                                       self.devices.HIGH)
+        return {"switches": switch_assignment,
+                "seed": self.devices.cold_startup_seed,
+                "cycles": self.simulator.cycles_completed,
+                "steady_state": steady_state,
+                "oscillating_devices": [
+                    self.names.get_name_string(device_id) for device_id in
+                    self.network.oscillating_devices],
+                "signals": signals}
+
+
+def _initialise_worker(circuit_data):
+    """Load the compiled circuit once in a new worker process."""
+    global _worker_circuit
+    _worker_circuit = _SweepCircuit(circuit_data)
+
+
+def _run_worker_task(task):
+    """Run one task on the compiled circuit of the worker process."""
+    return _worker_circuit.run(task)
+
+
+def summarise_trace(signal_trace, high):
+    """Return the final level, HIGH cycles and level changes of a trace.
+
+    The summary is worked out from the runs of the trace, since each run
+    after the first starts with a change of level.
+    """
+    runs = list(signal_trace.runs())
+    return {"final": runs[-1][2] if runs else None,
+            "high_cycles": sum(length for start, length, signal in runs
+                               if signal == high),
+            "changes": max(len(runs) - 1, 0)}
+
+
+class SweepRunner:
+    """Run a compiled circuit under many switch settings and seeds.
+
+    This class pickles the compiled circuit once and ships it to each worker
+    process when the process starts, so each run only sends its switch
+    assignment and seed. Every run starts from the compiled circuit, with
+    its switch assignment, and a cold start. Runs in the LEVELIZED,
+    VECTORISED and GENERATED modes build the compiled network again.
+
+    Parameters
+    ----------
+    names: instance of the names.Names() class.
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+    monitors: instance of the monitors.Monitors() class.
+    processes: number of worker processes. Defaults to the number of CPUs.
+
+    Public methods
+    --------------
+    check_switch_assignment(self, switch_assignment): Returns the first name
+                                    in the switch assignment that is not a
+                                    switch, or None.
+
+    run(self, switch_assignments, seeds, cycles, traces=True): Runs the
+                    circuit for every switch assignment and seed, and returns
+                    the results.
+    """
+
+    def __init__(self, names, devices, network, monitors, processes=None):
+        """Pickle the compiled circuit and set the number of processes."""
+        self.names = names
+        self.devices = devices
+        circuit_file = io.BytesIO()
+        dump_circuit(circuit_file, names, devices, network, monitors)
+        self.circuit_data = circuit_file.getvalue()
+        if processes is None:
+            processes = os.cpu_count() or 1
+        self.processes = processes
+
+    def check_switch_assignment(self, switch_assignment):
+        """Return the first name that is not a switch, or None.
+
+        switch_assignment is a dictionary of the form {switch name: level}.
+        """
+        for name in switch_assignment:
+            device = self.devices.get_device(self.names.query(name))
+            if device is None or device.device_kind != self.devices.SWITCH:
+                return name
+        return None
+
+    def run(self, switch_assignments, seeds, cycles, traces=True):
+        """Run the circuit for every switch assignment and seed.
+
+        switch_assignments is a list of dictionaries of the form {switch
+        name: level}, and a seed of None draws a new seed for each run.
+        Return a list of result dictionaries, with every seed of the first
+        switch assignment first. Each result holds the switch assignment,
+        the seed used, which replays the run, the cycles completed, whether
+        every cycle settled, the oscillating devices and the monitored
+        signals, either as traces or summarised by summarise_trace.
+        """
+        tasks = [(switch_assignment, seed, cycles, traces)
+                 for switch_assignment in switch_assignments
+                 for seed in seeds]
+        if self.processes == 1 or len(tasks) == 1:
+            sweep_circuit = _SweepCircuit(self.circuit_data)
+            return [sweep_circuit.run(task) for task in tasks]
+
+        processes = min(self.processes, len(tasks))
+        with concurrent.futures.ProcessPoolExecutor(
+                processes, initializer=_initialise_worker,
+                initargs=(self.circuit_data,)) as executor:
+            # Batches of tasks cut the messages between the processes
+            return list(executor.map(
+                _run_worker_task, tasks,
+                chunksize=max(1, len(tasks) // (4 * processes))))
+
+
+def read_seeds(seeds_string):
+    """Return the seeds in a comma-separated list of seeds and ranges.
+
+    Raise ValueError if the list is invalid.
+    """
+    seeds = []
+    for item in seeds_string.split(","):
+        first, separator, last = item.partition("-")
+        if separator:
+            seeds.extend(range(int(first), int(last) + 1))
+        else:
+            seeds.append(int(first))
+    return seeds
+
+
+def read_switch_assignment(settings_string):
+    """Return {switch name: level} for comma-separated "name=level" settings.
+
+    Raise ValueError if a setting is invalid.
+    """
+    switch_assignment = {}
+    for setting in settings_string.split(","):
+        name, separator, level = setting.partition("=")
+        if not separator or level.strip() not in ["0", "1"]:
+            raise ValueError("invalid switch setting " + setting)
+        switch_assignment[name.strip()] = int(level)
+    return switch_assignment
+
+
+def main(arg_list):
+    """Parse the options, run the sweep and write the results."""
+    usage_message = ("Usage:\n"
+                     "python sweep.py [-n <cycles>] "
+                     "[-s <switch>=<0|1>,...] [-w <switches>] "
+                     "[-r <seeds>] [-j <processes>] [-m <simulation mode>] "
+                     "[-f traces|summary] [-o <output path>] <file path>")
+    try:
+        options, arguments = getopt.getopt(arg_list, "hn:s:w:r:j:m:f:o:")
+    except getopt.GetoptError:
+        print("Error: invalid command line arguments\n")
+        print(usage_message)
+        sys.exit(2)
+    if ("-h", "") in options:
+        print(usage_message)
+        sys.exit()
+    mode_names = ["SWEEP", "EVENT_DRIVEN", "LEVELIZED", "VECTORISED",
+                  "GENERATED"]
+    switch_assignments = []
+    swept_switches = []
+    seeds = [None]
+    try:
+        option_values = dict(options)
+        cycles = int(option_values.get("-n", 10))
+        processes = int(option_values.get("-j", os.cpu_count() or 1))
+        simulation_mode = mode_names.index(option_values.get("-m", "SWEEP"))
+        output_format = option_values.get("-f", "summary")
+        for option, value in options:
+            if option == "-s":
+                switch_assignments.append(read_switch_assignment(value))
+            elif option == "-w":
+                swept_switches = [name.strip() for name in value.split(",")]
+            elif option == "-r":
+                seeds = read_seeds(value)
+        [path] = arguments
+    except ValueError:
+        print("Error: invalid command line arguments\n")
+        print(usage_message)
+        sys.exit(2)
+    if min(cycles, processes) < 1 or output_format not in ["traces",
+                                                           "summary"]:
+        print("Error: invalid command line arguments\n")
+        print(usage_message)
+        sys.exit(2)
+    # Every swept combination is combined with every assignment
+    switch_assignments = [
+        dict(switch_assignment, **dict(zip(swept_switches, levels)))
+        for switch_assignment in switch_assignments or [{}]
+        for levels in itertools.product([0, 1], repeat=len(swept_switches))]
+
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    # The parser reports to stdout, which may be the output
+    with contextlib.redirect_stdout(sys.stderr):
+        if not compile_circuit(path, names, devices, network, monitors,
+                               GlobalVars()):
+            sys.exit(1)
+    if not network.set_simulation_mode(simulation_mode):
+        print("Error: simulation mode not available", file=sys.stderr)
+        sys.exit(2)
+
+    runner = SweepRunner(names, devices, network, monitors, processes)
+    for switch_assignment in switch_assignments:
+        invalid_name = runner.check_switch_assignment(switch_assignment)
+        if invalid_name is not None:
+            print("Error: invalid switch " + invalid_name, file=sys.stderr)
+            sys.exit(2)
+    results = runner.run(switch_assignments, seeds, cycles,
+                         output_format == "traces")
+
+    sweep_results = {"cycles": cycles,
+                     "simulation_mode": mode_names[simulation_mode],
+                     "runs": results}
+    if "-o" in option_values:
+        with open(option_values["-o"], "w") as output_file:
+            json.dump(sweep_results, output_file, indent=2)
+            output_file.write("\n")
+    else:
+        json.dump(sweep_results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    oscillating_runs = [result for result in results
+                        if not result["steady_state"]]
+    if oscillating_runs:
+        print("Error: %d of %d runs oscillating" % (
+            len(oscillating_runs), len(results)), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
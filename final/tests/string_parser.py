@@ -113,7 +113,7 @@ class Parser:
         # To store error codes called from Network method make_connections()
         self.connection_errors = []
 
-        self.names_parsed = []
+        self.names_parsed = set()
 
         self.device_dict = {}  # {device_id: device_kind, device_property=None}
 
@@ -171,7 +171,7 @@ class Parser:
                     raise RedefinedError(
                         symbol, self.names.get_name_string(symbol.id))
                 else:
-                    self.names_parsed.append(
+                    self.names_parsed.add(
                         self.names.get_name_string(symbol.id))
                     name_symbols.append(symbol)
 
@@ -25,6 +25,8 @@ class Symbol:
     No public methods.
     """
 
+    __slots__ = ("type", "id", "line_number", "line_position")
+
     def __init__(self):
         """Initialise symbol properties."""
         self.type = None
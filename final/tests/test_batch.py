@@ -0,0 +1,72 @@
+"""Test the batch module."""
+import io
+import json
+
+import pytest
+
+from final.names import Names
+from final.devices import Devices
+from final.network import Network
+from final.monitors import Monitors
+from final.global_vars import GlobalVars
+from final.batch import BatchSimulator
+from final.tests.string_scanner import Scanner
+from final.tests.string_parser import Parser
+
+
+@pytest.fixture
+def simulator():
+    """Return a BatchSimulator instance for a parsed two-switch AND gate."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    definition = ("devices(a is AND; sw1, sw2 are SWITCH;)"
+                  "initialise(sw1, sw2 are HIGH; a has 2 inputs;)"
+                  "connections(sw1 is connected to a.I1;"
+                  "sw2 is connected to a.I2;)"
+                  "monitors(a; sw2;)")
+    parser = Parser(names, devices, network, monitors,
+                    Scanner(names, definition), GlobalVars())
+    assert parser.parse_network()
+    return BatchSimulator(names, devices, network, monitors)
+
+
+def test_set_switches(simulator):
+    """Test if set_switches sets valid switches and reports invalid ones."""
+    assert simulator.set_switches(["sw2=0"]) is None
+    assert simulator.set_switches(["sw1 = 0", "sw2=2"]) == "sw2=2"
+    assert simulator.set_switches(["a=1"]) == "a=1"
+    assert simulator.set_switches(["sw3=1"]) == "sw3=1"
+    assert simulator.set_switches(["sw1"]) == "sw1"
+
+
+@pytest.mark.parametrize("output_format, expected_output", [
+    ("text", "a  : ___\nsw2: ___\n"),
+    ("json", json.dumps({"cycles": 3, "steady_state": True, "seed": 7,
+                         "signals": {"a": [0, 0, 0],
+                                     "sw2": [0, 0, 0]}}) + "\n"),
+    ("csv", "cycle,a,sw2\n0,0,0\n1,0,0\n2,0,0\n"),
+])
+def test_write_results(simulator, output_format, expected_output):
+    """Test if write_results writes the monitored signals in each format."""
+    assert simulator.set_switches(["sw2=0"]) is None
+    assert simulator.run(3, seed=7)
+    output_file = io.StringIO()
+    assert simulator.write_results(output_file, output_format)
+    assert output_file.getvalue() == expected_output
+
+
+def test_run_vcd(tmp_path, simulator):
+    """Test if run writes the monitored signals straight to a VCD file."""
+    path = tmp_path / "signals.vcd"
+    assert simulator.run(5, str(path))
+    assert simulator.cycles_completed == 5
+    assert path.read_text().endswith("#0\n1!\n1\"\n#5\n")
+    assert list(simulator.monitors.monitors_dictionary.values()) == [[], []]
+
+
+def test_run_vcd_not_opened(tmp_path, simulator):
+    """Test if run raises OSError when the VCD file cannot be opened."""
+    with pytest.raises(OSError):
+        simulator.run(5, str(tmp_path / "missing" / "signals.vcd"))
@@ -0,0 +1,57 @@
+"""Test the benchmark module."""
+import json
+import os
+import subprocess
+import sys
+
+FINAL_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_benchmark(arguments):
+    """Run benchmark.py in the final directory and return the process."""
+    return subprocess.run([sys.executable, "benchmark.py", "-z", "20,300",
+                           "-c", "2", "-r", "1"] + arguments,
+                          cwd=FINAL_DIRECTORY, capture_output=True, text=True)
+
+
+def test_results_and_baseline(tmp_path):
+    """Test if results are written as JSON and compared with a baseline."""
+    results_path = tmp_path / "results.json"
+    process = run_benchmark(["-o", str(results_path)])
+    assert process.returncode == 0
+    results = json.loads(results_path.read_text())["results"]
+    assert [(result["benchmark"], result["size"]) for result in results] == [
+        (benchmark, size) for size in [20, 300] for benchmark in
+        ["get_symbol", "parse_network", "execute_network", "record_signals",
+         "display_signals"]]
+    assert all(result["seconds"] > 0 for result in results)
+
+    process = run_benchmark(["-b", str(results_path), "-t", "1000"])
+    assert process.returncode == 0
+    assert "%" in process.stdout
+
+    # Benchmarks of the larger circuit are slower than a baseline taking no
+    # time
+    for result in results:
+        result["seconds"] = 1e-9
+    results_path.write_text(json.dumps({"results": results}))
+    process = run_benchmark(["-b", str(results_path)])
+    assert process.returncode == 1
+    assert "slower than the baseline" in process.stdout
+
+
+def test_reference_baseline():
+    """Test if the reference baseline has every benchmark of each size."""
+    with open(os.path.join(FINAL_DIRECTORY,
+                           "benchmark_baseline.json")) as baseline_file:
+        results = json.load(baseline_file)["results"]
+    assert [(result["benchmark"], result["size"]) for result in results] == [
+        (benchmark, size) for size in [1000, 10000] for benchmark in
+        ["get_symbol", "parse_network", "execute_network", "record_signals",
+         "display_signals"]]
+
+
+def test_invalid_options():
+    """Test if invalid options give exit status 2."""
+    assert run_benchmark(["-m", "FAST"]).returncode == 2
+    assert run_benchmark(["-z", "0"]).returncode == 2
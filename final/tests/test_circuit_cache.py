@@ -0,0 +1,125 @@
+"""Test the circuit_cache module."""
+import os
+import stat
+
+import pytest
+
+from final.names import Names
+from final.devices import Devices
+from final.network import Network
+from final.monitors import Monitors
+from final.global_vars import GlobalVars
+from final.circuit_cache import CircuitCache
+from final.tests.string_scanner import Scanner
+from final.tests.string_parser import Parser
+
+DEFINITION = ("devices(a is NAND; sw1, sw2 are SWITCH; clk is CLOCK;"
+              "d is DTYPE;)"
+              "initialise(sw1 is LOW; sw2 is HIGH; clk cycle length 2;"
+              "a has 2 inputs;)"
+              "connections(sw2 to a.I1; clk to a.I2; a to d.CLK;"
+              "d.QBAR to d.DATA; sw1 to d.SET; sw1 to d.CLEAR;)"
+              "monitors(a, d.Q;)")
+
+
+def new_instances():
+    """Return new names, devices, network and monitors instances."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    return [names, devices, network, monitors]
+
+
+@pytest.fixture
+def definition_path(tmp_path):
+    """Return the path of a definition file."""
+    path = tmp_path / "circuit.txt"
+    path.write_text(DEFINITION)
+    return str(path)
+
+
+def run(instances, cycles=8):
+    """Run the network from a cold start and return the monitored traces."""
+    [names, devices, network, monitors] = instances
+    devices.set_seed(0)  # cold_startup chooses random clock and D-type states
+    devices.cold_startup()
+    for _ in range(cycles):
+        assert network.execute_network()
+        monitors.record_signals()
+    return [list(signal_trace)
+            for signal_trace in monitors.monitors_dictionary.values()]
+
+
+def test_save_and_load(tmp_path, definition_path):
+    """Test if a loaded circuit matches the parsed circuit."""
+    circuit_cache = CircuitCache(str(tmp_path / "cache"))
+    parsed = new_instances()
+    parser = Parser(*parsed, Scanner(parsed[0], DEFINITION), GlobalVars())
+    assert parser.parse_network()
+    # Caches built while simulating are not saved
+    parsed[2].set_simulation_mode(parsed[2].GENERATED)
+    parsed[2].generate_network()
+
+    loaded = new_instances()
+    assert not circuit_cache.load(definition_path, *loaded)
+    assert circuit_cache.save(definition_path, *parsed)
+    assert circuit_cache.load(definition_path, *loaded)
+
+    [names, devices, network, monitors] = loaded
+    assert names.names == parsed[0].names
+    assert devices.names is names
+    assert network.devices is devices
+    assert monitors.network is network
+    assert network.connections == parsed[2].connections
+    assert list(monitors.monitors_dictionary) == \
+        list(parsed[3].monitors_dictionary)
+    assert network.generated_network is None
+    assert run(loaded) == run(parsed)
+
+
+def test_changed_file_is_not_loaded(tmp_path, definition_path):
+    """Test if the cache is missed after the file changes or is corrupt."""
+    circuit_cache = CircuitCache(str(tmp_path / "cache"))
+    parsed = new_instances()
+    parser = Parser(*parsed, Scanner(parsed[0], DEFINITION), GlobalVars())
+    assert parser.parse_network()
+    assert circuit_cache.save(definition_path, *parsed)
+    key = circuit_cache.get_key(definition_path)
+
+    with open(definition_path, "a") as f:
+        f.write("\n")
+    assert circuit_cache.get_key(definition_path) != key
+    assert not circuit_cache.load(definition_path, *new_instances())
+
+    assert circuit_cache.save(definition_path, *parsed)
+    cache_file = tmp_path / "cache" / \
+        (circuit_cache.get_key(definition_path) + ".pickle")
+    cache_file.write_bytes(b"corrupt")
+    loaded = new_instances()
+    assert not circuit_cache.load(definition_path, *loaded)
+    assert loaded[1].devices_list == []
+
+    assert circuit_cache.get_key(str(tmp_path / "absent.txt")) is None
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="needs user IDs")
+def test_writable_cache_is_not_loaded(tmp_path, definition_path):
+    """Test if cache files that others can write to are not loaded."""
+    circuit_cache = CircuitCache(str(tmp_path / "cache"))
+    parsed = new_instances()
+    parser = Parser(*parsed, Scanner(parsed[0], DEFINITION), GlobalVars())
+    assert parser.parse_network()
+    assert circuit_cache.save(definition_path, *parsed)
+    cache_file = tmp_path / "cache" / \
+        (circuit_cache.get_key(definition_path) + ".pickle")
+    assert stat.S_IMODE(cache_file.stat().st_mode) == 0o600
+    assert circuit_cache.load(definition_path, *new_instances())
+
+    cache_file.chmod(0o620)
+    assert not circuit_cache.load(definition_path, *new_instances())
+    cache_file.chmod(0o600)
+    (tmp_path / "cache").chmod(0o777)
+    assert not circuit_cache.load(definition_path, *new_instances())
+    # Files saved in a shared directory would never be loaded
+    assert not circuit_cache.save(definition_path, *parsed)
@@ -0,0 +1,103 @@
+"""Test the circuit_generator module."""
+import random
+
+import pytest
+
+from final.names import Names
+from final.devices import Devices
+from final.network import Network
+from final.monitors import Monitors
+from final.global_vars import GlobalVars
+from final.circuit_generator import CircuitGenerator
+from final.tests.string_scanner import Scanner
+from final.tests.string_parser import Parser
+
+
+def parse_definition(definition):
+    """Return the devices and network of a parsed definition."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    parser = Parser(names, devices, network, monitors,
+                    Scanner(names, definition), GlobalVars())
+    assert parser.parse_network()
+    return devices, network
+
+
+def get_signals(devices, signal_names):
+    """Return the levels of the named signals, as a list of 0s and 1s."""
+    return [devices.get_device(device_id).outputs[output_id] for
+            device_id, output_id in (devices.get_signal_ids(signal_name)
+                                     for signal_name in signal_names)]
+
+
+@pytest.mark.parametrize("circuit, size", [
+    ("ripple_carry_adder", 5),
+    ("counter", 5),
+    ("random_dag", 200),
+    ("shift_register", 5),
+])
+def test_circuits_parse(circuit, size):
+    """Test if every circuit is a valid definition file for a given seed."""
+    definition = getattr(CircuitGenerator(1), circuit)(size)
+    parse_definition(definition)
+    assert definition == getattr(CircuitGenerator(1), circuit)(size)
+
+
+def test_ripple_carry_adder():
+    """Test if the ripple-carry adder adds the numbers set by switches."""
+    bits = 6
+    for seed in range(5):
+        devices, network = parse_definition(
+            CircuitGenerator(seed).ripple_carry_adder(bits))
+        assert network.execute_network()
+        switches = get_signals(devices, ["sw" + str(number) for number in
+                                         range(1, 2 * bits + 2)])
+        a = sum(level << bit for bit, level in enumerate(switches[0:-1:2]))
+        b = sum(level << bit for bit, level in enumerate(switches[1:-1:2]))
+        result = get_signals(devices, ["s" + str(bit) for bit in range(bits)] +
+                             ["c" + str(bits)])
+        assert sum(level << bit for bit, level in enumerate(result)) == \
+            a + b + switches[-1]
+
+
+def test_counter():
+    """Test if the counter counts up by one on every rising clock edge."""
+    bits = 4
+    random.seed(0)
+    devices, network = parse_definition(CircuitGenerator().counter(bits))
+    devices.cold_startup()
+    counts = []
+    for _ in range(40):
+        assert network.execute_network()
+        levels = get_signals(devices, ["d" + str(bit) + ".Q"
+                                       for bit in range(bits)])
+        counts.append(sum(level << bit for bit, level in enumerate(levels)))
+    changes = [(second - first) % 2 ** bits for first, second
+               in zip(counts, counts[1:]) if first != second]
+    assert len(changes) > 10
+    assert set(changes) == {1}
+
+
+def test_random_dag_depth():
+    """Test if the random network has the requested size and depth."""
+    devices, network = parse_definition(
+        CircuitGenerator(2).random_dag(300, depth=12, inputs=4))
+    assert len(devices.find_devices()) == 304
+    assert network.get_logic_depth() == 12
+
+
+def test_shift_register():
+    """Test if the shift register moves the input along one D-type a cycle.
+    """
+    length = 6
+    random.seed(0)
+    devices, network = parse_definition(
+        CircuitGenerator(3).shift_register(length, clock_length=1))
+    devices.cold_startup()
+    [data] = get_signals(devices, ["sw1"])
+    for _ in range(4 * length):
+        assert network.execute_network()
+    assert get_signals(devices, ["d" + str(stage) + ".Q" for stage in
+                                 range(length)]) == [data] * length
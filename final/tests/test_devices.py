@@ -1,4 +1,6 @@
 """Test the devices module."""
+import pickle
+
 import pytest
 
 from final.names import Names
@@ -40,6 +42,17 @@ def test_get_device(devices_with_items):
         assert devices_with_items.get_device(X_ID) is None
 
 
+def test_device_slots(devices_with_items):
+    """Test if devices keep their attributes without an instance dict."""
+    device = devices_with_items.devices_list[0]
+    assert not hasattr(device, "__dict__")
+    assert device.device_kind == devices_with_items.AND
+    assert list(device.inputs.values()) == [None, None]
+    with pytest.raises(AttributeError):
+        device.colour = "red"
+    assert pickle.loads(pickle.dumps(device)).inputs == device.inputs
+
+
 def test_find_devices(devices_with_items):
     """Test if find_devices returns the correct devices of the given kind."""
     devices = devices_with_items
@@ -55,6 +68,24 @@ def test_find_devices(devices_with_items):
     assert devices.find_devices(devices.XOR) == []
 
 
+def test_find_devices_returns_copy(devices_with_items):
+    """Test if changing a find_devices list leaves the device index intact."""
+    devices = devices_with_items
+    names = devices.names
+    [AND1_ID, NOR1_ID, SW1_ID, NOT1_ID, AND2_ID
+     ] = names.lookup(["And1", "Nor1", "Sw1", "Not1", "And2"])
+
+    devices.find_devices().clear()
+    devices.find_devices(devices.AND).append(NOR1_ID)
+    assert devices.find_devices() == [AND1_ID, NOR1_ID, SW1_ID, NOT1_ID]
+    assert devices.find_devices(devices.AND) == [AND1_ID]
+
+    # New devices are added to the index in order
+    devices.make_device(AND2_ID, devices.AND, 2)
+    assert devices.find_devices(devices.AND) == [AND1_ID, AND2_ID]
+    assert devices.get_device(AND2_ID) is devices.devices_list[-1]
+
+
 def test_make_device(new_devices):
     """Test if make_device correctly makes devices with their properties."""
     names = new_devices.names
@@ -96,6 +127,30 @@ def test_make_device(new_devices):
     assert dtype_device.dtype_memory in [new_devices.LOW, new_devices.HIGH]
 
 
+def test_make_device_keeps_existing_states(new_devices):
+    """Test if making D-types and clocks leaves earlier devices untouched."""
+    names = new_devices.names
+    [D1_ID, D2_ID, CL1_ID, CL2_ID] = names.lookup(["D1", "D2", "Clock1",
+                                                   "Clock2"])
+
+    new_devices.make_device(D1_ID, new_devices.D_TYPE)
+    new_devices.make_device(CL1_ID, new_devices.CLOCK, 5)
+    dtype_device = new_devices.get_device(D1_ID)
+    clock_device = new_devices.get_device(CL1_ID)
+    dtype_device.dtype_memory = new_devices.BLANK
+    clock_device.clock_counter = 5
+
+    new_devices.make_device(D2_ID, new_devices.D_TYPE)
+    new_devices.make_device(CL2_ID, new_devices.CLOCK, 3)
+    assert dtype_device.dtype_memory == new_devices.BLANK
+    assert clock_device.clock_counter == 5
+
+    # cold_startup still re-randomises every D-type and clock
+    new_devices.cold_startup()
+    assert dtype_device.dtype_memory in [new_devices.LOW, new_devices.HIGH]
+    assert clock_device.clock_counter in range(5)
+
+
 @pytest.mark.parametrize("function_args, error", [
     ("(AND1_ID, new_devices.AND, 17)", "new_devices.INVALID_QUALIFIER"),
     ("(SW1_ID, new_devices.SWITCH, None)", "new_devices.NO_QUALIFIER"),
@@ -156,3 +211,33 @@ def test_set_switch(new_devices):
     # Set switch Sw1 to LOW
     new_devices.set_switch(SW1_ID, new_devices.LOW)
     assert switch_object.switch_state == new_devices.LOW
+
+
+def test_cold_startup_seed(new_devices):
+    """Test if cold starts with the same seed give the same states."""
+    names = new_devices.names
+    device_ids = names.lookup(["D%d" % number for number in range(20)] +
+                              ["Clock%d" % number for number in range(20)])
+    for device_id in device_ids[:20]:
+        new_devices.make_device(device_id, new_devices.D_TYPE)
+    for device_id in device_ids[20:]:
+        new_devices.make_device(device_id, new_devices.CLOCK, 7)
+
+    def states():
+        return [(device.dtype_memory, device.clock_counter,
+                 device.outputs.copy()) for device in new_devices.devices_list]
+
+    # Without a seed, each cold start draws a new one and records it
+    new_devices.cold_startup()
+    first_seed = new_devices.cold_startup_seed
+    first_states = states()
+    new_devices.cold_startup()
+    assert new_devices.cold_startup_seed != first_seed
+
+    # Replaying the recorded seed gives the same states
+    new_devices.set_seed(first_seed)
+    new_devices.cold_startup()
+    assert new_devices.cold_startup_seed == first_seed
+    assert states() == first_states
+    new_devices.cold_startup()
+    assert states() == first_states
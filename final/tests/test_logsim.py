@@ -0,0 +1,73 @@
+"""Test the logsim module."""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+FINAL_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(autouse=True)
+def cache_directory(tmp_path, monkeypatch):
+    """Keep the compiled circuits of each test in a temporary directory."""
+    monkeypatch.setenv("LOGSIM_CACHE_DIR", str(tmp_path))
+
+
+def run_python(arguments, stdin=""):
+    """Run Python in the final directory and return the completed process."""
+    return subprocess.run([sys.executable] + arguments, cwd=FINAL_DIRECTORY,
+                          input=stdin, capture_output=True, text=True)
+
+
+def test_import_does_not_load_gui():
+    """Test if importing logsim leaves the GUI modules unimported."""
+    process = run_python(
+        ["-c", "import sys, logsim; print(sorted(name for name in "
+               "['wx', 'OpenGL', 'gui', 'app_base', 'userint', 'batch'] "
+               "if name in sys.modules))"])
+    assert process.stdout == "[]\n"
+
+
+@pytest.mark.parametrize("arguments, stdin", [
+    (["-c", "examples/and_gate.txt"], "q\n"),
+    (["-b", "examples/and_gate.txt", "-n", "3"], ""),
+])
+def test_command_line_modes_do_not_load_gui(arguments, stdin):
+    """Test if the command line and batch modes run without the GUI."""
+    process = run_python(
+        ["-c", "import sys, runpy; sys.argv = ['logsim.py'] + %r\n"
+               "try:\n"
+               "    runpy.run_path('logsim.py', run_name='__main__')\n"
+               "finally:\n"
+               "    print('wx' in sys.modules or 'gui' in sys.modules)"
+         % arguments], stdin)
+    assert process.stdout.endswith("False\n")
+
+
+def test_batch_seed_replay():
+    """Test if a batch run is replayed by the seed stored in its results."""
+    arguments = ["logsim.py", "-b", "examples/divide_by_3.txt", "-n", "12",
+                 "-f", "json"]
+    first_results = json.loads(run_python(arguments).stdout)
+    process = run_python(arguments + ["-r", str(first_results["seed"])])
+    assert json.loads(process.stdout) == first_results
+    assert run_python(arguments + ["-r", "x"]).returncode == 2
+
+
+@pytest.mark.parametrize("output_format", ["vcd", "json"])
+def test_batch_output_not_opened(output_format):
+    """Test if an output path that cannot be opened is reported."""
+    process = run_python(["logsim.py", "-b", "examples/and_gate.txt",
+                          "-f", output_format, "-o", "/nonexistent/x"])
+    assert process.returncode == 1
+    assert process.stderr.endswith("Error: could not open /nonexistent/x\n")
+    assert "oscillating" not in process.stderr
+
+
+def test_batch_zero_cycles():
+    """Test if zero cycles are rejected."""
+    process = run_python(["logsim.py", "-b", "examples/and_gate.txt",
+                          "-n", "0"])
+    assert process.returncode == 2
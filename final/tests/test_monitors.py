@@ -4,7 +4,7 @@ import pytest
 from final.names import Names
 from final.network import Network
 from final.devices import Devices
-from final.monitors import Monitors
+from final.monitors import Monitors, SignalTrace
 
 
 @pytest.fixture
@@ -154,6 +154,69 @@ def test_reset_monitors(new_monitors):
                                                 (OR1_ID, None): []}
 
 
+def test_record_signals_many_cycles(new_monitors):
+    """Test if record_signals records the signals for several cycles."""
+    names = new_monitors.names
+    devices = new_monitors.devices
+    [SW1_ID, SW2_ID, OR1_ID] = names.lookup(["Sw1", "Sw2", "Or1"])
+
+    LOW = devices.LOW
+    HIGH = devices.HIGH
+    new_monitors.record_signals(3)
+    devices.set_switch(SW1_ID, HIGH)
+    new_monitors.network.execute_network()
+    new_monitors.record_signals(2)
+    new_monitors.record_signals(0)
+    assert new_monitors.monitors_dictionary == {
+        (SW1_ID, None): [LOW, LOW, LOW, HIGH, HIGH],
+        (SW2_ID, None): [LOW] * 5,
+        (OR1_ID, None): [LOW, LOW, LOW, HIGH, HIGH]}
+
+
+def test_signal_trace():
+    """Test if SignalTrace behaves like a list of signal levels."""
+    signal_trace = SignalTrace([0, 1, 4])
+    signal_trace.append(2)
+    signal_trace.extend([3, 0])
+
+    assert len(signal_trace) == 6
+    assert signal_trace[1] == 1
+    assert signal_trace[-1] == 0
+    assert signal_trace[1:3] == [1, 4]
+    assert list(signal_trace) == [0, 1, 4, 2, 3, 0]
+    assert signal_trace == [0, 1, 4, 2, 3, 0]
+    assert signal_trace == SignalTrace([0, 1, 4, 2, 3, 0])
+    assert signal_trace != [0, 1, 4]
+
+    signal_trace.clear()
+    assert signal_trace == []
+
+
+def test_signal_trace_runs():
+    """Test if SignalTrace stores runs and answers cycle queries."""
+    signal_trace = SignalTrace([0, 0, 0, 1, 1])
+    signal_trace.append(1, 1000)
+    signal_trace.append(0, 10)
+    signal_trace.append(0)
+
+    assert len(signal_trace) == 1016
+    assert len(signal_trace.run_starts) == 3
+    assert list(signal_trace.runs()) == [(0, 3, 0), (3, 1002, 1),
+                                         (1005, 11, 0)]
+    assert signal_trace.value_at(2) == 0
+    assert signal_trace.value_at(3) == 1
+    assert signal_trace.value_at(1004) == 1
+    assert signal_trace.value_at(1015) == 0
+    assert signal_trace.value_at(1016) is None
+    assert signal_trace[-1] == 0
+    with pytest.raises(IndexError):
+        signal_trace[1016]
+
+    assert signal_trace.edges_between(0, 1016) == [(3, 1), (1005, 0)]
+    assert signal_trace.edges_between(3, 1005) == [(3, 1)]
+    assert signal_trace.edges_between(4, 1005) == []
+
+
 def test_display_signals(capsys, new_monitors):
     """Test if signal traces are displayed correctly on the console."""
     names = new_monitors.names
@@ -197,3 +260,39 @@ def test_display_signals(capsys, new_monitors):
             "Clock1: -__--__--__--__--__-" in traces)
 
     assert "" in traces  # additional empty line at the end
+
+
+def test_vcd_file(tmp_path, new_monitors):
+    """Test if start_vcd streams only the signal changes to a VCD file."""
+    names = new_monitors.names
+    devices = new_monitors.devices
+    network = new_monitors.network
+    [SW1_ID] = names.lookup(["Sw1"])
+    path = tmp_path / "signals.vcd"
+
+    assert new_monitors.start_vcd(str(path), keep_traces=False)
+    for cycle in range(4):
+        if cycle == 2:
+            devices.set_switch(SW1_ID, devices.HIGH)
+        network.execute_network()
+        new_monitors.record_signals()
+    assert new_monitors.stop_vcd()
+    assert not new_monitors.stop_vcd()
+
+    # The traces are not kept in disk-only mode
+    assert all(signal_trace == []
+               for signal_trace in new_monitors.monitors_dictionary.values())
+
+    lines = path.read_text().split("\n")
+    assert "$var wire 1 ! Sw1 $end" in lines
+    assert "$var wire 1 \" Sw2 $end" in lines
+    assert "$var wire 1 # Or1 $end" in lines
+    definitions_end = lines.index("$enddefinitions $end")
+    assert lines[definitions_end + 1:] == ["#0", "0!", "0\"", "0#",
+                                           "#2", "1!", "1#", "#4", ""]
+
+
+def test_vcd_file_gives_error(tmp_path, new_monitors):
+    """Test if start_vcd returns False if the file cannot be opened."""
+    assert not new_monitors.start_vcd(str(tmp_path / "absent" / "a.vcd"))
+    assert new_monitors.vcd_writer is None
@@ -115,3 +115,14 @@ def test_get_name_string(names_with_items, new_names, name_id, expected_str):
     assert names_with_items.get_name_string(name_id) == expected_str
     # Name is absent
     assert new_names.get_name_string(name_id) is None
+
+
+def test_lookup_many_names(new_names):
+    """Test if a large batch lookup keeps query and lookup consistent."""
+    name_string_list = ["".join(["n", str(i)]) for i in range(5000)]
+    name_id_list = new_names.lookup(name_string_list + name_string_list)
+
+    assert name_id_list == list(range(5000)) * 2
+    assert new_names.query("n4999") == 4999
+    assert new_names.get_name_string(1234) == "n1234"
+    assert new_names.lookup(["new", "n0"]) == [5000, 0]
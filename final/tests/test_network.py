@@ -179,6 +179,34 @@ def test_make_connection(network_with_devices):
                           I2: (SW2_ID, None)}
 
 
+def test_get_fanout(network_with_devices):
+    """Test if the fanout index follows make_connection and remove_connection.
+    """
+    network = network_with_devices
+    devices = network.devices
+    names = devices.names
+
+    [SW1_ID, SW2_ID, OR1_ID, NOT1_ID, I1, I2
+     ] = names.lookup(["Sw1", "Sw2", "Or1", "Not1", "I1", "I2"])
+
+    assert network.get_fanout(SW1_ID, None) == []
+    network.make_connection(SW1_ID, None, OR1_ID, I1)
+    network.make_connection(OR1_ID, I2, SW1_ID, None)
+    network.make_connection(NOT1_ID, None, SW1_ID, None)
+    network.make_connection(SW2_ID, None, NOT1_ID, None)  # INPUT_CONNECTED
+
+    assert network.get_fanout(SW1_ID, None) == [(OR1_ID, I1), (OR1_ID, I2),
+                                                (NOT1_ID, None)]
+    assert network.get_fanout(SW2_ID, None) == []
+    assert network.get_fanout_devices(SW1_ID) == [OR1_ID, NOT1_ID]
+    assert network.get_fanout_devices(I1) == []
+
+    network.remove_connection(OR1_ID, I1, SW1_ID, None)
+    network.remove_connection(SW1_ID, None, NOT1_ID, None)
+    assert network.get_fanout(SW1_ID, None) == [(OR1_ID, I2)]
+    assert network.get_fanout_devices(SW1_ID) == [OR1_ID]
+
+
 @pytest.mark.parametrize("function_args, error", [
     # I1 is not a valid device id
     ("(I1, I1, OR1_ID, I2)", "network.DEVICE_ABSENT"),
@@ -413,3 +441,474 @@ def test_oscillating_network(new_network):
     network.make_connection(NOT1, None, NOT1, None)
 
     assert not network.execute_network()
+
+
+@pytest.mark.parametrize("mode", ["SWEEP", "EVENT_DRIVEN", "GENERATED"])
+def test_oscillating_devices(new_network, mode):
+    """Test if execute_network reports the devices of a ring oscillator."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+    network.set_simulation_mode(getattr(network, mode))
+
+    [SW1, NOT1, NOT2, NOT3, NOT4] = names.lookup(["Sw1", "Not1", "Not2",
+                                                  "Not3", "Not4"])
+    devices.make_device(SW1, devices.SWITCH, 0)
+    for device_id in [NOT1, NOT2, NOT3, NOT4]:
+        devices.make_device(device_id, devices.NOT, None)
+    network.make_connection(NOT1, None, NOT2, None)
+    network.make_connection(NOT2, None, NOT3, None)
+    network.make_connection(NOT3, None, NOT1, None)
+    network.make_connection(SW1, None, NOT4, None)
+
+    # Finding the oscillating devices leaves the network state and the
+    # profile as they were when execute_network gave up
+    profile = network.start_profiling()
+    trace_oscillation = network._trace_oscillation
+    failed_states = []
+
+    def record_state(*arguments):
+        failed_states.append([device.outputs.copy()
+                              for device in devices.devices_list])
+        return trace_oscillation(*arguments)
+    network._trace_oscillation = record_state
+
+    assert not network.execute_network()
+    assert network.oscillating_devices == [NOT1, NOT2, NOT3]
+    assert failed_states == [[device.outputs.copy()
+                              for device in devices.devices_list]]
+    if mode == "SWEEP":
+        assert profile.device_stats[NOT1][0] == profile.iterations
+
+
+def test_oscillation_found_early(new_network):
+    """Test if execute_network stops sweeping once the state repeats."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+
+    [NOT1] = names.lookup(["Not1"])
+    devices.make_device(NOT1, devices.NOT, None)
+    network.make_connection(NOT1, None, NOT1, None)
+
+    gate_executions = []
+    execute_gate = network.execute_gate
+    network.execute_gate = lambda *arguments: (
+        gate_executions.append(arguments) or execute_gate(*arguments))
+
+    assert network.get_iteration_limit() == 20
+    assert not network.execute_network()
+    # Far fewer sweeps than the limit, including those finding the devices
+    assert len(gate_executions) < 20
+
+
+def test_iteration_limit(new_network):
+    """Test if the iteration limit follows the logic depth of the network."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+
+    # A chain of NOT gates, each reading the next one, takes two sweeps per
+    # gate to settle
+    [SW1] = names.lookup(["Sw1"])
+    devices.make_device(SW1, devices.SWITCH, 0)
+    gate_ids = names.lookup(["Not" + str(number) for number in range(30)])
+    for gate_id in gate_ids:
+        devices.make_device(gate_id, devices.NOT, None)
+    for reader_id, gate_id in zip(gate_ids, gate_ids[1:]):
+        network.make_connection(reader_id, None, gate_id, None)
+    network.make_connection(SW1, None, gate_ids[-1], None)
+
+    assert network.get_logic_depth() == 30
+    assert network.get_iteration_limit() == 62
+    devices.cold_startup()
+    assert network.execute_network()
+
+    assert not network.set_iteration_limit(0)
+    assert network.set_iteration_limit(20)
+    devices.set_switch(SW1, 1)
+    assert not network.execute_network()
+    assert network.oscillating_devices != []
+
+
+@pytest.mark.parametrize("mode", ["SWEEP", "EVENT_DRIVEN", "LEVELIZED",
+                                  "VECTORISED", "GENERATED"])
+def test_iteration_limit_modes(new_network, mode):
+    """Test if every simulation mode honours a changed iteration limit."""
+    network = new_network
+    devices = network.devices
+    if not network.set_simulation_mode(getattr(network, mode)):
+        pytest.skip("simulation mode not available")
+
+    # Or1 latches HIGH through its feedback loop once Sw1 is HIGH, which
+    # takes more than one sweep or loop pass
+    [SW1, OR1, I1, I2] = devices.names.lookup(["Sw1", "Or1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 0)
+    devices.make_device(OR1, devices.OR, 2)
+    network.make_connection(OR1, None, OR1, I1)
+    network.make_connection(SW1, None, OR1, I2)
+    assert network.execute_network()
+
+    assert network.set_iteration_limit(1)
+    devices.set_switch(SW1, devices.HIGH)
+    assert not network.execute_network()
+
+    assert network.set_iteration_limit(None)
+    assert network.execute_network()
+    assert network.get_output_signal(OR1, None) == devices.HIGH
+
+
+def make_d_type_held_loop():
+    """Return a Network with a feedback loop held steady by a D-type.
+
+    Nor1 oscillates through its feedback loop unless D1.QBAR is HIGH, which
+    CLEAR holds it at while Sw1 is HIGH. The network has had a cold start.
+    """
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    [SW1, SW2, NOR1, D1, I1, I2] = names.lookup(
+        ["Sw1", "Sw2", "Nor1", "D1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 1)
+    devices.make_device(SW2, devices.SWITCH, 0)
+    devices.make_device(NOR1, devices.NOR, 2)
+    devices.make_device(D1, devices.D_TYPE)
+    network.make_connection(NOR1, None, NOR1, I1)
+    network.make_connection(D1, devices.QBAR_ID, NOR1, I2)
+    network.make_connection(SW1, None, D1, devices.CLEAR_ID)
+    for input_id in [devices.CLK_ID, devices.DATA_ID, devices.SET_ID]:
+        network.make_connection(SW2, None, D1, input_id)
+    devices.set_seed(0)
+    devices.cold_startup()
+    return network
+
+
+@pytest.mark.parametrize("mode", ["SWEEP", "EVENT_DRIVEN", "LEVELIZED",
+                                  "VECTORISED", "GENERATED"])
+def test_d_type_held_loop(mode):
+    """Test if a feedback loop held by a D-type output settles in each mode."""
+    if mode == "VECTORISED":
+        pytest.importorskip("numpy")
+    network = make_d_type_held_loop()
+    devices = network.devices
+    assert network.set_simulation_mode(getattr(network, mode))
+    [NOR1, D1] = devices.names.lookup(["Nor1", "D1"])
+
+    for _ in range(3):
+        assert network.execute_network()
+        assert network.get_output_signal(D1, devices.QBAR_ID) == devices.HIGH
+        assert network.get_output_signal(NOR1, None) == devices.LOW
+
+
+def test_set_simulation_mode(new_network):
+    """Test if set_simulation_mode only accepts valid modes."""
+    network = new_network
+
+    assert network.simulation_mode == network.SWEEP
+    assert network.set_simulation_mode(network.EVENT_DRIVEN)
+    assert network.simulation_mode == network.EVENT_DRIVEN
+    assert not network.set_simulation_mode(len(network.simulation_modes))
+    assert network.simulation_mode == network.EVENT_DRIVEN
+
+
+def make_gated_divider():
+    """Return a Network with a D-type dividing a clock, gated by a switch.
+
+    The D-type memory and the clock start from a fixed state.
+    """
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+
+    [SW1_ID, SW2_ID, CL_ID, D_ID, AND1_ID, NOT1_ID, I1,
+     I2] = names.lookup(["Sw1", "Sw2", "Clock1", "D1", "And1", "Not1",
+                         "I1", "I2"])
+    devices.make_device(SW1_ID, devices.SWITCH, 0)
+    devices.make_device(SW2_ID, devices.SWITCH, 0)
+    devices.make_device(CL_ID, devices.CLOCK, 2)
+    devices.make_device(D_ID, devices.D_TYPE)
+    devices.make_device(AND1_ID, devices.AND, 2)
+    devices.make_device(NOT1_ID, devices.NOT)
+
+    # D1 divides the clock by two, And1 gates its output with Sw1
+    network.make_connection(D_ID, devices.DATA_ID, NOT1_ID, None)
+    network.make_connection(CL_ID, None, D_ID, devices.CLK_ID)
+    network.make_connection(SW2_ID, None, D_ID, devices.SET_ID)
+    network.make_connection(SW2_ID, None, D_ID, devices.CLEAR_ID)
+    network.make_connection(D_ID, devices.Q_ID, NOT1_ID, None)
+    network.make_connection(D_ID, devices.Q_ID, AND1_ID, I1)
+    network.make_connection(SW1_ID, None, AND1_ID, I2)
+
+    devices.get_device(D_ID).dtype_memory = devices.LOW
+    clock = devices.get_device(CL_ID)
+    clock.outputs[None] = devices.LOW
+    clock.clock_counter = 0
+
+    return network
+
+
+def test_skip_idle_cycles():
+    """Test if skipping idle cycles gives the same signals as executing them.
+    """
+    signal_lists = []
+    for skip in [False, True]:
+        network = make_gated_divider()
+        devices = network.devices
+        [SW1_ID, CL_ID, D_ID] = devices.names.lookup(["Sw1", "Clock1", "D1"])
+        devices.get_device(CL_ID).clock_half_period = 5
+        devices.set_switch(SW1_ID, devices.HIGH)
+
+        signals = []
+        executions = 0
+        while len(signals) < 40:
+            assert network.execute_network()
+            executions += 1
+            signals.append(devices.get_device(D_ID).outputs[devices.Q_ID])
+            if skip:
+                idle_cycles = network.skip_idle_cycles(40 - len(signals))
+                signals += signals[-1:] * idle_cycles
+        signal_lists.append(signals)
+
+    assert signal_lists[0] == signal_lists[1]
+    # One execution for each clock edge
+    assert executions == 8
+    assert network.skip_idle_cycles(0) == 0
+
+
+def test_profiling():
+    """Test if profiling counts evaluations without changing the signals."""
+    traces = []
+    profiles = []
+    for mode, profiling in [("SWEEP", False), ("SWEEP", True),
+                            ("EVENT_DRIVEN", True)]:
+        network = make_gated_divider()
+        devices = network.devices
+        network.set_simulation_mode(getattr(network, mode))
+        if profiling:
+            profile = network.start_profiling()
+        trace = []
+        for cycle in range(12):
+            assert network.execute_network()
+            trace.append([device.outputs.copy()
+                          for device in devices.devices_list])
+        traces.append(trace)
+        if profiling:
+            assert network.stop_profiling() is profile
+            assert network.profile is None
+            profiles.append(profile)
+    assert traces[0] == traces[1] == traces[2]
+
+    [sweep_profile, event_profile] = profiles
+    assert sweep_profile.cycles == event_profile.cycles == 12
+    assert sweep_profile.iteration_counts == event_profile.iteration_counts
+    assert sum(sweep_profile.iteration_counts.values()) == 12
+    for device in devices.devices_list:
+        [sweep_evaluations, sweep_changes, _] = \
+            sweep_profile.device_stats[device.device_id]
+        [event_evaluations, event_changes, _] = \
+            event_profile.device_stats[device.device_id]
+        # SWEEP evaluates every device once in each iteration
+        assert sweep_evaluations == sweep_profile.iterations
+        assert event_evaluations <= sweep_evaluations
+        assert event_changes == sweep_changes
+
+    kind_stats = sweep_profile.get_kind_stats()
+    assert kind_stats[devices.SWITCH][:2] == [2, 2 * sweep_profile.iterations]
+    assert "Settle iterations" in sweep_profile.get_report()
+
+    # No more cycles are recorded after profiling stops
+    assert network.execute_network()
+    assert event_profile.cycles == 12
+
+
+def test_simulation_modes_match_sweep():
+    """Test if the other simulation modes produce the same signals as SWEEP."""
+    traces = []
+    for mode in ["SWEEP", "EVENT_DRIVEN", "LEVELIZED", "GENERATED"]:
+        network = make_gated_divider()
+        devices = network.devices
+        names = devices.names
+        network.set_simulation_mode(getattr(network, mode))
+        [SW1_ID, CL_ID, AND1_ID, NOT1_ID] = names.lookup(["Sw1", "Clock1",
+                                                          "And1", "Not1"])
+
+        trace = []
+        for cycle in range(20):
+            if cycle == 7:
+                devices.set_switch(SW1_ID, devices.HIGH)
+            assert network.execute_network()
+            trace.append([network.get_output_signal(device_id, None)
+                          for device_id in [CL_ID, AND1_ID, NOT1_ID]])
+        traces.append(trace)
+
+    assert traces[0] == traces[1] == traces[2] == traces[3]
+
+
+def test_vectorised_matches_levelized():
+    """Test if VECTORISED mode produces the same signals as LEVELIZED."""
+    pytest.importorskip("numpy")
+    traces = []
+    for mode in ["LEVELIZED", "VECTORISED"]:
+        network = make_gated_divider()
+        devices = network.devices
+        assert network.set_simulation_mode(getattr(network, mode))
+        [SW1_ID, SW2_ID] = devices.names.lookup(["Sw1", "Sw2"])
+
+        trace = []
+        for cycle in range(20):
+            if cycle == 5:
+                devices.set_switch(SW1_ID, devices.HIGH)
+            if cycle == 13:
+                devices.set_switch(SW2_ID, devices.HIGH)
+            assert network.execute_network()
+            trace.append([device.outputs.copy()
+                          for device in devices.devices_list])
+        traces.append(trace)
+
+    assert traces[0] == traces[1]
+
+
+def test_bit_parallel_lanes():
+    """Test if each bit-parallel lane matches a LEVELIZED run of its own."""
+    parallel_network = make_gated_divider().compile_network().bit_parallel(3)
+    lane_networks = [make_gated_divider() for _ in range(3)]
+    names = lane_networks[0].names
+    devices = lane_networks[0].devices
+    [SW1_ID, SW2_ID, AND1_ID, D_ID] = names.lookup(["Sw1", "Sw2", "And1",
+                                                    "D1"])
+
+    # Lane 0 keeps Sw1 LOW, lane 1 sets it HIGH, lane 2 also sets D1
+    assert parallel_network.set_switch(SW1_ID, [0, 1, 1])
+    assert parallel_network.set_switch(SW2_ID, [0, 0, 1])
+    for lane, network in enumerate(lane_networks):
+        network.set_simulation_mode(network.LEVELIZED)
+        network.devices.set_switch(SW1_ID, [0, 1, 1][lane])
+        network.devices.set_switch(SW2_ID, [0, 0, 1][lane])
+
+    for cycle in range(12):
+        assert parallel_network.execute()
+        for network in lane_networks:
+            assert network.execute_network()
+        for device_id, output_id in [(AND1_ID, None), (D_ID, devices.Q_ID),
+                                     (D_ID, devices.QBAR_ID)]:
+            assert parallel_network.get_signals(device_id, output_id) == [
+                network.get_output_signal(device_id, output_id)
+                for network in lane_networks]
+
+    # Invalid switches and signal lists are rejected
+    assert not parallel_network.set_switch(AND1_ID, [0, 0, 0])
+    assert not parallel_network.set_switch(SW1_ID, [0, 1])
+    assert parallel_network.get_signals(SW1_ID, devices.Q_ID) is None
+
+
+def test_bit_parallel_d_type_held_loop():
+    """Test if each lane settles a feedback loop held by a D-type."""
+    network = make_d_type_held_loop()
+    devices = network.devices
+    parallel_network = network.compile_network().bit_parallel(2)
+    [NOR1, D1] = devices.names.lookup(["Nor1", "D1"])
+
+    for _ in range(3):
+        assert parallel_network.execute()
+        assert parallel_network.get_signals(D1, devices.QBAR_ID) == [1, 1]
+        assert parallel_network.get_signals(NOR1, None) == [0, 0]
+
+
+def test_event_driven_oscillating_network(new_network):
+    """Test if EVENT_DRIVEN mode returns False for oscillating networks."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+    network.set_simulation_mode(network.EVENT_DRIVEN)
+
+    [NOT1] = names.lookup(["Not1"])
+    devices.make_device(NOT1, devices.NOT, None)
+    network.make_connection(NOT1, None, NOT1, None)
+
+    assert not network.execute_network()
+
+
+def test_levelized_levels(new_network):
+    """Test if compile_network sorts gates into levels and finds loops."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+
+    [SW1_ID, NOT1_ID, NOT2_ID, NAND1_ID, NAND2_ID, I1, I2
+     ] = names.lookup(["Sw1", "Not1", "Not2", "Nand1", "Nand2", "I1", "I2"])
+    devices.make_device(SW1_ID, devices.SWITCH, 1)
+    devices.make_device(NAND1_ID, devices.NAND, 2)
+    devices.make_device(NAND2_ID, devices.NAND, 2)
+    devices.make_device(NOT2_ID, devices.NOT)
+    devices.make_device(NOT1_ID, devices.NOT)
+
+    # Not1 and Not2 form a chain, Nand1 and Nand2 form a bistable
+    # (NOT inputs and outputs are both None, so the input is given first)
+    network.make_connection(NOT1_ID, None, SW1_ID, None)
+    network.make_connection(NOT2_ID, None, NOT1_ID, None)
+    network.make_connection(NAND1_ID, I1, NOT2_ID, None)
+    network.make_connection(NAND1_ID, I2, NAND2_ID, None)
+    network.make_connection(NAND2_ID, I1, SW1_ID, None)
+    network.make_connection(NAND2_ID, I2, NAND1_ID, None)
+
+    compiled_network = network.compile_network()
+    not1 = compiled_network.get_signal_index(NOT1_ID, None)
+    not2 = compiled_network.get_signal_index(NOT2_ID, None)
+    nand1 = compiled_network.get_signal_index(NAND1_ID, None)
+    nand2 = compiled_network.get_signal_index(NAND2_ID, None)
+
+    assert [[(feedback, [gate[3] for gate in gates])
+             for feedback, gates in level]
+            for level in compiled_network.levels] == [
+                [(False, [not1])], [(False, [not2])],
+                [(True, [nand1, nand2])]]
+
+    network.set_simulation_mode(network.LEVELIZED)
+    assert network.execute_network()
+    assert network.get_output_signal(NOT2_ID, None) == devices.HIGH
+    # The bistable settles from its initial LOW outputs, Nand1 first
+    assert network.get_output_signal(NAND1_ID, None) == devices.HIGH
+    assert network.get_output_signal(NAND2_ID, None) == devices.LOW
+
+    # Adding a connection rebuilds the compiled network
+    [NOT3_ID] = names.lookup(["Not3"])
+    devices.make_device(NOT3_ID, devices.NOT)
+    network.make_connection(NOT3_ID, None, NOT2_ID, None)
+    assert network.compile_network() is not compiled_network
+
+
+def test_levelized_oscillating_network(new_network):
+    """Test if LEVELIZED mode returns False for oscillating networks."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+    network.set_simulation_mode(network.LEVELIZED)
+
+    [NOT1] = names.lookup(["Not1"])
+    devices.make_device(NOT1, devices.NOT, None)
+    assert not network.execute_network()  # the input is unconnected
+
+    network.make_connection(NOT1, None, NOT1, None)
+    assert not network.execute_network()
+
+
+def test_generated_oscillating_network(new_network):
+    """Test if GENERATED mode gives the same results as SWEEP when failing."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+    network.set_simulation_mode(network.GENERATED)
+
+    [NOT1] = names.lookup(["Not1"])
+    devices.make_device(NOT1, devices.NOT, None)
+    assert not network.execute_network()  # the input is unconnected
+    assert network.generated_network.source is None
+
+    network.make_connection(NOT1, None, NOT1, None)
+    assert not network.execute_network()
+    assert network.generated_network.source is not None
+
+    # An invalid signal is left to the sweep, which reports it
+    devices.get_device(NOT1).outputs[None] = devices.BLANK
+    assert not network.execute_network()
+    assert network.get_output_signal(NOT1, None) == devices.BLANK
@@ -175,3 +175,35 @@ def test_print_error_line(new_test_scanner, capsys):
 
         symbol = scanner.get_symbol()
         safety_counter += 1
+
+
+def test_get_symbol_locations(tmp_path, new_names):
+    """Test if get_symbol gives the line and position of each symbol."""
+    path = tmp_path / "definition.txt"
+    path.write_text("devices(\n  sw1 is  SWITCH;# comment\n\n12,\r\n"
+                    "a.Q # comment at the end")
+    scanner = Scanner(str(path), new_names)
+
+    symbols = []
+    symbol = scanner.get_symbol()
+    while symbol.type != scanner.EOF:
+        symbols.append((symbol.type, symbol.line_number,
+                        symbol.line_position))
+        symbol = scanner.get_symbol()
+    assert symbols == [(scanner.KEYWORD, 0, 0), (scanner.OPEN_BRACKET, 0, 7),
+                       (scanner.NAME, 1, 2), (scanner.KEYWORD, 1, 6),
+                       (scanner.KEYWORD, 1, 10), (scanner.SEMICOLON, 1, 16),
+                       (scanner.NUMBER, 3, 0), (scanner.COMMA, 3, 2),
+                       (scanner.NAME, 4, 0), (scanner.DOT, 4, 1),
+                       (scanner.KEYWORD, 4, 2)]
+    # The comment at the end of the file is skipped past its end
+    assert (symbol.line_number, symbol.line_position) == (4, 25)
+    assert scanner.current_character == ""
+
+
+def test_symbol_slots():
+    """Test if symbols only have the four symbol attributes."""
+    symbol = Symbol()
+    assert not hasattr(symbol, "__dict__")
+    with pytest.raises(AttributeError):
+        symbol.position = 0
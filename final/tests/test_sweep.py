@@ -0,0 +1,92 @@
+"""Test the sweep module."""
+import json
+import os
+import subprocess
+import sys
+
+FINAL_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A two-bit counter, and an AND gate of its low bit with switch sw3
+COUNTER = """devices(sw1, sw2, sw3 are SWITCH; clk is CLOCK;
+    d0, d1 are DTYPE; a is AND;)
+initialise(sw1, sw2, sw3 are LOW; clk cycle length 1; a has 2 inputs;)
+connections(d0.QBAR to d0.DATA; clk to d0.CLK; d1.QBAR to d1.DATA;
+    d0.QBAR to d1.CLK; sw1 to d0.SET; sw1 to d1.SET; sw2 to d0.CLEAR;
+    sw2 to d1.CLEAR; d0.Q to a.I1; sw3 to a.I2;)
+monitors(d1.Q, d0.Q, a;)
+"""
+
+
+def run_sweep(tmp_path, arguments):
+    """Run sweep.py on the counter and return the process."""
+    path = tmp_path / "counter.txt"
+    path.write_text(COUNTER)
+    environment = dict(os.environ, LOGSIM_CACHE_DIR=str(tmp_path / "cache"))
+    return subprocess.run([sys.executable, "sweep.py", "-n", "8"] +
+                          arguments + [str(path)], cwd=FINAL_DIRECTORY,
+                          env=environment, capture_output=True, text=True)
+
+
+def test_sweep_runs(tmp_path):
+    """Test if every switch assignment and seed is run in each process."""
+    outputs = []
+    for processes in ["1", "3"]:
+        process = run_sweep(tmp_path, ["-w", "sw3", "-r", "0-2",
+                                       "-f", "traces", "-j", processes])
+        assert process.returncode == 0
+        outputs.append(process.stdout)
+    # The runs do not depend on the process running them
+    assert outputs[0] == outputs[1]
+
+    runs = json.loads(outputs[0])["runs"]
+    assert [(run["switches"], run["seed"]) for run in runs] == [
+        ({"sw3": level}, seed) for level in [0, 1] for seed in [0, 1, 2]]
+    for run in runs:
+        assert run["cycles"] == 8 and run["steady_state"]
+        signals = run["signals"]
+        assert len(signals["d0.Q"]) == 8
+        if run["switches"]["sw3"]:
+            assert signals["a"] == signals["d0.Q"]
+        else:
+            assert signals["a"] == [0] * 8
+
+
+def test_sweep_summary(tmp_path):
+    """Test if the signals are summarised and switch settings combined."""
+    process = run_sweep(tmp_path, ["-s", "sw1=1", "-s", "sw2=1",
+                                   "-w", "sw3", "-r", "5"])
+    assert process.returncode == 0
+    runs = json.loads(process.stdout)["runs"]
+    assert [run["switches"] for run in runs] == [
+        {"sw1": 1, "sw3": 0}, {"sw1": 1, "sw3": 1},
+        {"sw2": 1, "sw3": 0}, {"sw2": 1, "sw3": 1}]
+    # SET holds the counter HIGH
+    assert runs[1]["signals"]["a"] == {"final": 1, "high_cycles": 8,
+                                       "changes": 0}
+    # CLEAR holds the counter LOW
+    assert runs[3]["signals"]["d1.Q"] == {"final": 0, "high_cycles": 0,
+                                          "changes": 0}
+
+
+def test_summary_matches_traces(tmp_path):
+    """Test if each summary agrees with the trace of the same run."""
+    [traces, summaries] = [
+        json.loads(run_sweep(tmp_path, ["-w", "sw3", "-r", "3",
+                                        "-f", output_format]).stdout)["runs"]
+        for output_format in ["traces", "summary"]]
+    for trace_run, summary_run in zip(traces, summaries):
+        for signal_name, trace in trace_run["signals"].items():
+            assert summary_run["signals"][signal_name] == {
+                "final": trace[-1], "high_cycles": sum(trace),
+                "changes": sum(1 for cycle in range(1, len(trace))
+                               if trace[cycle] != trace[cycle - 1])}
+    # The counter changes level
+    assert summaries[0]["signals"]["d0.Q"]["changes"] > 0
+
+
+def test_invalid_options(tmp_path):
+    """Test if invalid options and switches give exit status 2."""
+    assert run_sweep(tmp_path, ["-s", "sw1=2"]).returncode == 2
+    assert run_sweep(tmp_path, ["-w", "clk"]).returncode == 2
+    assert run_sweep(tmp_path, ["-r", "x"]).returncode == 2
+    assert run_sweep(tmp_path, ["-f", "vcd"]).returncode == 2
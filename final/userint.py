@@ -57,6 +57,12 @@ class UserInterface:
 
     zap_command(self): Removes the specified monitor.
 
+    vcd_command(self, keep_traces): Streams the monitored signals to the
+                                    specified VCD file.
+
+    profile_command(self): Starts or stops profiling the network, or prints
+                           the profile.
+
     run_network(self, cycles): Runs the network for the specified number of
                                simulation cycles.
 
@@ -74,6 +80,11 @@ class UserInterface:
 
         self.cycles_completed = 0  # number of simulation cycles completed
 
+        # VCD file that the monitored signals are streamed to, and whether
+        # the traces are also kept for display
+        self.vcd_path = None
+        self.vcd_keep_traces = True
+
         self.character = ""  # current character
         self.line = ""  # current string entered by the user
         self.cursor = 0  # cursor position
@@ -97,10 +108,17 @@ class UserInterface:
                 self.run_command()
             elif command == "c":
                 self.continue_command()
+            elif command == "v":
+                self.vcd_command(True)
+            elif command == "w":
+                self.vcd_command(False)
+            elif command == "p":
+                self.profile_command()
             else:
                 print("Invalid command. Enter 'h' for help.")
             self.get_line()  # get the user entry
             command = self.read_command()  # read the first character
+        self.monitors.stop_vcd()
 
     def get_line(self):
         """Print prompt for the user and update the user entry."""
@@ -202,10 +220,18 @@ class UserInterface:
         """Print a list of valid commands."""
         print("User commands:")
         print("r N       - run the simulation for N cycles")
+        print("r N S     - run the simulation for N cycles with cold start")
+        print("            seed S")
         print("c N       - continue the simulation for N cycles")
         print("s X N     - set switch X to N (0 or 1)")
         print("m X       - set a monitor on signal X")
         print("z X       - zap the monitor on signal X")
+        print("v F       - also write the monitored signals to VCD file F")
+        print("w F       - only write the monitored signals to VCD file F")
+        print("v         - stop writing to the VCD file")
+        print("p 1       - start profiling the simulation")
+        print("p 0       - stop profiling the simulation")
+        print("p         - print the simulation profile")
         print("h         - help (this command)")
         print("q         - quit the program")
 
@@ -242,29 +268,98 @@ class UserInterface:
             else:
                 print("Error! Could not zap monitor.")
 
+    def vcd_command(self, keep_traces):
+        """Stream the monitored signals to the specified VCD file.
+
+        If keep_traces is False, the signals are only written to the file.
+        Without a file name, streaming is stopped.
+        """
+        path = self.line[self.cursor:].strip()
+        if not path:
+            if self.monitors.stop_vcd():
+                print("Stopped writing to " + self.vcd_path)
+            self.vcd_path = None
+            return
+        if self.monitors.start_vcd(path, keep_traces, self.cycles_completed):
+            self.vcd_path = path
+            self.vcd_keep_traces = keep_traces
+            print("Writing monitored signals to " + path)
+        else:
+            self.vcd_path = None
+            print("Error! Could not open " + path)
+
+    def profile_command(self):
+        """Start or stop profiling the network, or print the profile.
+
+        Stopping profiling also prints the profile.
+        """
+        if self.line[self.cursor:].strip():
+            profiling = self.read_number(0, 1)
+            if profiling is None:
+                return
+            if profiling:
+                self.network.start_profiling()
+                print("Started profiling.")
+                return
+            profile = self.network.stop_profiling()
+        else:
+            profile = self.network.profile
+        if profile is None:
+            print("Error! Not profiling. Enter 'p 1' to start.")
+        else:
+            print(profile.get_report())
+
     def run_network(self, cycles):
         """Run the network for the specified number of simulation cycles.
 
         Return True if successful.
         """
-        for _ in range(cycles):
+        cycles_run = 0
+        while cycles_run < cycles:
             if self.network.execute_network():
                 self.monitors.record_signals()
+                cycles_run += 1
+                # Settled signals only change again at the next clock edge
+                idle_cycles = self.network.skip_idle_cycles(cycles -
+                                                            cycles_run)
+                if idle_cycles:
+                    self.monitors.record_signals(idle_cycles)
+                    cycles_run += idle_cycles
             else:
                 print("Error! Network oscillating.")
+                if self.network.oscillating_devices:
+                    print("Oscillating devices: " + ", ".join(
+                        self.names.get_name_string(device_id) for device_id in
+                        self.network.oscillating_devices))
                 return False
-        self.monitors.display_signals()
+        if self.monitors.vcd_writer is not None:
+            self.monitors.vcd_writer.flush()
+        if self.monitors.keep_traces:
+            self.monitors.display_signals()
         return True
 
     def run_command(self):
-        """Run the simulation from scratch."""
+        """Run the simulation from scratch.
+
+        The cold start uses the seed given after the number of cycles, or a
+        new seed, which is printed so that the run can be replayed.
+        """
         self.cycles_completed = 0
         cycles = self.read_number(0, None)
+        seed = None
+        if cycles is not None and self.line[self.cursor:].strip():
+            seed = self.read_number(0, None)
+            if seed is None:
+                return
 
         if cycles is not None:  # if the number of cycles provided is valid
             self.monitors.reset_monitors()
-            print("".join(["Running for ", str(cycles), " cycles"]))
+            self.devices.set_seed(seed)
             self.devices.cold_startup()
+            if self.vcd_path is not None:  # start the VCD file again
+                self.monitors.start_vcd(self.vcd_path, self.vcd_keep_traces)
+            print("".join(["Running for ", str(cycles), " cycles with seed ",
+                           str(self.devices.cold_startup_seed)]))
             if self.run_network(cycles):
                 self.cycles_completed += cycles
 